@@ -0,0 +1,357 @@
+"""
+bloom.py
+Bloom filters in front of a lookup structure: misses answered without a probe.
+
+Most lookups in workloads C and D are misses, and a miss is the expensive
+kind: a chain or probe run is walked to the end before the answer is no.
+A Bloom filter of m bits answers "definitely not" or "maybe" from k bits
+per key, with no false negatives, so a guard that asks it first only
+sends the maybes (hits plus a few false positives) on to the structure.
+
+The k bit positions come from one 64-bit hash split in two halves by
+double hashing (Kirsch & Mitzenmacher):
+
+    g_i(x) = h1(x) + i * h2(x)  mod m          i = 0 .. k-1
+
+With n keys the false-positive rate is about (1 - e^(-kn/m))^k, smallest
+at k = (m/n) ln 2: 10 bits per key and k = 7 give ~0.8%.
+
+    BloomFilter           one bit per position; keys cannot be removed, so
+                          after deletes (workload C) the filter goes stale:
+                          still correct, but more false positives
+    CountingBloomFilter   a 4-bit counter per position (4x the memory);
+                          remove() decrements, a counter that reached 15
+                          sticks there
+    BloomGuard            wraps any insert / contains / delete structure
+
+The bits live in a bytearray with a NumPy view over the same buffer (as in
+swiss_table.py): add / might_contain work one key at a time, add_many /
+contains_many on a whole int64 array at once.
+
+Asking the filter costs k hashed bit reads, in Python more than a whole
+lookup in linear probing or a chain, so the guard cuts probes everywhere
+but loses time in Python, even in front of the fixed 101-bucket chained
+table of Program 02: at 8 bits per key the guarded table runs at about
+0.7-0.9x on D_10000 and 0.25-0.35x on C_10000.  The probe counts are what
+carry over to a structure whose misses touch memory or disk.
+
+    python bloom.py                        # workloads C and D, 4-16 bits per key
+    python bloom.py D_10000 --bits 8 10 --tables chained
+"""
+
+import argparse
+import math
+
+import numpy as np
+
+from chained import ChainedTable
+from hash_analyzer import show
+from open_addressing import FIB, M64, MIX, LinearProbing
+from workloads import INSERT, BuiltinSet, load, replay, workload_files
+
+U64 = np.uint64
+
+
+def _hash(key):
+    """64-bit mix of an integer key; the vectorized twin is _hash_many."""
+    x = (key * FIB) & M64
+    x ^= x >> 29
+    x = (x * MIX) & M64
+    return x ^ (x >> 32)
+
+
+def _hash_many(keys):
+    x = np.asarray(keys, dtype=np.int64).view(U64) * U64(FIB)
+    x ^= x >> U64(29)
+    x *= U64(MIX)
+    return x ^ (x >> U64(32))
+
+
+class BloomFilter:
+    """m bits (rounded up to whole 64-bit words), k positions per key."""
+
+    name = "bloom"
+
+    def __init__(self, capacity, bits_per_key=10, k=None):
+        if capacity < 1 or bits_per_key <= 0:
+            raise ValueError("capacity and bits_per_key must be positive")
+        self.m = -(-math.ceil(capacity * bits_per_key) // 64) * 64
+        self.k = k or max(1, round(bits_per_key * math.log(2)))
+        self.count = 0                  # keys added (minus removed, when counting)
+        self._alloc()
+
+    @classmethod
+    def for_rate(cls, capacity, rate):
+        """A filter sized for `capacity` keys at false-positive rate `rate`."""
+        return cls(capacity, -math.log(rate) / math.log(2) ** 2)
+
+    def _alloc(self):
+        self.buf = bytearray(self.m // 8)
+        self.bits = np.frombuffer(self.buf, dtype=np.uint8)
+
+    @property
+    def nbytes(self):
+        return len(self.buf)
+
+    def expected_rate(self, n=None):
+        """(1 - e^(-kn/m))^k for n keys, by default the ones added so far."""
+        n = self.count if n is None else n
+        return (1 - math.exp(-self.k * n / self.m)) ** self.k
+
+    def fill(self):
+        """Fraction of positions set."""
+        return int(np.unpackbits(self.bits).sum()) / self.m
+
+    def _positions(self, key):
+        h = _hash(key)
+        h1, h2, m = h % self.m, (h >> 32) | 1, self.m
+        return [(h1 + i * h2) % m for i in range(self.k)]
+
+    def _positions_many(self, keys):
+        """(len(keys), k) int64 array of bit positions."""
+        h = _hash_many(keys)
+        m = U64(self.m)
+        h1, h2 = h % m, (h >> U64(32)) | U64(1)
+        i = np.arange(self.k, dtype=U64)
+        return ((h1[:, None] + i * (h2[:, None] % m)) % m).astype(np.int64)
+
+    # ── one key at a time ──
+
+    def add(self, key):
+        buf = self.buf
+        for p in self._positions(key):
+            buf[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def might_contain(self, key):
+        """False: key was never added.  True: it probably was."""
+        buf = self.buf
+        h = _hash(key)
+        h1, h2, m = h % self.m, (h >> 32) | 1, self.m
+        for i in range(self.k):                     # _positions(), stopping at the first 0
+            p = (h1 + i * h2) % m
+            if not buf[p >> 3] >> (p & 7) & 1:
+                return False
+        return True
+
+    __contains__ = might_contain
+
+    # ── batches ──
+
+    def add_many(self, keys):
+        p = self._positions_many(keys).ravel()
+        np.bitwise_or.at(self.bits, p >> 3, (1 << (p & 7)).astype(np.uint8))
+        self.count += len(keys)
+
+    def contains_many(self, keys):
+        """Bool array: which keys might be in the filter."""
+        p = self._positions_many(keys)
+        return ((self.bits[p >> 3] >> (p & 7)) & 1).all(axis=1)
+
+
+class CountingBloomFilter(BloomFilter):
+    """
+    A 4-bit counter per position, two to a byte (position p in the low
+    nibble of byte p // 2 when p is even).  A position counts as set while
+    its counter is non-zero.
+    """
+
+    name = "counting"
+    MAX = 15
+
+    def _alloc(self):
+        self.buf = bytearray(self.m // 2)
+        self.bits = np.frombuffer(self.buf, dtype=np.uint8)
+
+    def fill(self):
+        b = self.bits
+        return int(np.count_nonzero(b & 15) + np.count_nonzero(b >> 4)) / self.m
+
+    def add(self, key):
+        buf = self.buf
+        for p in self._positions(key):
+            shift = (p & 1) << 2
+            if (buf[p >> 1] >> shift & 15) < 15:
+                buf[p >> 1] += 1 << shift
+        self.count += 1
+
+    def remove(self, key):
+        """
+        Undo one add(key).  Only for keys that were added: removing any
+        other key could clear a position a stored key needs.
+        """
+        buf = self.buf
+        for p in self._positions(key):
+            shift = (p & 1) << 2
+            c = buf[p >> 1] >> shift & 15
+            if 0 < c < 15:
+                buf[p >> 1] -= 1 << shift
+        self.count -= 1
+
+    def might_contain(self, key):
+        buf = self.buf
+        h = _hash(key)
+        h1, h2, m = h % self.m, (h >> 32) | 1, self.m
+        for i in range(self.k):
+            p = (h1 + i * h2) % m
+            if not buf[p >> 1] >> ((p & 1) << 2) & 15:
+                return False
+        return True
+
+    __contains__ = might_contain
+
+    def _update_many(self, keys, sign):
+        """Add (sign 1) or subtract (sign -1) every key's positions, saturating at MAX."""
+        pos, times = np.unique(self._positions_many(keys), return_counts=True)
+        # even and odd positions separately, so no byte is written twice per pass
+        for half in (0, 1):
+            sel = (pos & 1) == half
+            at, n = pos[sel] >> 1, times[sel].astype(np.int64)
+            shift = 4 * half
+            old = (self.bits[at].astype(np.int64) >> shift) & 15
+            stuck = old == self.MAX
+            new = np.clip(old + sign * n, 0, self.MAX)
+            new = np.where(stuck, old, new)
+            self.bits[at] = (self.bits[at] & (0xF0 >> shift)) | (new << shift).astype(np.uint8)
+        self.count += sign * len(keys)
+
+    def add_many(self, keys):
+        self._update_many(keys, 1)
+
+    def remove_many(self, keys):
+        """remove() for a batch of keys that were all added."""
+        self._update_many(keys, -1)
+
+    def contains_many(self, keys):
+        p = self._positions_many(keys)
+        return ((self.bits[p >> 1] >> ((p & 1) << 2)) & 15).all(axis=1)
+
+
+class BloomGuard:
+    """
+    insert / contains / delete on `table`, asking `bloom` first.  A lookup
+    or delete the filter rules out never reaches the table.
+
+    A counting filter is kept exact when table.insert returns whether the
+    key was new and table.delete whether it was there (the tables here
+    do).  A structure that returns None (the built-in set) gets every
+    insert added and nothing removed: the filter over-counts and goes
+    stale, which costs false positives but never a wrong answer.
+    """
+
+    def __init__(self, table, bloom):
+        self.table = table
+        self.bloom = bloom
+        self.counting = hasattr(bloom, "remove")
+        self.passed = 0             # lookups sent on to the table
+        self.rejected = 0           # lookups answered by the filter
+        self.false_positives = 0    # passed, and the table said no
+
+    @property
+    def probes(self):
+        """The table's probe count (AttributeError when it keeps none)."""
+        return self.table.probes
+
+    def insert(self, key):
+        new = self.table.insert(key)
+        if new is not False:
+            self.bloom.add(key)
+        return new
+
+    def contains(self, key):
+        if not self.bloom.might_contain(key):
+            self.rejected += 1
+            return False
+        self.passed += 1
+        if self.table.contains(key):
+            return True
+        self.false_positives += 1
+        return False
+
+    def delete(self, key):
+        if not self.bloom.might_contain(key):
+            return False
+        found = self.table.delete(key)
+        if found and self.counting:
+            self.bloom.remove(key)
+        return found
+
+    __contains__ = contains
+
+    def __len__(self):
+        return len(self.table)
+
+    def false_positive_rate(self):
+        """Measured: false positives over lookups whose answer was no."""
+        negatives = self.false_positives + self.rejected
+        return self.false_positives / negatives if negatives else 0.0
+
+
+# ── harness ───────────────────────────────────────────────────────────────────
+
+TABLES = {
+    "linear": LinearProbing,
+    "chained": ChainedTable,
+    "chained (101)": lambda: ChainedTable(101, max_load=None),
+    "set (built-in)": BuiltinSet,
+}
+
+FILTERS = {"bloom": BloomFilter, "counting": CountingBloomFilter}
+
+
+def sweep(name, tables, filters, bits, repeat=1):
+    """
+    Replay workload `name` against every table bare and behind every
+    filter at every bits-per-key setting, and print memory against
+    false-positive rate: expected for the keys the filter holds at the
+    end, measured over the run.  Filters are sized for the workload's
+    distinct inserted keys.
+    """
+    ops, values = load(name)
+    n = len(np.unique(values[ops == INSERT]))
+
+    def best(make):
+        runs = []
+        for _ in range(repeat):
+            t = make()
+            runs.append((replay(t, ops, values), t))
+        return min(runs, key=lambda rt: rt[0]["seconds"])
+
+    def miss_probes(r):
+        return f"{r['probes']['miss'].mean():.2f}" if r["probes"] and r["counts"]["miss"] else "-"
+
+    for label, make in tables.items():
+        bare, _ = best(make)
+        rows = [["none", "-", "-", "-", "-", "-", f"{bare['ops_per_s']:,.0f}", miss_probes(bare), "1.00"]]
+        for fname, cls in filters.items():
+            for b in bits:
+                r, g = best(lambda: BloomGuard(make(), cls(n, b)))
+                f = g.bloom
+                rows.append([fname, f"{b:g}", f"{f.k}", f"{f.nbytes / 1024:,.1f}",
+                             f"{f.expected_rate():.2%}", f"{g.false_positive_rate():.2%}",
+                             f"{r['ops_per_s']:,.0f}", miss_probes(r),
+                             f"{r['ops_per_s'] / bare['ops_per_s']:.2f}"])
+        show(f"workload {name} ({len(ops):,} ops, {n:,} keys inserted): {label}",
+             ["filter", "bits/key", "k", "KiB", "FPR exp", "FPR", "ops/s", "miss probes", "speedup"],
+             rows)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("workloads", nargs="*", default=["C_10000", "D_10000"],
+                    help="letters (C) or names (C_5000); default C_10000 D_10000")
+    ap.add_argument("--bits", type=float, nargs="+", default=[4, 8, 12, 16],
+                    help="bits per key (counters per key for the counting filter)")
+    ap.add_argument("--tables", nargs="+", choices=list(TABLES), default=list(TABLES))
+    ap.add_argument("--filters", nargs="+", choices=list(FILTERS), default=list(FILTERS))
+    ap.add_argument("--repeat", type=int, default=1, help="keep the fastest of N runs")
+    args = ap.parse_args(argv)
+
+    tables = {t: TABLES[t] for t in args.tables}
+    filters = {f: FILTERS[f] for f in args.filters}
+    for name in workload_files(args.workloads):
+        sweep(name, tables, filters, args.bits, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+chained.py
+Separate chaining, the Python twin of Program 02's hashTable.hpp.
+
+Each bucket is a list of keys, the bucket index is key * 2654435761 mod
+capacity (the same multiplicative hash as the C++), and delete swaps the
+last key of the chain into the hole.  hashTable.hpp never resizes (101
+buckets); here max_load (keys per bucket) grows the table like the
+open-addressing ones, and max_load=None keeps the fixed size to match the
+assignment.
+
+`probes` counts the bucket read plus every key compared, so it lines up
+with the slot counts of open_addressing.py.
+"""
+
+
+class ChainedTable:
+    name = "chained"
+
+    def __init__(self, capacity=101, max_load=1.0):
+        self.max_load = max_load
+        self.size = 0
+        self.probes = 0
+        self.resizes = 0
+        self.buckets = [[] for _ in range(capacity)]
+
+    def _bucket(self, key):
+        return self.buckets[(key * 2654435761) % len(self.buckets)]
+
+    def _scan(self, chain, key):
+        """Index of key in chain or -1, charging the keys compared."""
+        for i, k in enumerate(chain):
+            if k == key:
+                self.probes += i + 2
+                return i
+        self.probes += len(chain) + 1
+        return -1
+
+    def insert(self, key):
+        chain = self._bucket(key)
+        if self._scan(chain, key) >= 0:
+            return False
+        chain.append(key)
+        self.size += 1
+        if self.max_load is not None and self.size > self.max_load * len(self.buckets):
+            self._resize(2 * len(self.buckets) + 1)
+        return True
+
+    def contains(self, key):
+        return self._scan(self._bucket(key), key) >= 0
+
+    def delete(self, key):
+        chain = self._bucket(key)
+        i = self._scan(chain, key)
+        if i < 0:
+            return False
+        chain[i] = chain[-1]
+        chain.pop()
+        self.size -= 1
+        return True
+
+    __contains__ = contains
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (k for chain in self.buckets for k in chain)
+
+    def _resize(self, capacity):
+        keys = list(self)
+        self.buckets = [[] for _ in range(capacity)]
+        for k in keys:
+            self._bucket(k).append(k)
+        self.resizes += 1
+
+    def stats(self):
+        lengths = [len(c) for c in self.buckets]
+        return {"size": self.size, "capacity": len(self.buckets),
+                "load": self.size / len(self.buckets), "longest_chain": max(lengths),
+                "resizes": self.resizes, "probes": self.probes}
@@ -0,0 +1,240 @@
+"""
+cuckoo.py
+Bucketized cuckoo hashing with a stash: lookups read a fixed number of slots.
+
+Every key has `ways` candidate buckets, one per hash function, and each
+bucket holds `bucket` keys.  A key is only ever stored in one of its
+buckets or in the small stash, so a lookup reads at most
+
+    ways * bucket + stash      slots      (2 * 4 + 4 = 12 by default)
+
+whatever the load, and however unlucky the keys.  That makes it a good
+fit for read-heavy traffic such as workload D (5 lookups per insert).
+
+Inserts pay instead.  A key that finds all its buckets full kicks a random
+resident out of one of them, and the evicted key moves to one of its own
+other buckets, maybe kicking someone else out, for up to max_kicks moves.
+A key still homeless after that goes to the stash.  When the stash is full
+too, the table is rebuilt with fresh hash functions: at the same size
+first, doubling after repeated failures.  It also doubles once keys pass
+max_load of the slots.
+
+Storage is the same as open_addressing.py: array('q') keys and values and a
+bytearray of used flags, bucket b owning slots b*bucket ... b*bucket+bucket-1.
+`probes` counts slots read (a bucket is read whole), `kicks` evictions,
+`rehashes` rebuilds.
+
+    python cuckoo.py                        # workload D against chained / linear / set
+    python cuckoo.py A C D --ways 3 --bucket 2 --stash 2
+"""
+
+import argparse
+import random
+from array import array
+
+from chained import ChainedTable
+from open_addressing import M64, LinearProbing
+from workloads import BuiltinSet, compare
+
+
+class CuckooTable:
+    name = "cuckoo"
+
+    def __init__(self, capacity=16, ways=2, bucket=4, stash=4, max_kicks=100,
+                 max_load=0.9, seed=5243):
+        if ways < 2:
+            raise ValueError("cuckoo hashing needs at least two hash functions")
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+        self.ways = ways
+        self.bucket = bucket
+        self.stash_size = stash
+        self.max_kicks = max_kicks
+        self.max_load = max_load
+        self.rng = random.Random(seed)
+        self.size = 0
+        self.probes = 0
+        self.kicks = 0
+        self.rehashes = 0
+        self.resizes = 0
+        self.stash = []                 # [(key, value)], at most stash_size
+        nb = max(1, -(-capacity // bucket))
+        self._alloc(1 << (nb - 1).bit_length())
+
+    def _alloc(self, nbuckets):
+        """Empty storage for nbuckets buckets and a fresh set of hash functions."""
+        self.nbuckets = nbuckets
+        self.shift = 64 - (nbuckets.bit_length() - 1)
+        slots = nbuckets * self.bucket
+        self.keys = array("q", bytes(8 * slots))
+        self.vals = array("q", bytes(8 * slots))
+        self.used = bytearray(slots)
+        self.mult = [self.rng.getrandbits(64) | 1 for _ in range(self.ways)]
+
+    @property
+    def capacity(self):
+        return self.nbuckets * self.bucket
+
+    def _buckets(self, key):
+        """First slot of each of key's candidate buckets."""
+        return [(((key * m) & M64) >> self.shift) * self.bucket for m in self.mult]
+
+    def _find(self, key):
+        """(table slot or -1, stash index or -1, slots read)."""
+        keys, used, B, shift = self.keys, self.used, self.bucket, self.shift
+        n = 0
+        for m in self.mult:                         # _buckets(), inlined
+            start = (((key * m) & M64) >> shift) * B
+            n += B
+            if key in keys[start:start + B]:        # C-level scan of the bucket
+                for i in range(start, start + B):
+                    if used[i] and keys[i] == key:
+                        return i, -1, n
+        for j, (k, _) in enumerate(self.stash):
+            n += 1
+            if k == key:
+                return -1, j, n
+        return -1, -1, n
+
+    def _put(self, key, value):
+        """Store key in a free slot of one of its buckets; False if all are full."""
+        used, B = self.used, self.bucket
+        for start in self._buckets(key):
+            i = used.find(0, start, start + B)
+            if i >= 0:
+                self.keys[i] = key
+                self.vals[i] = value
+                used[i] = 1
+                return True
+        return False
+
+    def _add(self, key, value, rebuild=True):
+        """
+        Place a new key, evicting along a random walk if its buckets are
+        full.  False (rebuild=False only) when the walk and the stash fail;
+        the table then holds every key but the one returned homeless.
+        """
+        if self._put(key, value):
+            return True
+        keys, vals, rng = self.keys, self.vals, self.rng
+        for _ in range(self.max_kicks):
+            i = rng.choice(self._buckets(key)) + rng.randrange(self.bucket)
+            key, keys[i] = keys[i], key
+            value, vals[i] = vals[i], value
+            self.kicks += 1
+            if self._put(key, value):
+                return True
+        if len(self.stash) < self.stash_size:
+            self.stash.append((key, value))
+            return True
+        if not rebuild:
+            return False
+        self._rebuild(self.nbuckets, [*self.items(), (key, value)])
+        return True
+
+    def _rebuild(self, nbuckets, items):
+        """Reinsert items with new hash functions; double after 3 failed tries."""
+        tries = 0
+        while True:
+            self._alloc(nbuckets)
+            self.stash = []
+            self.rehashes += 1
+            if all(self._add(k, v, rebuild=False) for k, v in items):
+                return
+            tries += 1
+            if tries == 3:
+                nbuckets *= 2
+                self.resizes += 1
+                tries = 0
+
+    # ── map interface ──
+
+    def insert(self, key, value=0):
+        """Add or update key.  True if it was new."""
+        slot, j, n = self._find(key)
+        self.probes += n
+        if slot >= 0:
+            self.vals[slot] = value
+            return False
+        if j >= 0:
+            self.stash[j] = (key, value)
+            return False
+        if self.size + 1 > self.max_load * self.capacity:
+            self.resizes += 1
+            self._rebuild(2 * self.nbuckets, list(self.items()))
+        self._add(key, value)
+        self.size += 1
+        return True
+
+    def contains(self, key):
+        slot, j, n = self._find(key)
+        self.probes += n
+        return slot >= 0 or j >= 0
+
+    def get(self, key, default=None):
+        slot, j, n = self._find(key)
+        self.probes += n
+        if slot >= 0:
+            return self.vals[slot]
+        return self.stash[j][1] if j >= 0 else default
+
+    def delete(self, key):
+        """Remove key.  True if it was there."""
+        slot, j, n = self._find(key)
+        self.probes += n
+        if slot >= 0:
+            self.used[slot] = 0
+            # a freed slot may be one a stashed key was waiting for
+            self.stash = [(k, v) for k, v in self.stash if not self._put(k, v)]
+        elif j >= 0:
+            del self.stash[j]
+        else:
+            return False
+        self.size -= 1
+        return True
+
+    __contains__ = contains
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (k for k, _ in self.items())
+
+    def items(self):
+        yield from ((k, v) for k, v, u in zip(self.keys, self.vals, self.used) if u)
+        yield from self.stash
+
+    def stats(self):
+        return {"size": self.size, "capacity": self.capacity, "load": self.size / self.capacity,
+                "stash": len(self.stash), "kicks": self.kicks, "rehashes": self.rehashes,
+                "resizes": self.resizes, "probes": self.probes,
+                "max_lookup_slots": self.ways * self.bucket + self.stash_size}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("workloads", nargs="*", default=["D"],
+                    help="letters (C) or names (C_5000); default D")
+    ap.add_argument("--ways", type=int, default=2)
+    ap.add_argument("--bucket", type=int, default=4)
+    ap.add_argument("--stash", type=int, default=4)
+    ap.add_argument("--max-kicks", type=int, default=100)
+    ap.add_argument("--max-load", type=float, default=0.9)
+    ap.add_argument("--repeat", type=int, default=1, help="keep the fastest of N runs")
+    args = ap.parse_args(argv)
+
+    tables = {
+        f"cuckoo {args.ways}x{args.bucket}": lambda: CuckooTable(
+            ways=args.ways, bucket=args.bucket, stash=args.stash,
+            max_kicks=args.max_kicks, max_load=args.max_load),
+        "linear": LinearProbing,
+        "chained": ChainedTable,
+        "chained (101)": lambda: ChainedTable(101, max_load=None),
+        "set (built-in)": BuiltinSet,
+    }
+    compare(tables, args.workloads, args.repeat, latency=True)
+
+
+if __name__ == "__main__":
+    main()
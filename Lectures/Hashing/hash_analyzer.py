@@ -0,0 +1,418 @@
+"""
+hash_analyzer.py
+Bulk hash-distribution analyzer (the vectorized big brother of
+low_order_test.py).
+
+Every hash function works on a whole NumPy array of keys at once, so
+10 million keys per function take well under a second instead of a
+print() per key.  For each key set and hash it reports
+
+    max load      fullest bucket (and the mean load n/m it should be near)
+    empty         fraction of empty buckets (uniform hashing: e^(-n/m))
+    chi2/df       chi-square of the bucket counts against uniform; ~1 is
+                  what random keys give, z > 3 means the buckets are
+                  measurably uneven, z far below 0 means more even than
+                  random (sequential keys filling buckets round-robin)
+    low-bit bias  worst |P(bit = 1) - 0.5| over the low log2(m) bits of
+                  the hash value, the bits that pick the bucket when m is
+                  a power of two (the low_order_test.py experiment)
+
+and, per hash, the avalanche matrix: flip each of the 32 bits of a random
+key and measure how often each of the 32 output bits flips (ideal 0.5).
+
+Hashes
+    modulo          h = k                       (the table applies % m)
+    multiplicative  h = k * 2654435761 mod 2^32 (Knuth; integer_hashing.md)
+    fibonacci       h = high 32 bits of k * 2^64/phi
+    xorshift        x ^= x >> 16; x *= 0x7feb352d; x ^= x >> 15;
+                    x *= 0x846ca68b; x ^= x >> 16
+    fnv1a           FNV-1a over the key's bytes
+    poly31          h = 31*h + c mod 2^32       (Java's String.hashCode)
+    poly_prime      h = 257*h + c mod 2^31 - 1
+
+The first four take integer keys; the byte hashes take both (an integer
+is its 4 little-endian bytes).
+
+Key sets
+    random      uniform 32-bit integers
+    lowtest     random.randint(m, 10*m) draws, as in low_order_test.py; only
+                9m+1 distinct keys, each repeated, so only a hash that
+                spreads that exact range evenly (plain modulo) looks uniform
+    sequential  0, 1, 2, ...
+    strided     0, 1024, 2048, ...  (keys sharing their low bits)
+    ids         "key00000000", "key00000001", ... (strings)
+    words       the repo's dictionary (strings, ~134k)
+
+    python hash_analyzer.py                            # 10^7 keys, m = 1024 and 1021
+    python hash_analyzer.py -n 1000000 -m 4096 --keys random strided
+    python hash_analyzer.py --hashes fnv1a xorshift --histogram
+    python hash_analyzer.py --json report.json
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+try:
+    from rich.console import Console
+    from rich.table import Table
+except ImportError:                   # plain-text tables without rich
+    Console = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.abspath(os.path.join(HERE, "..", ".."))
+WORDS = os.path.join(REPO, "Resources", "04-Data", "dictionary_files", "dict.txt")
+
+U32 = np.uint32
+U64 = np.uint64
+
+
+# ── keys ──────────────────────────────────────────────────────────────────────
+# Integer keys are uint32 arrays.  String keys are (bytes, lengths): an
+# (n, L) uint8 matrix of zero-padded strings and each string's length.
+
+def as_bytes(keys):
+    """(bytes, lengths) form of any key set."""
+    if isinstance(keys, tuple):
+        return keys
+    b = np.ascontiguousarray(keys, dtype="<u4").view(np.uint8).reshape(-1, 4)
+    return b, np.full(len(keys), 4, dtype=np.int32)
+
+
+def string_keys(words):
+    """(bytes, lengths) for a list of str."""
+    enc = [w.encode("utf-8") for w in words]
+    lengths = np.fromiter(map(len, enc), dtype=np.int32, count=len(enc))
+    width = int(lengths.max()) if len(enc) else 1
+    b = np.array(enc, dtype=f"S{width}").view(np.uint8).reshape(len(enc), width)
+    return b, lengths
+
+
+def id_keys(n, prefix=b"key", digits=8, start=0):
+    """'key00000000' ... as (bytes, lengths), built without making strings."""
+    b = np.empty((n, len(prefix) + digits), dtype=np.uint8)
+    b[:, :len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+    t = U32 if start + n <= 2**32 else U64
+    q = np.arange(start, start + n, dtype=t)
+    for pos in range(b.shape[1] - 1, len(prefix) - 1, -1):
+        b[:, pos] = q % t(10) + t(48)
+        q //= t(10)
+    return b, np.full(n, b.shape[1], dtype=np.int32)
+
+
+def make_keys(name, n, m, rng):
+    """Key set `name` with (up to) n keys; m is the table size."""
+    if name == "random":
+        return rng.integers(0, 2**32, n, dtype=np.uint64).astype(U32)
+    if name == "lowtest":
+        return rng.integers(m, 10 * m, n, endpoint=True, dtype=np.uint64).astype(U32)
+    if name == "sequential":
+        return np.arange(n, dtype=U32)
+    if name == "strided":
+        return (np.arange(n, dtype=np.uint64) * 1024).astype(U32)
+    if name == "ids":
+        return id_keys(n)
+    if name == "words":
+        with open(WORDS, encoding="utf-8") as f:
+            words = [w for w in (line.strip() for line in f) if w][:n]
+        return string_keys(words)
+    raise ValueError(f"unknown key set {name!r}")
+
+
+KEY_SETS = ["random", "lowtest", "sequential", "strided", "ids", "words"]
+
+
+# ── hash functions ────────────────────────────────────────────────────────────
+# Integer hashes take a uint32 array; byte hashes take (bytes, lengths).
+# All return uint32 arrays.  NumPy integer arrays wrap on overflow, which is
+# exactly the mod 2^32 / 2^64 arithmetic these hashes are written in.
+
+def h_modulo(x):
+    return x.astype(U32, copy=True)
+
+
+def h_multiplicative(x):
+    return x.astype(U32) * U32(2654435761)
+
+
+def h_fibonacci(x):
+    return ((x.astype(U64) * U64(0x9E3779B97F4A7C15)) >> U64(32)).astype(U32)
+
+
+def h_xorshift(x):
+    x = x.astype(U32, copy=True)
+    x ^= x >> U32(16)
+    x *= U32(0x7FEB352D)
+    x ^= x >> U32(15)
+    x *= U32(0x846CA68B)
+    x ^= x >> U32(16)
+    return x
+
+
+def byte_hash(keys, h0, step, dtype=U32):
+    """
+    Fold step(h, byte column) over the byte positions of the keys; step
+    updates h in place.  Keys shorter than a position keep their h.
+    """
+    b, lengths = as_bytes(keys)
+    cols = np.ascontiguousarray(b.T)          # one contiguous row per position
+    h = np.full(len(b), h0, dtype=dtype)
+    for j, col in enumerate(cols):
+        live = lengths > j
+        if live.all():
+            step(h, col)
+        else:
+            sub = h[live]
+            step(sub, col[live])
+            h[live] = sub
+    return h.astype(U32, copy=False)
+
+
+def _fnv1a_step(h, c):
+    h ^= c
+    h *= U32(16777619)
+
+
+def _poly31_step(h, c):
+    h *= U32(31)
+    h += c
+
+
+MERSENNE31 = (1 << 31) - 1
+
+def _poly_prime_step(h, c):
+    # h < 2^32, so 257*h + c < 2^41 fits in uint64.  x mod (2^31 - 1) is
+    # congruent to (x & (2^31 - 1)) + (x >> 31) < 2^31 + 2^10; the final
+    # subtraction back under 2^31 - 1 waits until the last byte
+    h *= U64(257)
+    h += c
+    hi = h >> U64(31)
+    h &= U64(MERSENNE31)
+    h += hi
+
+
+def h_fnv1a(keys):
+    return byte_hash(keys, 2166136261, _fnv1a_step)
+
+
+def h_poly31(keys):
+    return byte_hash(keys, 0, _poly31_step)
+
+
+def h_poly_prime(keys):
+    h = byte_hash(keys, 0, _poly_prime_step, dtype=U64)
+    np.subtract(h, U32(MERSENNE31), out=h, where=h >= U32(MERSENNE31))
+    return h
+
+
+# name → (kind, function); kind "int" hashes only take integer keys
+HASHES = {
+    "modulo":         ("int",   h_modulo),
+    "multiplicative": ("int",   h_multiplicative),
+    "fibonacci":      ("int",   h_fibonacci),
+    "xorshift":       ("int",   h_xorshift),
+    "fnv1a":          ("bytes", h_fnv1a),
+    "poly31":         ("bytes", h_poly31),
+    "poly_prime":     ("bytes", h_poly_prime),
+}
+
+
+def hash_keys(name, keys):
+    """HASHES[name] applied to keys, or None if it cannot take them."""
+    kind, fn = HASHES[name]
+    if kind == "int" and isinstance(keys, tuple):
+        return None
+    return fn(keys)
+
+
+def n_keys(keys):
+    return len(keys[0]) if isinstance(keys, tuple) else len(keys)
+
+
+# ── measurements ──────────────────────────────────────────────────────────────
+
+def chi_square(counts, n):
+    """(chi2, df, z, p) of bucket counts against a uniform spread of n keys."""
+    m = len(counts)
+    expected = n / m
+    chi2 = float(((counts - expected) ** 2).sum() / expected)
+    df = m - 1
+    # Wilson–Hilferty: (chi2/df)^(1/3) is close to normal for any df
+    mu, var = 1 - 2 / (9 * df), 2 / (9 * df)
+    z = ((chi2 / df) ** (1 / 3) - mu) / math.sqrt(var)
+    p = 0.5 * math.erfc(z / math.sqrt(2))
+    return chi2, df, z, p
+
+
+def bit_ones(h, bits):
+    """
+    Fraction of hash values with each of the low `bits` bits set: one
+    bincount per 16 bits, then each bit's share is read off the counts.
+    """
+    n, out = len(h), []
+    for lo in range(0, bits, 16):
+        w = min(16, bits - lo)
+        counts = np.bincount((h >> U32(lo)) & U32((1 << w) - 1), minlength=1 << w)
+        v = np.arange(1 << w)
+        out += [int(counts[(v >> b) & 1 == 1].sum()) / n for b in range(w)]
+    return out
+
+
+def table_bits(m):
+    """Bits of the hash a table of m buckets looks at when m is a power of two."""
+    return max(1, (m - 1).bit_length())
+
+
+def analyze(h, m, bits=None):
+    """Bucket statistics for hash values h in a table of m buckets."""
+    n = len(h)
+    bits = bits or table_bits(m)
+    idx = h & U32(m - 1) if m & (m - 1) == 0 else h % U32(m)
+    counts = np.bincount(idx, minlength=m)
+    chi2, df, z, p = chi_square(counts, n)
+    ones = bit_ones(h, bits)
+    return {
+        "n": n,
+        "m": m,
+        "mean_load": n / m,
+        "max_load": int(counts.max()),
+        "empty": float(np.count_nonzero(counts == 0) / m),
+        "expected_empty": math.exp(-n / m),
+        "chi2": chi2,
+        "chi2_df": chi2 / df,
+        "z": z,
+        "p": p,
+        "bit_ones": ones,
+        "low_bit_bias": max(abs(f - 0.5) for f in ones),
+        "counts": counts,
+    }
+
+
+def avalanche(name, samples=100_000, seed=0):
+    """
+    32x32 matrix: [i][j] = P(output bit j flips | input bit i flips), over
+    random 32-bit keys.  Returns (matrix, mean |p - 0.5|, worst |p - 0.5|).
+    """
+    _, fn = HASHES[name]
+    x = np.random.default_rng(seed).integers(0, 2**32, samples, dtype=np.uint64).astype(U32)
+    base = fn(x)
+    mat = np.empty((32, 32))
+    for i in range(32):
+        d = base ^ fn(x ^ U32(1 << i))
+        flips = np.unpackbits(d.view(np.uint8).reshape(-1, 4), axis=1, bitorder="little")
+        mat[i] = flips.mean(axis=0)
+    dev = np.abs(mat - 0.5)
+    return mat, float(dev.mean()), float(dev.max())
+
+
+def spark(counts, width=64):
+    """One-line bar chart of bucket load across the table (bucket index →)."""
+    bars = " ▁▂▃▄▅▆▇█"
+    groups = np.array_split(counts, min(width, len(counts)))
+    loads = np.array([g.mean() for g in groups])
+    top = loads.max() or 1
+    return "".join(bars[int(round(v / top * (len(bars) - 1)))] for v in loads)
+
+
+def binary_lines(keys, h, m, count):
+    """The low_order_test.py view of the first `count` keys."""
+    out = []
+    for i in range(min(count, len(h))):
+        k = (bytes(keys[0][i, :keys[1][i]]).decode() if isinstance(keys, tuple)
+             else int(keys[i]))
+        v = int(h[i] % U32(m))
+        out.append(f"{k} -> {v} -> Binary: {v:016b}")
+    return out
+
+
+# ── report ────────────────────────────────────────────────────────────────────
+
+def show(title, header, rows):
+    if Console is not None:
+        t = Table(title=title, title_justify="left")
+        for i, col in enumerate(header):
+            t.add_column(col, justify="left" if i == 0 else "right")
+        for r in rows:
+            t.add_row(*r)
+        Console().print(t)
+        return
+    widths = [max(len(str(x)) for x in col) for col in zip(header, *rows)]
+    print(f"\n{title}")
+    for r in [header, *rows]:
+        print("  ".join(str(x).ljust(w) if i == 0 else str(x).rjust(w)
+                        for i, (x, w) in enumerate(zip(r, widths))))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("-n", "--num", type=int, default=10_000_000, help="keys per key set")
+    ap.add_argument("-m", "--buckets", type=int, nargs="+", default=[1024, 1021])
+    ap.add_argument("--keys", nargs="+", default=KEY_SETS, choices=KEY_SETS)
+    ap.add_argument("--hashes", nargs="+", default=list(HASHES), choices=list(HASHES))
+    ap.add_argument("--bits", type=int, help="low-order bits to check "
+                    "(default: the log2(m) bits that would pick the bucket)")
+    ap.add_argument("--avalanche", type=int, default=100_000, metavar="SAMPLES")
+    ap.add_argument("--histogram", action="store_true", help="bucket load bar per hash")
+    ap.add_argument("--show", type=int, default=0, metavar="K",
+                    help="print the first K keys in binary, like low_order_test.py")
+    ap.add_argument("--seed", type=int, default=5243)
+    ap.add_argument("--json", metavar="PATH", help="also write every metric as JSON")
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    report = {"n": args.num, "seed": args.seed, "tables": {}, "avalanche": {}}
+    t_all = time.perf_counter()
+
+    for kname in args.keys:
+        keys = None
+        for m in args.buckets:
+            if keys is None or kname == "lowtest":      # lowtest keys depend on m
+                keys, hashed = make_keys(kname, args.num, m, rng), {}
+            rows, bars = [], []
+            for hname in args.hashes:
+                if hname not in hashed:                 # hash values do not depend on m
+                    t0 = time.perf_counter()
+                    hashed[hname] = hash_keys(hname, keys), time.perf_counter() - t0
+                h, secs = hashed[hname]
+                if h is None:
+                    continue
+                r = analyze(h, m, args.bits)
+                chi = r["chi2_df"]
+                rows.append([hname, f"{r['max_load']:,}", f"{r['empty']:.2%}",
+                             f"{chi:,.2f}" if chi < 1000 else f"{chi:,.0f}", f"{r['z']:,.1f}",
+                             f"{r['low_bit_bias']:.3f}", f"{secs:.2f}"])
+                if args.histogram:
+                    bars.append(f"  {hname:<15}{spark(r['counts'])}")
+                for line in binary_lines(keys, h, m, args.show):
+                    print(f"  {hname:<15}{line}")
+                r["counts"] = r["counts"].tolist() if args.json else None
+                r["hash_seconds"] = secs
+                report["tables"].setdefault(str(m), {}).setdefault(kname, {})[hname] = r
+            n = n_keys(keys)
+            show(f"{kname}: {n:,} keys, m = {m}, mean load {n / m:,.1f}, "
+                 f"uniform empty {math.exp(-n / m):.2%}",
+                 ["hash", "max load", "empty", "chi2/df", "z", "low bits", "hash s"], rows)
+            for b in bars:
+                print(b)
+
+    rows = []
+    for hname in args.hashes:
+        _, mean_dev, worst = avalanche(hname, args.avalanche, args.seed)
+        rows.append([hname, f"{mean_dev:.3f}", f"{worst:.3f}"])
+        report["avalanche"][hname] = {"mean_bias": mean_dev, "worst_bias": worst}
+    show(f"avalanche over {args.avalanche:,} random keys (|P(flip) - 0.5|; 0 is ideal)",
+         ["hash", "mean", "worst"], rows)
+
+    print(f"\n{time.perf_counter() - t_all:.1f} s total")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=1)
+        print("Saved:", args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+hash_stream.py
+Streaming collision statistics in constant memory.
+
+low_order_test.py keeps every key it formats and a dict entry per bucket
+value, so memory grows with the stream.  Here keys arrive in chunks (from
+a generator or a file) and are folded into fixed-size state, so a billion
+keys take the same memory as a thousand:
+
+    per-bucket counters   one int64 per bucket per hash (max load, chi2,
+                          empty buckets, collisions = keys that landed in
+                          an already occupied bucket)
+    HyperLogLog           2^p one-byte registers; distinct keys to ~1.04/sqrt(2^p)
+    reservoir sample      k keys, uniformly chosen from everything seen
+    running moments       mean / std / skew / kurtosis of the key values
+                          (string keys: their lengths), merged chunk by chunk
+
+A summary line per hash is printed every --every keys instead of one line
+per key.  Summaries come between chunks, so they land on the first chunk
+boundary at or past each multiple of --every; with --every below --chunk,
+that is once per chunk.  Hash functions and key sets are the ones in hash_analyzer.py.
+
+    python hash_stream.py -n 1000000000 --keys random --every 100000000
+    python hash_stream.py --file ../../Resources/04-Data/dictionary_files/dict.txt
+    seq 1 5000000 | python hash_stream.py --file - --int -m 1000
+"""
+
+import argparse
+import itertools
+import math
+import sys
+import time
+
+import numpy as np
+
+from hash_analyzer import (HASHES, U32, U64, byte_hash, chi_square, id_keys, show,
+                           string_keys)
+
+
+# ── 64-bit key fingerprint for the HyperLogLog ────────────────────────────────
+
+def _splitmix64(x):
+    x = x.astype(U64, copy=True)
+    x += U64(0x9E3779B97F4A7C15)
+    x ^= x >> U64(30)
+    x *= U64(0xBF58476D1CE4E5B9)
+    x ^= x >> U64(27)
+    x *= U64(0x94D049BB133111EB)
+    x ^= x >> U64(31)
+    return x
+
+
+def _fnv1a64_step(h, c):
+    h ^= c
+    h *= U64(0x100000001B3)
+
+
+def fingerprint(keys):
+    """
+    Well-mixed 64-bit hash of each key, independent of the hashes under
+    test: splitmix64 of an integer key, or of the 64-bit FNV-1a of a
+    string key's bytes.
+    """
+    if isinstance(keys, tuple):
+        keys = byte_hash(keys, 0xCBF29CE484222325, _fnv1a64_step, dtype=U64)
+    return _splitmix64(keys)
+
+
+def bit_length(x):
+    """Vectorized int.bit_length() for uint64 (exact: each half fits a float64)."""
+    hi = (x >> U64(32)).astype(np.float64)
+    lo = (x & U64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(hi > 0, np.frexp(hi)[1] + 32, np.frexp(lo)[1])
+
+
+# ── fixed-size summaries ──────────────────────────────────────────────────────
+
+class HyperLogLog:
+    """Distinct-count estimate from 2^p registers (Flajolet et al., 2007)."""
+
+    def __init__(self, p=14):
+        self.p = p
+        self.m = 1 << p
+        self.reg = np.zeros(self.m, dtype=np.uint8)
+
+    def add(self, fp):
+        """Fold an array of 64-bit fingerprints into the registers."""
+        q = 64 - self.p
+        idx = (fp >> U64(q)).astype(np.intp)
+        rest = fp & U64((1 << q) - 1)
+        rank = (q + 1 - bit_length(rest)).astype(np.uint8)     # leading zeros + 1
+        np.maximum.at(self.reg, idx, rank)
+
+    def estimate(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        est = alpha * m * m / np.ldexp(1.0, -self.reg.astype(np.int64)).sum()
+        zeros = int(np.count_nonzero(self.reg == 0))
+        if est <= 2.5 * m and zeros:                 # small range: linear counting
+            est = m * math.log(m / zeros)
+        return est
+
+
+class Reservoir:
+    """k keys sampled uniformly from a stream of unknown length (Algorithm R)."""
+
+    def __init__(self, k, rng):
+        self.k = k
+        self.rng = rng
+        self.items = []
+        self.seen = 0
+
+    def add(self, keys, n):
+        """
+        Offer the n keys of one chunk.  Key j of the stream (0-based) takes
+        slot r ~ U[0, j] if r < k, so only the accepted keys are converted
+        to Python objects.
+        """
+        start = self.seen
+        self.seen += n
+        fill = min(n, max(0, self.k - start))
+        for i in range(fill):
+            self.items.append(_key_at(keys, i))
+        if fill == n:
+            return
+        j = np.arange(start + fill, start + n, dtype=np.int64)
+        r = self.rng.integers(0, j + 1)
+        for i in np.flatnonzero(r < self.k):
+            self.items[r[i]] = _key_at(keys, fill + i)
+
+
+def _key_at(keys, i):
+    if isinstance(keys, tuple):
+        b, lengths = keys
+        return bytes(b[i, :lengths[i]]).decode("utf-8", "replace")
+    return int(keys[i])
+
+
+class Moments:
+    """Mean, variance, skewness and kurtosis, merged chunk by chunk (Pébay 2008)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = self.m2 = self.m3 = self.m4 = 0.0
+
+    def add(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        nb = len(x)
+        if not nb:
+            return
+        mb = float(x.mean())
+        d = x - mb
+        d2 = d * d
+        m2b, m3b, m4b = float(d2.sum()), float((d2 * d).sum()), float((d2 * d2).sum())
+        na, n = self.n, self.n + nb
+        delta = mb - self.mean
+        m2a, m3a = self.m2, self.m3
+        self.m4 += (m4b + delta**4 * na * nb * (na * na - na * nb + nb * nb) / n**3
+                    + 6 * delta**2 * (na * na * m2b + nb * nb * m2a) / n**2
+                    + 4 * delta * (na * m3b - nb * m3a) / n)
+        self.m3 += (m3b + delta**3 * na * nb * (na - nb) / n**2
+                    + 3 * delta * (na * m2b - nb * m2a) / n)
+        self.m2 += m2b + delta**2 * na * nb / n
+        self.mean += delta * nb / n
+        self.n = n
+
+    def summary(self):
+        """(mean, std, skewness, excess kurtosis)."""
+        if self.n < 2 or not self.m2:
+            return self.mean, 0.0, 0.0, 0.0
+        return (self.mean, math.sqrt(self.m2 / (self.n - 1)),
+                math.sqrt(self.n) * self.m3 / self.m2**1.5,
+                self.n * self.m4 / self.m2**2 - 3)
+
+
+# ── the stream ────────────────────────────────────────────────────────────────
+
+class StreamStats:
+    """
+    Everything the stream keeps: bucket counters per hash, a HyperLogLog,
+    a reservoir and key moments.  Memory is O(m * hashes + 2^p + k),
+    whatever the number of keys.
+    """
+
+    def __init__(self, m, hashes, p=14, samples=10, seed=0):
+        self.m = m
+        self.hashes = list(hashes)
+        self.counts = {h: np.zeros(m, dtype=np.int64) for h in self.hashes}
+        self.hll = HyperLogLog(p)
+        self.reservoir = Reservoir(samples, np.random.default_rng(seed))
+        self.moments = Moments()
+        self.strings = False
+        self.n = 0
+
+    def add(self, keys):
+        """Fold one chunk (uint32 array or (bytes, lengths))."""
+        strings = isinstance(keys, tuple)
+        n = len(keys[0]) if strings else len(keys)
+        for name in self.hashes:
+            kind, fn = HASHES[name]
+            if kind == "int" and strings:
+                continue
+            idx = fn(keys)
+            idx = idx & U32(self.m - 1) if self.m & (self.m - 1) == 0 else idx % U32(self.m)
+            self.counts[name] += np.bincount(idx, minlength=self.m)
+        self.hll.add(fingerprint(keys))
+        self.reservoir.add(keys, n)
+        self.moments.add(keys[1] if strings else keys)
+        self.strings = strings
+        self.n += n
+
+    def bucket_stats(self, name):
+        """(max load, empty fraction, collisions, chi2/df) for one hash, or None."""
+        c = self.counts[name]
+        total = int(c.sum())
+        if not total:
+            return None
+        occupied = int(np.count_nonzero(c))
+        chi2, df, _, _ = chi_square(c, total)
+        return int(c.max()), 1 - occupied / self.m, total - occupied, chi2 / df
+
+
+def key_chunks(name, n, m, chunk, rng):
+    """
+    Up to n keys of a hash_analyzer key set, chunk at a time (n = None:
+    forever).  Sequential, strided and id keys continue across chunks.
+    """
+    digits = max(8, len(str((n or 10**12) - 1)))
+    for start in itertools.count(0, chunk):
+        c = chunk if n is None else min(chunk, n - start)
+        if c <= 0:
+            return
+        if name == "random":
+            yield rng.integers(0, 2**32, c, dtype=np.uint64).astype(U32)
+        elif name == "lowtest":
+            yield rng.integers(m, 10 * m, c, endpoint=True, dtype=np.uint64).astype(U32)
+        elif name == "sequential":
+            yield np.arange(start, start + c, dtype=U64).astype(U32)
+        elif name == "strided":
+            yield (np.arange(start, start + c, dtype=U64) * U64(1024)).astype(U32)
+        elif name == "ids":
+            yield id_keys(c, digits=digits, start=start)
+        else:
+            raise ValueError(f"unknown key set {name!r}")
+
+
+def file_chunks(path, chunk, ints=False, n=None):
+    """Keys of a one-per-line file ("-" = stdin), chunk lines at a time."""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8", errors="replace")
+    try:
+        lines = (line.strip() for line in f)
+        lines = (w for w in lines if w)
+        if n is not None:
+            lines = itertools.islice(lines, n)
+        while True:
+            block = list(itertools.islice(lines, chunk))
+            if not block:
+                return
+            if ints:
+                yield np.array([int(w) & 0xFFFFFFFF for w in block], dtype=U32)
+            else:
+                yield string_keys(block)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+# ── report ────────────────────────────────────────────────────────────────────
+
+def progress(stats, elapsed):
+    mean_load = stats.n / stats.m
+    print(f"{stats.n:>15,} keys  {stats.n / elapsed / 1e6:7.2f} M keys/s  "
+          f"distinct ≈ {stats.hll.estimate():,.0f}  mean load {mean_load:,.1f}")
+    for name in stats.hashes:
+        b = stats.bucket_stats(name)
+        if b:
+            mx, empty, _, chi = b
+            print(f"    {name:<15}max {mx:>12,}  empty {empty:7.2%}  chi2/df {chi:10,.2f}")
+    sys.stdout.flush()
+
+
+def report(stats, elapsed):
+    mean, std, skew, kurt = stats.moments.summary()
+    distinct = stats.hll.estimate()
+    print(f"\n{stats.n:,} keys in {elapsed:.1f} s ({stats.n / elapsed / 1e6:.2f} M keys/s)")
+    print(f"distinct ≈ {distinct:,.0f} (HyperLogLog, 2^{stats.hll.p} registers, "
+          f"±{1.04 / math.sqrt(stats.hll.m):.1%})")
+    print(f"key {'length' if stats.strings else 'value'}: "
+          f"mean {mean:,.2f}  std {std:,.2f}  skew {skew:.3f}  excess kurtosis {kurt:.3f}")
+
+    rows = []
+    for name in stats.hashes:
+        b = stats.bucket_stats(name)
+        if b:
+            mx, empty, coll, chi = b
+            rows.append([name, f"{mx:,}", f"{empty:.2%}", f"{coll:,}",
+                         f"{chi:,.2f}" if chi < 1000 else f"{chi:,.0f}"])
+    show(f"m = {stats.m}, mean load {stats.n / stats.m:,.1f}",
+         ["hash", "max load", "empty", "collisions", "chi2/df"], rows)
+
+    names = [n for n in stats.hashes if stats.counts[n].any()]
+    rows = []
+    for key in stats.reservoir.items:
+        k = (np.array([key], dtype=U32) if isinstance(key, int) else string_keys([key]))
+        rows.append([str(key)] + [str(int(HASHES[n][1](k)[0]) % stats.m) for n in names])
+    show(f"{len(rows)} keys sampled uniformly from the stream, and their buckets",
+         ["key"] + names, rows)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--keys", default="random",
+                     choices=["random", "lowtest", "sequential", "strided", "ids"])
+    src.add_argument("--file", help='one key per line ("-" = stdin)')
+    ap.add_argument("--int", action="store_true", help="file keys are integers")
+    ap.add_argument("-n", "--num", type=int, default=100_000_000,
+                    help="keys to read (0 = until the file ends / forever)")
+    ap.add_argument("-m", "--buckets", type=int, default=1024)
+    ap.add_argument("--hashes", nargs="+", default=list(HASHES), choices=list(HASHES))
+    ap.add_argument("--chunk", type=int, default=1 << 20)
+    ap.add_argument("--every", type=int, default=10_000_000, help="keys between summaries (rounded up to whole chunks)")
+    ap.add_argument("--hll-p", type=int, default=14)
+    ap.add_argument("--samples", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=5243)
+    args = ap.parse_args(argv)
+
+    n = args.num or None
+    if args.file:
+        chunks = file_chunks(args.file, args.chunk, args.int, n)
+    else:
+        chunks = key_chunks(args.keys, n, args.buckets, args.chunk,
+                            np.random.default_rng(args.seed))
+    stats = StreamStats(args.buckets, args.hashes, args.hll_p, args.samples, args.seed)
+
+    t0 = time.perf_counter()
+    next_report = args.every
+    try:
+        for keys in chunks:
+            stats.add(keys)
+            if stats.n >= next_report:
+                progress(stats, time.perf_counter() - t0)
+                next_report = (stats.n // args.every + 1) * args.every
+    except KeyboardInterrupt:
+        print("\ninterrupted")
+    report(stats, time.perf_counter() - t0)
+
+
+if __name__ == "__main__":
+    main()
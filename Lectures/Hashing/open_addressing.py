@@ -0,0 +1,324 @@
+"""
+open_addressing.py
+Open-addressing hash tables: linear, quadratic, double hashing, Robin Hood.
+
+One int → int map per collision strategy, all sharing the same storage:
+no per-slot objects, just parallel buffers indexed by slot
+
+    keys    array('q')    key in the slot
+    vals    array('q')    its value
+    state   bytearray     EMPTY, FULL or TOMB (a deleted slot)
+
+The capacity is a power of two and a key's home slot is the top bits of
+key * 2^64/φ (Fibonacci hashing), so consecutive keys spread out and the
+probe sequences below visit every slot:
+
+    LinearProbing      h, h+1, h+2, ...
+    QuadraticProbing   h, h+1, h+3, h+6, ...      (triangular numbers)
+    DoubleHashing      h, h+s, h+2s, ...          (s from a second hash, odd)
+    RobinHood          linear, but an insert takes the slot of any key that
+                       is closer to its home than the new key is; deletes
+                       shift the run back, so there are no tombstones
+
+A table grows once keys + tombstones would pass max_load of the slots,
+doubling as needed (or, when tombstones are most of the load, rehashing at
+the same size to clear them), and shrinks below min_load (0 = never).
+
+Every operation adds the slots it examined to `probes`; rehashing is
+counted in `rehash_probes`, and Robin Hood displacements in `moves`.
+workloads.replay() turns those counters into per-operation probe counts.
+
+    python open_addressing.py                      # all Program 02 workloads
+    python open_addressing.py C D --max-load 0.9 --hist
+"""
+
+import argparse
+from array import array
+
+from workloads import BuiltinSet, compare
+
+EMPTY, FULL, TOMB = 0, 1, 2
+
+M64 = (1 << 64) - 1
+FIB = 0x9E3779B97F4A7C15        # 2^64 / golden ratio, odd
+MIX = 0xC2B2AE3D27D4EB4F        # second multiplier for the double-hashing step
+
+
+class OpenAddressing:
+    """Shared storage, resizing and counters; subclasses pick the probe order."""
+
+    name = "open addressing"
+    triangular = False          # quadratic probing: step n moves n slots on
+
+    def __init__(self, capacity=8, max_load=0.7, min_load=0.0):
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+        if not 0 <= min_load < max_load / 4:
+            raise ValueError("min_load must be below max_load / 4")
+        self.max_load = max_load
+        self.min_load = min_load
+        self.size = 0
+        self.tombs = 0
+        self.probes = 0
+        self.rehash_probes = 0
+        self.moves = 0
+        self.resizes = 0
+        self._alloc(max(8, 1 << (capacity - 1).bit_length()))
+
+    def _alloc(self, cap):
+        self.cap = cap
+        self.mask = cap - 1
+        self.shift = 64 - (cap.bit_length() - 1)
+        self.keys = array("q", bytes(8 * cap))
+        self.vals = array("q", bytes(8 * cap))
+        self.state = bytearray(cap)
+
+    # ── probe sequence ──
+
+    def _home(self, key):
+        return ((key * FIB) & M64) >> self.shift
+
+    def _step(self, key):
+        return 1
+
+    def _find(self, key):
+        """
+        (slot of key or -1, first reusable slot on the way or -1, probes).
+        Stops at the first EMPTY slot; tombstones are passed over but
+        remembered, so an insert can reuse the earliest one.
+        """
+        keys, state, mask = self.keys, self.state, self.mask
+        i = self._home(key)
+        step = self._step(key)
+        tri = self.triangular
+        free = -1
+        for n in range(1, self.cap + 1):
+            s = state[i]
+            if s == EMPTY:
+                return -1, i if free < 0 else free, n
+            if s == FULL:
+                if keys[i] == key:
+                    return i, free, n
+            elif free < 0:
+                free = i
+            i = (i + (n if tri else step)) & mask
+        return -1, free, self.cap
+
+    def _place(self, key, value):
+        """Put a key known to be absent into the first non-FULL slot (rehash)."""
+        keys, state, mask = self.keys, self.state, self.mask
+        i = self._home(key)
+        step = self._step(key)
+        n = 1
+        while state[i] == FULL:
+            i = (i + (n if self.triangular else step)) & mask
+            n += 1
+        self.rehash_probes += n
+        self.tombs -= state[i] == TOMB
+        keys[i] = key
+        self.vals[i] = value
+        state[i] = FULL
+
+    # ── resizing ──
+
+    def _resize(self, cap):
+        live = [(k, v) for k, v, s in zip(self.keys, self.vals, self.state) if s == FULL]
+        self._alloc(cap)
+        self.tombs = 0
+        for k, v in live:
+            self._place(k, v)
+        self.resizes += 1
+
+    def _grow(self):
+        """Make room for one more key: double until it fits at max_load / 2."""
+        cap = self.cap
+        while self.size + 1 > self.max_load * cap / 2:
+            cap *= 2
+        self._resize(cap)
+
+    def _shrink(self):
+        cap = self.cap
+        while cap > 8 and self.size < self.min_load * cap:
+            cap //= 2
+        if cap != self.cap:
+            self._resize(cap)
+
+    # ── map interface ──
+
+    def insert(self, key, value=0):
+        """Add or update key.  True if it was new."""
+        slot, free, n = self._find(key)
+        self.probes += n
+        if slot >= 0:
+            self.vals[slot] = value
+            return False
+        if self.size + self.tombs + (self.state[free] != TOMB) > self.max_load * self.cap:
+            self._grow()
+            self._place(key, value)
+        else:
+            self.tombs -= self.state[free] == TOMB
+            self.keys[free] = key
+            self.vals[free] = value
+            self.state[free] = FULL
+        self.size += 1
+        return True
+
+    def contains(self, key):
+        slot, _, n = self._find(key)
+        self.probes += n
+        return slot >= 0
+
+    def get(self, key, default=None):
+        slot, _, n = self._find(key)
+        self.probes += n
+        return self.vals[slot] if slot >= 0 else default
+
+    def delete(self, key):
+        """Remove key.  True if it was there."""
+        slot, _, n = self._find(key)
+        self.probes += n
+        if slot < 0:
+            return False
+        self.state[slot] = TOMB
+        self.size -= 1
+        self.tombs += 1
+        if self.size < self.min_load * self.cap:
+            self._shrink()
+        return True
+
+    __contains__ = contains
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (k for k, s in zip(self.keys, self.state) if s == FULL)
+
+    def items(self):
+        return ((k, v) for k, v, s in zip(self.keys, self.vals, self.state) if s == FULL)
+
+    def stats(self):
+        return {"size": self.size, "capacity": self.cap, "load": self.size / self.cap,
+                "tombstones": self.tombs, "resizes": self.resizes, "probes": self.probes,
+                "rehash_probes": self.rehash_probes, "moves": self.moves}
+
+
+class LinearProbing(OpenAddressing):
+    name = "linear"
+
+
+class QuadraticProbing(OpenAddressing):
+    name = "quadratic"
+    triangular = True
+
+
+class DoubleHashing(OpenAddressing):
+    name = "double hashing"
+
+    def _step(self, key):
+        return (((key * MIX) & M64) >> self.shift) | 1
+
+
+class RobinHood(OpenAddressing):
+    """
+    Linear probing that keeps every run sorted by distance from home.  A
+    lookup can stop as soon as it meets a key that sits closer to its home
+    than the probed key would, so misses are short even at high load.
+    """
+
+    name = "robin hood"
+
+    def _alloc(self, cap):
+        super()._alloc(cap)
+        self.dist = array("H", bytes(2 * cap))       # slots from the key's home
+
+    def _find(self, key):
+        keys, state, dist, mask = self.keys, self.state, self.dist, self.mask
+        i = self._home(key)
+        d = 0
+        while state[i] == FULL and dist[i] >= d:
+            if keys[i] == key:
+                return i, -1, d + 1
+            i = (i + 1) & mask
+            d += 1
+        return -1, i, d + 1
+
+    def _put(self, i, d, key, value):
+        """
+        Store key at slot i, d slots from its home, pushing poorer keys
+        along.  Returns the extra slots examined.
+        """
+        keys, vals, state, dist, mask = self.keys, self.vals, self.state, self.dist, self.mask
+        n = 0
+        while state[i] == FULL:
+            if dist[i] < d:
+                keys[i], key = key, keys[i]
+                vals[i], value = value, vals[i]
+                dist[i], d = d, dist[i]
+                self.moves += 1
+            i = (i + 1) & mask
+            d += 1
+            n += 1
+        keys[i] = key
+        vals[i] = value
+        dist[i] = d
+        state[i] = FULL
+        return n
+
+    def _place(self, key, value):
+        self.rehash_probes += 1 + self._put(self._home(key), 0, key, value)
+
+    def insert(self, key, value=0):
+        slot, free, n = self._find(key)
+        self.probes += n
+        if slot >= 0:
+            self.vals[slot] = value
+            return False
+        if self.size + 1 > self.max_load * self.cap:
+            self._grow()
+            self._place(key, value)
+        else:
+            self.probes += self._put(free, n - 1, key, value)
+        self.size += 1
+        return True
+
+    def delete(self, key):
+        slot, _, n = self._find(key)
+        self.probes += n
+        if slot < 0:
+            return False
+        keys, vals, state, dist, mask = self.keys, self.vals, self.state, self.dist, self.mask
+        i, j = slot, (slot + 1) & mask
+        while state[j] == FULL and dist[j]:             # backward-shift the run
+            keys[i], vals[i], dist[i] = keys[j], vals[j], dist[j] - 1
+            self.moves += 1
+            i, j = j, (j + 1) & mask
+        state[i] = EMPTY
+        self.size -= 1
+        if self.size < self.min_load * self.cap:
+            self._shrink()
+        return True
+
+
+TABLES = {cls.name: cls for cls in (LinearProbing, QuadraticProbing, DoubleHashing, RobinHood)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("workloads", nargs="*", help="letters (C) or names (C_5000); default all")
+    ap.add_argument("--tables", nargs="+", default=list(TABLES), choices=list(TABLES))
+    ap.add_argument("--max-load", type=float, default=0.7)
+    ap.add_argument("--min-load", type=float, default=0.0)
+    ap.add_argument("--repeat", type=int, default=1, help="keep the fastest of N runs")
+    ap.add_argument("--hist", action="store_true", help="print probe-length histograms")
+    args = ap.parse_args(argv)
+
+    tables = {name: (lambda cls=TABLES[name]: cls(max_load=args.max_load,
+                                                  min_load=args.min_load))
+              for name in args.tables}
+    tables["set (built-in)"] = BuiltinSet
+    compare(tables, args.workloads, args.repeat, args.hist)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""
+perfect_hash.py
+Minimal perfect hashing for the static dictionary files (CHD style).
+
+A word list that never changes does not need collision handling at all: a
+minimal perfect hash maps its n words onto slots 0 .. n-1 with no two
+words sharing a slot.  This is "hash, displace and compress" (Belazzougui,
+Botelho, Dietzfelbinger, 2009), simplified:
+
+    every word gets a salted 64-bit hash a, and b = a scrambled once
+    more, split into
+        bucket    (a >> 32) mod n_buckets     ~lam words per bucket
+        h1, h2    low 32 bits of a and of b
+        fp        high 32 bits of b (verification)
+
+    buckets are placed biggest first; bucket b gets the smallest
+    displacement d >= 0 that sends all its words to free slots
+        slot = (h1 + d0 * h2 + d1) mod n,   d0 = d mod 256, d1 = d div 256
+    (the d1 shift gets a bucket out of a short cycle when h2 shares a
+    factor with n), and buckets of one word, placed last, store their
+    slot directly as d = -(slot + 1).
+
+    a bucket whose words no d0 can pull apart is stuck; the build then
+    starts over with a new salt and 1.5x the buckets
+
+The hash runs over the word's UTF-8 bytes 8 at a time (little-endian
+uint64 chunks, zero-padded), each chunk folded in by xor, an odd multiply
+and a shift, then the length and a murmur3 finalizer give a; b is a with
+its halves xored together, times another odd constant.  The build does
+that for all words at once as NumPy columns over the zero-padded byte
+matrix of hash_analyzer.string_keys (_hash_many); a lookup does it with
+Python ints (_hash), one or two chunks for most words.
+
+A lookup is one hash and two array reads, DISP[bucket] then FP[slot];
+a fingerprint mismatch means the word is not in the set (a non-word gets
+through with probability 2^-32).  The placement is vectorized with NumPy:
+all buckets of one size try the same round of displacements together, and
+once few are left each tries a batch of displacements per round.
+
+File layout (little-endian, sections 8-byte aligned), mapped read-only
+like double_array_trie.py's:
+
+    header   magic b"MPHF\\x00\\x02\\x00\\x00", n, n_buckets, salt, blob bytes
+    DISP     n_buckets × int32
+    FP       n × uint32          fingerprint of the word in each slot
+    OFFSETS  (n + 1) × uint32    word i is BLOB[OFFSETS[i]:OFFSETS[i+1]]
+    BLOB     the words, UTF-8, in slot order
+
+    build_file(words, "dict.mph")
+    m = PerfectHash.load("dict.mph")
+    m.index("AARDVARK") -> slot or -1;  "AARDVARK" in m;  m.key(slot)
+
+    python perfect_hash.py                   # both dictionary files
+    python perfect_hash.py path/to/words.txt --lam 3
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+from hash_analyzer import REPO, U64, WORDS, show, string_keys
+
+CLEAN = os.path.join(REPO, "Resources", "04-Data", "dictionary_files", "dictionary_clean.txt")
+
+MAGIC = b"MPHF\x00\x02\x00\x00"
+HEADER = struct.Struct("<8sIIIQ")       # magic, n, n_buckets, salt, blob bytes
+
+M32 = 0xFFFFFFFF
+M64 = (1 << 64) - 1
+K_A = 0x9E3779B97F4A7C15                # chunk multiplier (odd)
+K_B = 0xC2B2AE3D27D4EB4F                # odd multiplier that derives b from a
+F1, F2 = 0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53     # murmur3 fmix64
+BATCH = 65536                           # candidate slots per placement round, about
+MAX_TRIALS = 8                          # salts to try before giving up
+MAX_DISP = 1 << 16                      # displacements to try per bucket
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _fmix(h):
+    h ^= h >> 33
+    h = (h * F1) & M64
+    h ^= h >> 33
+    h = (h * F2) & M64
+    return h ^ (h >> 33)
+
+
+def _seed(salt):
+    """Starting value of the hash for a salt."""
+    return _fmix(2 * salt + 1)
+
+
+def _hash(data, seed, _unpack=struct.Struct("<Q").iter_unpack):
+    """(a, b) of one key (bytes); the vectorized twin is _hash_many."""
+    a = seed
+    for (w,) in _unpack(data + bytes(-len(data) & 7)):
+        a = ((a ^ w) * K_A) & M64
+        a ^= a >> 29
+    a = _fmix(a ^ len(data))
+    return a, ((a ^ (a >> 32)) * K_B) & M64
+
+
+def _fmix_many(h):
+    h ^= h >> U64(33)
+    h *= U64(F1)
+    h ^= h >> U64(33)
+    h *= U64(F2)
+    h ^= h >> U64(33)
+    return h
+
+
+def load_words(path):
+    """Distinct non-blank lines of a word file, in file order."""
+    with open(path, encoding="utf-8") as f:
+        return list(dict.fromkeys(w for w in (line.strip() for line in f) if w))
+
+
+# ── construction ─────────────────────────────────────────────────────────────
+
+def _chunks(b):
+    """string_keys() bytes as (n, words) little-endian uint64, zero-padded."""
+    width = -(-b.shape[1] // 8) * 8
+    padded = np.zeros((len(b), width), dtype=np.uint8)
+    padded[:, :b.shape[1]] = b
+    return np.ascontiguousarray(padded.view("<u8").T)        # one row per chunk
+
+
+def _hash_many(chunks, lengths, seed):
+    """_hash() of every key: chunks from _chunks(), lengths in bytes."""
+    a = np.full(len(lengths), seed, dtype=U64)
+    count = (lengths + 7) // 8
+    for j, w in enumerate(chunks):
+        x = (a ^ w) * U64(K_A)
+        a = np.where(count > j, x ^ (x >> U64(29)), a)      # keys with a chunk j
+    a = _fmix_many(a ^ lengths.astype(U64))
+    return a, (a ^ (a >> U64(32))) * U64(K_B)
+
+
+def _place(bucket, h1, h2, n, nb):
+    """
+    Displacements for every bucket and the slot of every key, or None if
+    a bucket is stuck.  d1 shifts every key of a bucket alike, so only d0
+    can pull its keys apart; once d0 has been through all its values mod
+    n with no two keys ever apart, no displacement will do.
+    """
+    order = np.argsort(bucket, kind="stable")
+    sb = bucket[order]
+    first = np.flatnonzero(np.diff(sb, prepend=-1))
+    size = np.diff(first, append=len(sb))
+    ids = sb[first]                                     # bucket id of each group
+
+    r1, r2 = h1 % np.uint64(n), h2 % np.uint64(n)
+    disp = np.zeros(nb, dtype=np.int32)
+    slot_of = np.empty(n, dtype=np.int64)
+    taken = np.zeros(n, dtype=bool)
+    claim = np.empty(n, dtype=np.int64)
+    cycle = min(n, 256)                                 # distinct values of d0 mod n
+    limit = min(MAX_DISP, 256 * n)                      # past it, slots only repeat
+
+    for s in sorted(set(size[size > 1].tolist()), reverse=True):
+        groups = np.flatnonzero(size == s)
+        members = order[first[groups][:, None] + np.arange(s)]      # (buckets, s)
+        H1, H2 = r1[members], r2[members]
+        d = np.zeros(len(groups), dtype=np.uint64)          # next displacement to try
+        apart = np.zeros(len(groups), dtype=bool)           # some d0 separated the keys
+        todo = np.arange(len(groups))
+        while len(todo):
+            if (d[todo] >= limit).any():
+                return None
+            # each bucket tries w displacements d .. d+w-1 at once: one while
+            # every bucket is left, more as they run out (the long tail)
+            w = max(1, min(256, BATCH // (len(todo) * s)))
+            dt = d[todo, None] + np.arange(w, dtype=np.uint64)          # (todo, w)
+            d0, d1 = dt & np.uint64(255), dt >> np.uint64(8)
+            # one (todo, w) array of slots per member: s is small, and numpy
+            # is slow at sorting or reducing a short last axis
+            cols = [((H1[todo, i, None] + d0 * H2[todo, i, None] + d1) % np.uint64(n))
+                    .astype(np.int64) for i in range(s)]
+            distinct = np.ones(dt.shape, dtype=bool)
+            for i in range(s):
+                for j in range(i):
+                    distinct &= cols[i] != cols[j]
+            apart[todo] |= distinct.any(1)
+            fits = distinct
+            for c in cols:
+                fits &= ~taken[c]
+            ok = fits.any(1)
+            pick = fits.argmax(1)[ok]                       # smallest fitting d in the batch
+            # of the buckets that fit, several may want the same free slot:
+            # the lowest-numbered claimant of a slot wins it
+            cand, dc = todo[ok], d[todo[ok]] + pick.astype(np.uint64)
+            cs = np.stack([c[ok, pick] for c in cols], axis=1)          # (cand, s)
+            claim[cs.ravel()] = len(groups)
+            np.minimum.at(claim, cs.ravel(), np.repeat(cand, s))
+            won = (claim[cs] == cand[:, None]).all(1)
+            acc = cand[won]
+            taken[cs[won].ravel()] = True
+            slot_of[members[acc]] = cs[won]
+            disp[ids[groups[acc]]] = dc[won]
+            d[todo[~ok]] += np.uint64(w)
+            d[cand[~won]] = dc[~won] + np.uint64(1)         # lost a slot: go on after it
+            todo = np.concatenate([todo[~ok], cand[~won]])
+            if (~apart[todo] & (d[todo] >= np.uint64(cycle))).any():
+                return None                                 # stuck: every d0 tried
+
+    single = np.flatnonzero(size == 1)
+    free = np.flatnonzero(~taken)
+    slot_of[order[first[single]]] = free
+    disp[ids[single]] = -(free + 1)
+    return disp, slot_of
+
+
+def build_arrays(words, lam=2.0, seed=0):
+    """(disp, fp, offsets, blob, salt seed) for a list of distinct words."""
+    n = len(words)
+    if not n:
+        raise ValueError("cannot build a perfect hash over no words")
+    if len(set(words)) != n:
+        raise ValueError("words must be distinct")
+    raw, lengths = string_keys(words)
+    chunks = _chunks(raw)
+    for trial in range(MAX_TRIALS):
+        nb = max(1, int(n / lam * 1.5 ** trial))       # smaller buckets on each retry
+        a, b = _hash_many(chunks, lengths, _seed(seed + trial))
+        placed = _place(((a >> np.uint64(32)) % np.uint64(nb)).astype(np.int64),
+                        a & np.uint64(M32), b & np.uint64(M32), n, nb)
+        if placed is not None:
+            break
+    else:
+        raise RuntimeError(f"no perfect hash found in {MAX_TRIALS} salts")
+    disp, slot_of = placed
+    fp = np.empty(n, dtype=np.uint32)
+    fp[slot_of] = (b >> np.uint64(32)).astype(np.uint32)
+    by_slot = np.argsort(slot_of)
+    offsets = np.zeros(n + 1, dtype=np.uint32)
+    np.cumsum(lengths[by_slot], out=offsets[1:])
+    rows = raw[by_slot]
+    blob = rows[np.arange(rows.shape[1]) < lengths[by_slot, None]].tobytes()
+    return disp, fp, offsets, blob, seed + trial
+
+
+def pack(words, lam=2.0, seed=0):
+    """The file image (bytes) of the perfect hash for words."""
+    disp, fp, offsets, blob, salt = build_arrays(words, lam, seed)
+    out = bytearray()
+    for chunk in (HEADER.pack(MAGIC, len(fp), len(disp), salt, len(blob)),
+                  disp.astype("<i4").tobytes(), fp.astype("<u4").tobytes(),
+                  offsets.astype("<u4").tobytes(), blob):
+        out += chunk + b"\0" * (_align(len(chunk)) - len(chunk))
+    return bytes(out)
+
+
+def build_file(words, path, lam=2.0, seed=0):
+    """Build the perfect hash for words and write it to path.  Returns path."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(pack(words, lam, seed))
+    os.replace(tmp, path)
+    return path
+
+
+# ── mapped table ─────────────────────────────────────────────────────────────
+
+class PerfectHash:
+    """
+    Read-only view of a file written by build_file(); the sections are
+    memoryview casts of the mapping, so nothing is parsed or copied.
+    """
+
+    def __init__(self, buf, mm=None):
+        magic, n, nb, salt, blob_len = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a perfect hash file (bad magic)")
+        self._mm = mm
+        self.n = n
+        self.nb = nb
+        self._seed = _seed(salt)
+        view = memoryview(buf)
+        off = _align(HEADER.size)
+        sections = []
+        for nbytes in (4 * nb, 4 * n, 4 * (n + 1), blob_len):
+            sections.append(view[off:off + nbytes])
+            off += _align(nbytes)
+        self._disp = sections[0].cast("i")
+        self._fp = sections[1].cast("I")
+        self._offsets = sections[2].cast("I")
+        self._blob = sections[3]
+        self._raw = view
+        self._views = [self._disp, self._fp, self._offsets] + sections + [view]
+
+    @classmethod
+    def load(cls, path):
+        """Map path read-only; O(1) in the number of words."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm, mm)
+
+    @classmethod
+    def from_words(cls, words, lam=2.0, seed=0):
+        """In-memory table (no file)."""
+        return cls(pack(words, lam, seed))
+
+    def to_bytes(self):
+        return bytes(self._raw)
+
+    def close(self):
+        """Release the views and unmap the file."""
+        for v in self._views:
+            v.release()
+        self._views = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.n
+
+    def slot(self, word):
+        """The slot word hashes to, without checking it is a member."""
+        a, b = _hash(word.encode("utf-8"), self._seed)
+        d = self._disp[(a >> 32) % self.nb]
+        return -d - 1 if d < 0 else ((a & M32) + (d & 255) * (b & M32) + (d >> 8)) % self.n
+
+    def index(self, word):
+        """Slot of word (0 .. n-1), or -1 if the fingerprint says it is absent."""
+        a, b = _hash(word.encode("utf-8"), self._seed)
+        d = self._disp[(a >> 32) % self.nb]
+        slot = -d - 1 if d < 0 else ((a & M32) + (d & 255) * (b & M32) + (d >> 8)) % self.n
+        return slot if self._fp[slot] == b >> 32 else -1
+
+    def __contains__(self, word):
+        return self.index(word) >= 0
+
+    def key(self, slot):
+        """The word stored in slot."""
+        return bytes(self._blob[self._offsets[slot]:self._offsets[slot + 1]]).decode("utf-8")
+
+    def exact_index(self, word):
+        """index() confirmed against the stored word, so never a false hit."""
+        slot = self.index(word)
+        return slot if slot >= 0 and self.key(slot) == word else -1
+
+    def __iter__(self):
+        return (self.key(i) for i in range(self.n))
+
+    @property
+    def nbytes(self):
+        """Bytes of the lookup tables (DISP + FP), without the stored words."""
+        return 4 * (self.nb + self.n)
+
+
+def open_dictionary(words_path=WORDS, mph_path=None, lam=2.0):
+    """
+    Map the perfect hash of a word file, (re)building it first if it is
+    missing or older than the word list.  mph_path defaults to the word
+    file with a .mph extension.
+    """
+    mph_path = mph_path or os.path.splitext(words_path)[0] + ".mph"
+    if (not os.path.exists(mph_path)
+            or os.path.getmtime(mph_path) < os.path.getmtime(words_path)):
+        build_file(load_words(words_path), mph_path, lam)
+    return PerfectHash.load(mph_path)
+
+
+# ── demo ──────────────────────────────────────────────────────────────────────
+
+def rate(fn, items):
+    t0 = time.perf_counter()
+    for x in items:
+        fn(x)
+    return len(items) / (time.perf_counter() - t0)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("files", nargs="*", default=[WORDS, CLEAN])
+    ap.add_argument("--lam", type=float, default=2.0, help="average words per bucket")
+    ap.add_argument("--out", help="directory for the .mph files (default: next to the words)")
+    args = ap.parse_args(argv)
+
+    rows = []
+    for path in args.files:
+        words = load_words(path)
+        base = os.path.splitext(os.path.basename(path))[0] + ".mph"
+        out = os.path.join(args.out, base) if args.out else os.path.splitext(path)[0] + ".mph"
+
+        t0 = time.perf_counter()
+        build_file(words, out, args.lam)
+        built = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        m = PerfectHash.load(out)
+        loaded = time.perf_counter() - t0
+
+        slots = [m.index(w) for w in words]
+        assert sorted(slots) == list(range(len(words))), "not a minimal perfect hash"
+        assert all(m.key(s) == w for s, w in zip(slots, words))
+        false_hits = sum(1 for w in words if m.index(w + "\x01") >= 0)
+        rows.append([os.path.basename(path), f"{len(words):,}", f"{built:.2f}",
+                     f"{loaded * 1e6:.0f}", f"{os.path.getsize(out) / 1e6:.2f}",
+                     f"{m.nbytes / len(words):.1f}", f"{rate(m.index, words):,.0f}",
+                     str(false_hits)])
+        m.close()
+        print("Saved:", out)
+    show(f"minimal perfect hash, lam = {args.lam}; false hits = non-words (word + '\\x01') "
+         "that pass the fingerprint",
+         ["words", "keys", "build s", "load µs", "MB", "B/key", "index/s", "false hits"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+swiss_table.py
+Swiss-table style hash set: control bytes probed a group at a time.
+
+The slots come in groups of 16.  Besides the keys there is one control
+byte per slot:
+
+    0x80          EMPTY
+    0xFE          DELETED (tombstone)
+    0x00 - 0x7F   FULL, holding 7 bits of the key's hash (h2)
+
+A key's hash splits into h1, which picks the first group, and h2.  A
+lookup compares h2 against all 16 control bytes of a group at once and
+only reads the keys whose byte matched, so a probe almost never touches
+a wrong key; a group with an EMPTY byte ends the search.  Groups are
+visited g, g+1, g+3, g+6, ... (triangular steps over a power-of-two
+number of groups, so every group is reached).
+
+Two ways in, over the same buffers (the NumPy arrays are views of the
+bytearray / array('q'), not copies):
+
+    insert / contains / delete                one key; bytearray.find scans a
+                                              group's control bytes
+    insert_many / contains_many / delete_many a batch; every key of the batch
+                                              is hashed and probed together,
+                                              one (keys x 16) NumPy compare
+                                              per probe round
+
+`probes` counts groups examined.
+
+    python swiss_table.py                 # workloads A-D, one op at a time and batched
+    python swiss_table.py D --bulk 2000000
+"""
+
+import argparse
+import time
+from array import array
+
+import numpy as np
+
+from hash_analyzer import show
+from open_addressing import FIB, M64, TABLES
+from workloads import BuiltinSet, compare
+
+GROUP = 16
+EMPTY, DELETED = 0x80, 0xFE
+
+
+def _distinct(keys):
+    """Sorted distinct int64 keys."""
+    keys = np.sort(np.asarray(keys, dtype=np.int64))
+    return keys[np.diff(keys, prepend=keys[:1] - 1) != 0] if len(keys) else keys
+
+
+class SwissTable:
+    name = "swiss"
+
+    def __init__(self, capacity=GROUP, max_load=0.875):
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+        self.max_load = max_load
+        self.size = 0
+        self.tombs = 0
+        self.probes = 0
+        self.resizes = 0
+        self._alloc(max(GROUP, 1 << (capacity - 1).bit_length()))
+
+    def _alloc(self, cap):
+        self.cap = cap
+        groups = cap // GROUP
+        self.gmask = groups - 1
+        self.shift = 57 - (groups.bit_length() - 1)     # top bits: group, then 7 of h2
+        self.ctrlbuf = bytearray([EMPTY]) * cap
+        self.keybuf = array("q", bytes(8 * cap))
+        self.ctrl = np.frombuffer(self.ctrlbuf, dtype=np.uint8)
+        self.keys = np.frombuffer(self.keybuf, dtype=np.int64)
+
+    # ── hashing ──
+
+    def _hash(self, key):
+        top = ((key * FIB) & M64) >> self.shift
+        return top >> 7, top & 0x7F
+
+    def _hash_many(self, keys):
+        top = (keys.view(np.uint64) * np.uint64(FIB)) >> np.uint64(self.shift)
+        return (top >> np.uint64(7)).astype(np.intp), (top & np.uint64(0x7F)).astype(np.uint8)
+
+    # ── one key at a time ──
+
+    def _find(self, key):
+        """(slot of key or -1, groups probed)."""
+        ctrl, keys = self.ctrlbuf, self.keybuf
+        g, h2 = self._hash(key)
+        for n in range(1, self.gmask + 2):
+            start = g * GROUP
+            end = start + GROUP
+            i = ctrl.find(h2, start, end)
+            while i >= 0:
+                if keys[i] == key:
+                    return i, n
+                i = ctrl.find(h2, i + 1, end)
+            if ctrl.find(EMPTY, start, end) >= 0:
+                return -1, n
+            g = (g + n) & self.gmask
+        return -1, self.gmask + 1
+
+    def _free(self, key):
+        """First EMPTY or DELETED slot on key's probe sequence."""
+        ctrl = self.ctrlbuf
+        g, _ = self._hash(key)
+        n = 1
+        while True:
+            start = g * GROUP
+            hits = [i for i in (ctrl.find(EMPTY, start, start + GROUP),
+                                ctrl.find(DELETED, start, start + GROUP)) if i >= 0]
+            if hits:
+                return min(hits)
+            g = (g + n) & self.gmask
+            n += 1
+
+    def insert(self, key):
+        """Add key.  True if it was new."""
+        slot, n = self._find(key)
+        self.probes += n
+        if slot >= 0:
+            return False
+        if self.size + self.tombs + 1 > self.max_load * self.cap:
+            self._rehash(self.size + 1)
+        i = self._free(key)
+        self.tombs -= self.ctrlbuf[i] == DELETED
+        self.ctrlbuf[i] = self._hash(key)[1]
+        self.keybuf[i] = key
+        self.size += 1
+        return True
+
+    def contains(self, key):
+        slot, n = self._find(key)
+        self.probes += n
+        return slot >= 0
+
+    def delete(self, key):
+        """Remove key.  True if it was there."""
+        slot, n = self._find(key)
+        self.probes += n
+        if slot < 0:
+            return False
+        start = slot - slot % GROUP
+        # A group that still has an EMPTY byte was never full, so no probe
+        # sequence runs through it and the slot can go straight back to EMPTY.
+        if self.ctrlbuf.find(EMPTY, start, start + GROUP) >= 0:
+            self.ctrlbuf[slot] = EMPTY
+        else:
+            self.ctrlbuf[slot] = DELETED
+            self.tombs += 1
+        self.size -= 1
+        return True
+
+    __contains__ = contains
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.keys[self.ctrl < 0x80].tolist())
+
+    # ── batches ──
+
+    def _lookup_many(self, keys):
+        """Slot of every key (-1 = absent), probing all of them in lockstep."""
+        g, h2 = self._hash_many(keys)
+        ctrl = self.ctrl.reshape(-1, GROUP)
+        slot = np.full(len(keys), -1, dtype=np.intp)
+        todo = np.arange(len(keys))
+        n = 1
+        while len(todo):
+            self.probes += len(todo)
+            gg = g[todo]
+            c = ctrl[gg]
+            # read only the keys whose control byte matched h2
+            row, col = np.nonzero(c == h2[todo, None])
+            at = gg[row] * GROUP + col
+            ok = self.keys[at] == keys[todo[row]]
+            slot[todo[row[ok]]] = at[ok]
+            done = (slot[todo] >= 0) | (c == EMPTY).any(1)
+            todo = todo[~done]
+            g[todo] = (g[todo] + n) & self.gmask
+            n += 1
+        return slot
+
+    def _place_many(self, keys):
+        """
+        Store distinct keys known to be absent.  Each round the pending keys
+        are grouped by their current group and the r-th of them takes the
+        group's r-th free slot; keys left over (the group filled up) move on
+        to their next group.
+        """
+        g, h2 = self._hash_many(keys)
+        ctrl = self.ctrl.reshape(-1, GROUP)
+        step = np.ones(len(keys), dtype=np.intp)
+        todo = np.arange(len(keys))
+        while len(todo):
+            todo = todo[np.argsort(g[todo], kind="stable")]
+            gg = g[todo]
+            first = np.flatnonzero(np.diff(gg, prepend=-1))
+            count = np.diff(first, append=len(gg))
+            groups = gg[first]
+            rank = np.arange(len(todo)) - np.repeat(first, count)
+            free = ctrl[groups] >= EMPTY
+            slots = np.argsort(~free, axis=1, kind="stable")     # free positions first
+            which = np.repeat(np.arange(len(groups)), count)
+            fits = rank < free.sum(1)[which]
+            at = gg[fits] * GROUP + slots[which[fits], rank[fits]]
+            self.tombs -= int(np.count_nonzero(self.ctrl[at] == DELETED))
+            self.ctrl[at] = h2[todo[fits]]
+            self.keys[at] = keys[todo[fits]]
+            todo = todo[~fits]
+            g[todo] = (g[todo] + step[todo]) & self.gmask
+            step[todo] += 1
+
+    def contains_many(self, keys):
+        """Bool array: which of keys are in the set."""
+        return self._lookup_many(np.asarray(keys, dtype=np.int64)) >= 0
+
+    def insert_many(self, keys):
+        """Add a batch of keys (duplicates allowed).  Returns how many were new."""
+        keys = _distinct(keys)
+        new = keys[self._lookup_many(keys) < 0]
+        if len(new):
+            if self.size + self.tombs + len(new) > self.max_load * self.cap:
+                self._rehash(self.size + len(new))
+            self._place_many(new)
+            self.size += len(new)
+        return len(new)
+
+    def delete_many(self, keys):
+        """Remove a batch of keys.  Returns how many were there."""
+        slot = self._lookup_many(_distinct(keys))
+        slot = slot[slot >= 0]
+        has_empty = (self.ctrl.reshape(-1, GROUP)[slot // GROUP] == EMPTY).any(1)
+        self.ctrl[slot] = np.where(has_empty, EMPTY, DELETED)
+        self.tombs += int(np.count_nonzero(~has_empty))
+        self.size -= len(slot)
+        return len(slot)
+
+    # ── resizing ──
+
+    def _rehash(self, need):
+        """Rebuild for `need` keys: double until they fit at max_load / 2."""
+        cap = self.cap
+        while need > self.max_load * cap / 2:
+            cap *= 2
+        live = self.keys[self.ctrl < EMPTY].copy()
+        self._alloc(cap)
+        self.tombs = 0
+        self._place_many(live)
+        self.resizes += 1
+
+    def stats(self):
+        return {"size": self.size, "capacity": self.cap, "load": self.size / self.cap,
+                "tombstones": self.tombs, "resizes": self.resizes, "probes": self.probes}
+
+
+# ── benchmark ─────────────────────────────────────────────────────────────────
+
+def bulk(n, seed=5243):
+    """insert_many / contains_many throughput on n random keys, half the lookups hits."""
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, 10 * n, n, dtype=np.int64)
+    probe = np.concatenate([rng.choice(keys, n // 2), rng.integers(10 * n, 20 * n, n - n // 2)])
+    rows = []
+    for label, make in [("swiss", SwissTable), ("set (built-in)", BuiltinSet)]:
+        t = make()
+        t0 = time.perf_counter()
+        t.insert_many(keys)
+        t1 = time.perf_counter()
+        hits = int(np.count_nonzero(t.contains_many(probe)))
+        t2 = time.perf_counter()
+        rows.append([label, f"{n / (t1 - t0):,.0f}", f"{n / (t2 - t1):,.0f}", f"{hits:,}"])
+    show(f"bulk: {n:,} random keys", ["table", "insert_many keys/s",
+                                      "contains_many keys/s", "hits"], rows)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("workloads", nargs="*", help="letters (C) or names (C_5000); default all")
+    ap.add_argument("--repeat", type=int, default=1, help="keep the fastest of N runs")
+    ap.add_argument("--bulk", type=int, default=1_000_000, help="keys for the bulk test (0 = skip)")
+    args = ap.parse_args(argv)
+
+    tables = dict(TABLES)
+    tables["swiss"] = SwissTable
+    tables["set (built-in)"] = BuiltinSet
+    print("One operation at a time:")
+    compare(tables, args.workloads, args.repeat)
+    print("\nBatched: each run of consecutive same-kind ops is one *_many call:")
+    compare({"swiss": SwissTable, "set (built-in)": BuiltinSet},
+            args.workloads, args.repeat, batched=True)
+    if args.bulk:
+        bulk(args.bulk)
+
+
+if __name__ == "__main__":
+    main()
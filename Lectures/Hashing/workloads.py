@@ -0,0 +1,287 @@
+"""
+workloads.py
+Replay the Program 02 workload files against Python lookup structures.
+
+Assignments/06-T02/05-P02/src/work_files/workload_{A,B,C,D}_{n}.json are
+lists of {"op": "insert" | "contains" | "delete", "value": int}:
+
+    A   n random inserts, then n random lookups
+    B   as A with the inserts sorted
+    C   2n mixed ops: 50% contains, 25% insert, 25% delete
+    D   n inserts, then 5n lookups
+
+A structure only needs insert(key), contains(key) and delete(key).  If it
+also keeps a running `probes` count (slots examined), replay() records
+the probes of every operation, so runs report a probe-length distribution
+next to the throughput.  Lookups are split into hits and misses, which
+behave very differently in open addressing.
+
+replay_batched() hands each run of consecutive same-kind operations to
+insert_many / contains_many / delete_many in one call instead, for
+structures that work on whole batches.  For a set that gives the same
+answers: no operation in a run depends on another one in it.
+
+    from workloads import load, replay
+    ops, values = load("C_10000")
+    r = replay(LinearProbing(), ops, values)
+"""
+
+import glob
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+from hash_analyzer import REPO, show
+
+WORK_DIR = os.path.join(REPO, "Assignments", "06-T02", "05-P02", "src", "work_files")
+
+OPS = ("insert", "contains", "delete")
+INSERT, CONTAINS, DELETE = range(3)
+
+# kinds replay() reports on; a contains is a hit or a miss
+KINDS = ("insert", "hit", "miss", "delete")
+
+
+class BuiltinSet(set):
+    """The built-in set with the replay interface (no probe count)."""
+
+    insert = set.add
+    contains = set.__contains__
+    delete = set.discard
+
+    def insert_many(self, keys):
+        self.update(keys.tolist())
+
+    def contains_many(self, keys):
+        return np.fromiter(map(self.__contains__, keys.tolist()), dtype=bool, count=len(keys))
+
+    def delete_many(self, keys):
+        self.difference_update(keys.tolist())
+
+
+def workload_files(names=None):
+    """
+    {"A_1000": path, ...} for every workload file, sorted by workload then
+    size.  names filters by workload letter ("C") or full name ("C_5000").
+    """
+    found = {}
+    for path in glob.glob(os.path.join(WORK_DIR, "workload_*.json")):
+        m = re.fullmatch(r"workload_([A-Z])_(\d+)\.json", os.path.basename(path))
+        if m:
+            found[f"{m[1]}_{m[2]}"] = path
+    keys = sorted(found, key=lambda k: (k[0], int(k[2:])))
+    if names:
+        keys = [k for k in keys if k in names or k[0] in names]
+    return {k: found[k] for k in keys}
+
+
+def load(name):
+    """(op codes uint8, values int64) of one workload, by name or path."""
+    path = name if os.path.exists(name) else workload_files()[name]
+    with open(path) as f:
+        data = json.load(f)
+    code = {op: i for i, op in enumerate(OPS)}
+    ops = np.fromiter((code[d["op"]] for d in data), dtype=np.uint8, count=len(data))
+    values = np.fromiter((d["value"] for d in data), dtype=np.int64, count=len(data))
+    return ops, values
+
+
+def replay(table, ops, values):
+    """
+    Run one workload against table.  Returns
+
+        seconds, ops_per_s     wall time of the replay loop
+        counts                 {kind: operations}, kinds as in KINDS
+        probes                 {kind: int64 array, one entry per op}, or
+                               None when the table keeps no probe count
+
+    Probes are read before and after each operation, so a resize during an
+    insert is not charged to it; tables count rehash work separately.
+    """
+    counted = hasattr(table, "probes")
+    insert, contains, delete = table.insert, table.contains, table.delete
+    keys = values.tolist()
+    codes = ops.tolist()
+    kind = np.empty(len(codes), dtype=np.uint8)
+    cost = np.zeros(len(codes), dtype=np.int64)
+    clock = time.perf_counter
+
+    t0 = clock()
+    if counted:
+        for i, (op, k) in enumerate(zip(codes, keys)):
+            before = table.probes
+            if op == INSERT:
+                insert(k)
+                kind[i] = 0
+            elif op == CONTAINS:
+                kind[i] = 1 if contains(k) else 2
+            else:
+                delete(k)
+                kind[i] = 3
+            cost[i] = table.probes - before
+    else:
+        for i, (op, k) in enumerate(zip(codes, keys)):
+            if op == INSERT:
+                insert(k)
+                kind[i] = 0
+            elif op == CONTAINS:
+                kind[i] = 1 if contains(k) else 2
+            else:
+                delete(k)
+                kind[i] = 3
+    secs = clock() - t0
+
+    by_kind = {name: kind == i for i, name in enumerate(KINDS)}
+    return {
+        "ops":       len(codes),
+        "seconds":   secs,
+        "ops_per_s": len(codes) / secs if secs else float("inf"),
+        "counts":    {name: int(mask.sum()) for name, mask in by_kind.items()},
+        "probes":    {name: cost[mask] for name, mask in by_kind.items()} if counted else None,
+    }
+
+
+def replay_timed(table, ops, values):
+    """
+    Per-operation latency: {kind: int64 array of nanoseconds}.  A separate
+    pass from replay(), since reading the clock around every call costs
+    about as much as a fast operation; the clock's own overhead, measured
+    on an empty call, is subtracted.
+    """
+    insert, contains, delete = table.insert, table.contains, table.delete
+    clock = time.perf_counter_ns
+    kind = np.empty(len(ops), dtype=np.uint8)
+    ns = np.empty(len(ops), dtype=np.int64)
+    for i, (op, k) in enumerate(zip(ops.tolist(), values.tolist())):
+        if op == INSERT:
+            t0 = clock()
+            insert(k)
+            ns[i] = clock() - t0
+            kind[i] = 0
+        elif op == CONTAINS:
+            t0 = clock()
+            hit = contains(k)
+            ns[i] = clock() - t0
+            kind[i] = 1 if hit else 2
+        else:
+            t0 = clock()
+            delete(k)
+            ns[i] = clock() - t0
+            kind[i] = 3
+    noop = _clock_overhead()
+    ns = np.maximum(ns - noop, 0)
+    return {name: ns[kind == i] for i, name in enumerate(KINDS)}
+
+
+def _clock_overhead(n=20_000):
+    """Median ns of timing an empty call, as replay_timed() does."""
+    clock = time.perf_counter_ns
+    f = int
+    ns = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        t0 = clock()
+        f()
+        ns[i] = clock() - t0
+    return int(np.median(ns))
+
+
+def runs(ops):
+    """(op, start, stop) for every run of consecutive equal op codes."""
+    edges = np.flatnonzero(np.diff(ops)) + 1
+    starts = np.concatenate([[0], edges])
+    stops = np.concatenate([edges, [len(ops)]])
+    return [(int(ops[a]), int(a), int(b)) for a, b in zip(starts, stops)]
+
+
+def replay_batched(table, ops, values):
+    """replay() with one *_many call per run of ops; probes are not split per op."""
+    kind = np.empty(len(ops), dtype=np.uint8)
+    clock = time.perf_counter
+    t0 = clock()
+    for op, a, b in runs(ops):
+        if op == INSERT:
+            table.insert_many(values[a:b])
+            kind[a:b] = 0
+        elif op == CONTAINS:
+            kind[a:b] = np.where(table.contains_many(values[a:b]), 1, 2)
+        else:
+            table.delete_many(values[a:b])
+            kind[a:b] = 3
+    secs = clock() - t0
+    return {
+        "ops":       len(ops),
+        "seconds":   secs,
+        "ops_per_s": len(ops) / secs if secs else float("inf"),
+        "counts":    {name: int(np.count_nonzero(kind == i)) for i, name in enumerate(KINDS)},
+        "probes":    None,
+    }
+
+
+def histogram(p, top=12):
+    """Probe-length histogram: [(probes, ops), ...], the tail folded into top+."""
+    counts = np.bincount(p, minlength=1)
+    hist = [(str(i), int(c)) for i, c in enumerate(counts[:top]) if c]
+    if len(counts) > top:
+        hist.append((f"{top}+", int(counts[top:].sum())))
+    return hist
+
+
+def compare(tables, names=None, repeat=1, hist=False, batched=False, latency=False):
+    """
+    Replay every workload against every table factory and print one table
+    per workload.  tables is {label: zero-argument factory}; the best of
+    `repeat` runs is kept.  Returns {workload: {label: replay result}}.
+    latency=True adds a table of lookup latency percentiles (replay_timed),
+    stored in each result under "latency".
+    """
+    run = replay_batched if batched else replay
+    out = {}
+    for wname, path in workload_files(names).items():
+        ops, values = load(path)
+        res = {}
+        for label, make in tables.items():
+            best = [run(make(), ops, values) for _ in range(repeat)]
+            res[label] = min(best, key=lambda r: r["seconds"])
+        out[wname] = res
+
+        c = next(iter(res.values()))["counts"]
+        counted = any(r["probes"] is not None for r in res.values())
+        rows = []
+        for label, r in res.items():
+            row = [label, f"{r['ops_per_s']:,.0f}"]
+            if r["probes"] is not None:
+                p = r["probes"]
+                row += [f"{p[k].mean():.2f}" if len(p[k]) else "-" for k in KINDS]
+                everything = np.concatenate(list(p.values()))
+                row += [f"{np.percentile(everything, 99):.0f}", f"{everything.max()}"]
+            elif counted:
+                row += ["-"] * 6
+            rows.append(row)
+        title = f"workload {wname}: {len(ops):,} ops (" + ", ".join(f"{c[k]:,} {k}" for k in KINDS) + ")"
+        if counted:
+            show(title + ", mean probes per op", ["table", "ops/s", *KINDS, "p99", "max"], rows)
+        else:
+            show(title, ["table", "ops/s"], rows)
+
+        if latency:
+            rows = []
+            for label, r in res.items():
+                r["latency"] = replay_timed(tables[label](), ops, values)
+                for k in ("hit", "miss"):
+                    ns = r["latency"][k]
+                    if len(ns):
+                        q = np.percentile(ns, [50, 90, 99, 99.9])
+                        rows.append([label, k, *(f"{v:,.0f}" for v in q), f"{ns.max():,}"])
+            show(f"workload {wname}: lookup latency (ns)",
+                 ["table", "lookup", "p50", "p90", "p99", "p99.9", "max"], rows)
+
+        if hist:
+            for label, r in res.items():
+                if r["probes"] is None:
+                    continue
+                everything = np.concatenate(list(r["probes"].values()))
+                print(f"  {label:<16}" + "  ".join(f"{k}:{v}" for k, v in histogram(everything)))
+    return out
@@ -1,12 +1,21 @@
 """
 anim_utils.py
 Shared drawing helpers + HTML viewer generator for RB tree animations.
+
+Frame storage
+-------------
+By default every frame is written as a full PNG.  In delta mode (pass
+delta=True, or export RB_DELTA_FRAMES=1 to switch every walkthrough at once)
+only keyframes are stored whole; every other frame stores just the rectangles
+whose pixels changed, and the viewer composites them on a canvas.
 """
 
 import os
 import json
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 
 # ── visual constants ──────────────────────────────────────────────────────────
@@ -127,29 +136,214 @@ def draw_frame(ax, nodes, edges, title, caption=None, caption_color=None, highli
         )
 
 
-def save_frame(fig, folder, index):
-    """Save a figure as frame_XX.png inside folder."""
+def save_frame(fig, folder, index, delta=None):
+    """
+    Save a figure as frame_XX.png inside folder.
+    delta : store only the changed rectangles vs. the previous frame
+            (defaults to DELTA_FRAMES).  Returns the path written (the
+            keyframe or the manifest).
+    """
+    if delta is None:
+        delta = DELTA_FRAMES
     os.makedirs(folder, exist_ok=True)
+    if delta:
+        rgba = render_rgba(fig)
+        plt.close(fig)
+        return save_delta(rgba, folder, index)
     path = os.path.join(folder, f"frame_{index:02d}.png")
     fig.savefig(path, dpi=130, bbox_inches="tight", facecolor=BG_COLOR)
     plt.close(fig)
     return path
 
 
+# ── delta frame storage ───────────────────────────────────────────────────────
+# Consecutive frames usually differ by one recolor or one caption, so a delta
+# frame is a small atlas of changed patches applied on top of the last frame.  Frames are rendered
+# on the full, fixed-size canvas (no tight bbox) so pixels line up between
+# frames; a tight bbox would shift everything whenever a title changed width.
+
+DELTA_FRAMES   = os.environ.get("RB_DELTA_FRAMES", "") not in ("", "0")
+DELTA_DPI      = 130
+DELTA_TILE     = 16      # dirty-tile edge in pixels
+DELTA_KEY_FRAC = 0.5     # store a new keyframe if more than this much changed
+DELTA_MANIFEST = "frames.json"
+
+_delta_state = {}        # folder → (last rgba buffer, manifest list)
+
+
+def render_rgba(fig, dpi=DELTA_DPI, facecolor=BG_COLOR):
+    """Rasterize fig with Agg at dpi and return an (H, W, 4) uint8 array."""
+    fig.set_dpi(dpi)
+    fig.patch.set_facecolor(facecolor)
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    return np.array(canvas.buffer_rgba())
+
+
+def dirty_rects(prev, cur, tile=DELTA_TILE):
+    """
+    Diff two RGBA buffers of equal shape and return the changed regions as a
+    list of (x, y, w, h) pixel rectangles.
+
+    Changed pixels are bucketed into tile×tile cells, runs of dirty cells in
+    each tile row become spans, and identical spans in consecutive rows are
+    merged into one rectangle.  Each rectangle is then shrunk to the exact
+    bounding box of the pixels that changed inside it.
+    """
+    diff = np.any(prev != cur, axis=2)
+    if not diff.any():
+        return []
+    h, w = diff.shape
+    th, tw = -(-h // tile), -(-w // tile)
+    padded = np.zeros((th * tile, tw * tile), dtype=bool)
+    padded[:h, :w] = diff
+    cells = padded.reshape(th, tile, tw, tile).any(axis=(1, 3))
+
+    rects = []
+    open_spans = {}                         # (c0, c1) → top tile row
+    for row in range(th + 1):
+        spans = set()
+        if row < th:
+            edges = np.flatnonzero(np.diff(np.r_[0, cells[row].view(np.int8), 0]))
+            spans = set(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+        for span in list(open_spans):
+            if span not in spans:
+                top = open_spans.pop(span)
+                rects.append((span[0], top, span[1], row))
+        for span in spans:
+            open_spans.setdefault(span, row)
+
+    out = []
+    for c0, r0, c1, r1 in rects:
+        x0, y0 = c0 * tile, r0 * tile
+        x1, y1 = min(c1 * tile, w), min(r1 * tile, h)
+        ys, xs = np.nonzero(diff[y0:y1, x0:x1])
+        out.append((x0 + int(xs.min()), y0 + int(ys.min()),
+                    int(xs.max() - xs.min()) + 1, int(ys.max() - ys.min()) + 1))
+    return out
+
+
+def save_delta(rgba, folder, index):
+    """
+    Append frame `index` (a render_rgba() buffer) to the folder's delta
+    manifest.  Frames must arrive in order; index 0 starts a new manifest.
+    """
+    prev, manifest = _delta_state.get(folder, (None, []))
+    if index == 0:
+        prev, manifest = None, []
+    del manifest[index:]
+
+    rects = None
+    if prev is not None and prev.shape == rgba.shape:
+        rects = dirty_rects(prev, rgba)
+        changed = sum(w * h for (_, _, w, h) in rects)
+        if changed > DELTA_KEY_FRAC * rgba.shape[0] * rgba.shape[1]:
+            rects = None
+
+    name = f"frame_{index:02d}.png"
+    if rects is None:
+        plt.imsave(os.path.join(folder, name), rgba)
+        manifest.append({"key": name})
+    elif not rects:
+        manifest.append({"rects": []})
+    else:
+        # pack the patches top-to-bottom into one atlas image per frame
+        atlas = np.zeros((sum(h for (_, _, _, h) in rects),
+                          max(w for (_, _, w, _) in rects), 4), dtype=np.uint8)
+        entries, sy = [], 0
+        for (x, y, w, h) in rects:
+            atlas[sy:sy+h, :w] = rgba[y:y+h, x:x+w]
+            entries.append([x, y, w, h, sy])
+            sy += h
+        plt.imsave(os.path.join(folder, name), atlas)
+        manifest.append({"atlas": name, "rects": entries})
+
+    _delta_state[folder] = (rgba, manifest)
+    path = os.path.join(folder, DELTA_MANIFEST)
+    with open(path, "w") as f:
+        json.dump(manifest, f)
+    return path
+
+
 # ── HTML viewer generator ─────────────────────────────────────────────────────
 
+# Delta viewer: composite frame `cur` onto the canvas.  Each delta frame is one
+# atlas image plus [x, y, w, h, atlas_y] rects.  Stepping forward by one
+# applies just that frame's rects; any other jump replays from the nearest
+# keyframe at or before the target.
+_DELTA_JS = """
+  const canvas = document.getElementById("frame-img");
+  const ctx    = canvas.getContext("2d");
+  const images = {};
+  let shown    = -1;
+
+  function load(src) {
+    if (!images[src]) images[src] = new Promise(ok => {
+      const im = new Image(); im.onload = () => ok(im); im.src = src;
+    });
+    return images[src];
+  }
+
+  async function apply(i) {
+    const f = frames[i];
+    if (f.key) {
+      const im = await load(f.key);
+      canvas.width = im.naturalWidth; canvas.height = im.naturalHeight;
+      ctx.drawImage(im, 0, 0);
+      return;
+    }
+    if (!f.rects.length) return;
+    const atlas = await load(f.atlas);
+    for (const [x, y, w, h, sy] of f.rects) {
+      ctx.clearRect(x, y, w, h);
+      ctx.drawImage(atlas, 0, sy, w, h, x, y, w, h);
+    }
+  }
+
+  let queue = Promise.resolve();
+  function show(target) {
+    queue = queue.then(async () => {
+      if (target === shown) return;
+      if (target === shown + 1) {
+        await apply(target);
+      } else {
+        let start = target;
+        while (start > 0 && !frames[start].key) start--;
+        for (let i = start; i <= target; i++) await apply(i);
+      }
+      shown = target;
+    });
+  }
+"""
+
 # Default: one level deep inside animations/ → go up two dirs to reach images/
 DEFAULT_BG = "../../images/redblacktree.jpg"
 
-def generate_viewer(folder, frame_count, title, step_labels=None, bg_image=DEFAULT_BG):
+def generate_viewer(folder, frame_count, title, step_labels=None, bg_image=DEFAULT_BG,
+                    delta=None):
     """
     Write index.html into folder.
     step_labels : optional list of short step titles shown above the image.
     bg_image    : path to background image (relative to the output folder).
+    delta       : composite frames from the delta manifest written by
+                  save_frame(..., delta=True) (defaults to DELTA_FRAMES).
     """
-    frames_js  = json.dumps([f"frame_{i:02d}.png" for i in range(frame_count)])
+    if delta is None:
+        delta = DELTA_FRAMES
     labels_js  = json.dumps(step_labels or [f"Step {i}" for i in range(frame_count)])
 
+    if delta:
+        with open(os.path.join(folder, DELTA_MANIFEST)) as f:
+            frames_js = json.dumps(json.load(f)[:frame_count])
+        frame_el = '<canvas id="frame-img"></canvas>'
+        show_js  = "show(cur);"
+        extra_js = _DELTA_JS
+    else:
+        frames_js = json.dumps([f"frame_{i:02d}.png" for i in range(frame_count)])
+        frame_el = '<img id="frame-img" src="" alt="animation frame">'
+        show_js  = 'document.getElementById("frame-img").src  = frames[cur];'
+        extra_js = ""
+
     html = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -218,7 +412,7 @@ def generate_viewer(folder, frame_count, title, step_labels=None, bg_image=DEFAU
     width: 100%;
   }}
 
-  .frame-box img {{
+  .frame-box img, .frame-box canvas {{
     width: 100%;
     display: block;
   }}
@@ -275,7 +469,7 @@ def generate_viewer(folder, frame_count, title, step_labels=None, bg_image=DEFAU
 <div class="step-label" id="step-label"></div>
 
 <div class="frame-box">
-  <img id="frame-img" src="" alt="animation frame">
+  {frame_el}
 </div>
 
 <div class="nav">
@@ -290,9 +484,9 @@ def generate_viewer(folder, frame_count, title, step_labels=None, bg_image=DEFAU
   const frames = {frames_js};
   const labels = {labels_js};
   let cur = 0;
-
+{extra_js}
   function render() {{
-    document.getElementById("frame-img").src  = frames[cur];
+    {show_js}
     document.getElementById("step-label").textContent = labels[cur];
     document.getElementById("counter").textContent    = (cur + 1) + " / " + frames.length;
     document.getElementById("btn-prev").disabled = cur === 0;
@@ -0,0 +1,116 @@
+"""
+boruvka_numpy.py
+Borůvka's MST with every round a handful of whole-array NumPy passes.
+
+No Python loop runs per vertex or per edge.  The edges are sorted once by
+(weight, index): a stable sort on weight, so equal weights keep index
+order.  From then on an edge's position in the live-edge arrays is its
+rank, and "cheapest" means "lowest position".  A round:
+
+    1. best[c] = lowest position among the live edges touching component
+       c (np.minimum.at over both ends)
+    2. hook every component onto the component across its cheapest edge;
+       two components that picked the same edge point at each other, and
+       the lower id of the pair becomes the root
+    3. pointer jumping (hook = hook[hook]) until every component points
+       at its root, at most log2 of the longest hook chain passes
+    4. contract: roots are renumbered 0 .. k-1, both ends of every live
+       edge are relabelled, and edges that now join a component to itself
+       are dropped
+
+The edges still live carry component ids, not vertex ids, and
+components are renumbered every round, so each round works on arrays of
+the current number of components and live edges.  There are at most
+log2 V rounds.
+
+Steps 1 and 2 stand in for a lexsort of (component, rank) followed by
+np.minimum.reduceat over the groups.  That re-sorts the live edges every
+round; the scatter-minimum is one O(E) pass.
+
+    python boruvka_numpy.py -n 1000000 -m 10000000
+    python boruvka_numpy.py -n 100000 --check
+    python boruvka_numpy.py --graph graph.csr
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from csr_graph import add_graph_args, graph_from_args
+from parallel_boruvka import parallel_boruvka
+
+
+def boruvka_numpy(g, stats=None):
+    """
+    Minimum spanning forest of CSRGraph g: the indices of the tree edges
+    (into g.edge_list()), sorted.  stats, if a list, gets a {"components",
+    "edges", "seconds"} dict per round.
+    """
+    if g.directed:
+        raise ValueError("Borůvka needs an undirected graph")
+    u, v, w = g.edge_list()
+    eid = np.argsort(w, kind="stable")                 # rank order
+    a, b = u[eid], v[eid]
+    keep = a != b
+    eid, a, b = eid[keep], a[keep], b[keep]
+    k = g.n                                             # components, labelled 0 .. k-1
+    tree = []
+    while len(eid):
+        t0 = time.perf_counter()
+        scanned = len(eid)
+        pos = np.arange(scanned)
+        best = np.full(k, scanned, dtype=np.int64)
+        np.minimum.at(best, a, pos)
+        np.minimum.at(best, b, pos)
+        comps = np.flatnonzero(best < scanned)
+        e = best[comps]
+        ids = np.arange(k)
+        hook = ids.copy()
+        hook[comps] = np.where(a[e] == comps, b[e], a[e])
+        # both ends of an edge chose it: the lower-numbered one becomes the root
+        mutual = (hook[hook] == ids) & (ids < hook)
+        hook[mutual] = ids[mutual]
+        tree.append(eid[np.unique(e)])
+        while True:
+            jumped = hook[hook]
+            if np.array_equal(jumped, hook):
+                break
+            hook = jumped
+        root = hook == ids
+        label = (np.cumsum(root) - 1)[hook]
+        a, b = label[a], label[b]
+        keep = a != b
+        eid, a, b = eid[keep], a[keep], b[keep]
+        k = int(np.count_nonzero(root))
+        if stats is not None:
+            stats.append({"components": k, "edges": scanned, "seconds": time.perf_counter() - t0})
+    return np.sort(np.concatenate(tree)) if tree else np.empty(0, dtype=np.int64)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add_graph_args(ap)
+    ap.add_argument("--check", action="store_true",
+                    help="compare with parallel_boruvka() (no pool)")
+    args = ap.parse_args(argv)
+
+    g = graph_from_args(args)
+    stats = []
+    t0 = time.perf_counter()
+    tree = boruvka_numpy(g, stats)
+    secs = time.perf_counter() - t0
+    for i, s in enumerate(stats, 1):
+        print(f"  round {i:2}: {s['edges']:>12,} edges  {s['components']:>10,} components left  "
+              f"{s['seconds']:6.2f} s")
+    print(f"numpy borůvka: {len(tree):,} tree edges, weight {g.edge_list()[2][tree].sum():,}, "
+          f"{secs:.2f} s")
+    if args.check:
+        t0 = time.perf_counter()
+        same = np.array_equal(parallel_boruvka(g, workers=1), tree)
+        print(f"parallel_boruvka: {'same tree' if same else 'DIFFERENT TREE'}, "
+              f"{time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,32 @@
-import concurrent.futures
-import sys
-from collections import defaultdict
+"""
+burovka.py
+Borůvka's minimum spanning tree over a CSRGraph's edges, with union-find components.
+
+Every round, one pass over the edges still in play finds each component's
+cheapest outgoing edge; all of those join the tree and their components
+merge.  Each round at least halves the number of components, so there
+are at most log2 V rounds of O(E) work: O(E log V).
+
+Components are an array-based union-find (path halving, union by rank):
+find(x) is the component of any vertex, so merging is transitive however
+the chosen edges chain together.  Edges whose ends are already in one
+component are dropped for good during the pass, so later rounds scan
+fewer.  Ties are broken by edge index, which makes "cheapest" a strict
+order: the chosen edges can never close a cycle, and the tree is the same
+one Kruskal's algorithm finds.
+
+    python burovka.py                              # the sample graph
+    python burovka.py -n 1000000 -m 4000000 --check
+    python burovka.py --graph graph.csr            # see csr_graph.py
+"""
+
+import argparse
+import time
+from array import array
+
+from csr_graph import CSRGraph, add_graph_args, graph_from_args
+
+INF = float("inf")
 
 # Sample graph represented as an adjacency list
 graph = {
@@ -11,40 +37,124 @@ graph = {
 }
 
 
-def find_min_edge(component, graph):
-    min_edge = (None, None, sys.maxsize)
-    for node in component:
-        for neighbor, weight in graph[node]:
-            if neighbor not in component and weight < min_edge[2]:
-                min_edge = (node, neighbor, weight)
-    return min_edge
+class UnionFind:
+    """Disjoint sets over 0 .. n-1 in two flat arrays."""
+
+    def __init__(self, n):
+        self.parent = array("q", range(n))
+        self.rank = bytearray(n)            # < log2 n, fits a byte
+        self.components = n
+
+    def find(self, x):
+        """Root of x's set, halving the path on the way up."""
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = x = parent[parent[x]]
+        return x
+
+    def union(self, a, b):
+        """Merge the sets of a and b.  False if they were already one."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        rank = self.rank
+        if rank[a] < rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if rank[a] == rank[b]:
+            rank[a] += 1
+        self.components -= 1
+        return True
+
+
+def boruvka(g, stats=None):
+    """
+    Minimum spanning forest of CSRGraph g: the indices of the tree edges
+    (into g.edge_list()), array('q').  If stats is a list, one
+    {"components", "edges", "seconds"} dict is appended per round.
+    """
+    if g.directed:
+        raise ValueError("Borůvka needs an undirected graph")
+    n = g.n
+    u, v, w = (a.tolist() for a in g.edge_list())     # Python ints index fastest
+    uf = UnionFind(n)
+    parent = uf.parent
+    live = range(len(u))
+    tree = array("q")
+    while uf.components > 1 and live:
+        t0 = time.perf_counter()
+        scanned = len(live)
+        best = [-1] * n                     # cheapest edge out of each root
+        cost = [INF] * n                    # and its weight
+        keep = array("q")
+        for e in live:                      # ascending, so `<` keeps the lowest index on ties
+            a = u[e]                        # uf.find(), inlined
+            while parent[a] != a:
+                parent[a] = a = parent[parent[a]]
+            b = v[e]
+            while parent[b] != b:
+                parent[b] = b = parent[parent[b]]
+            if a == b:
+                continue                    # inside a component from now on
+            keep.append(e)
+            we = w[e]
+            if we < cost[a]:
+                cost[a] = we
+                best[a] = e
+            if we < cost[b]:
+                cost[b] = we
+                best[b] = e
+        live = keep
+        # an edge picked by both of its ends is only added once: union() says no
+        for e in best:
+            if e >= 0 and uf.union(u[e], v[e]):
+                tree.append(e)
+        if stats is not None:
+            stats.append({"components": uf.components, "edges": scanned,
+                          "seconds": time.perf_counter() - t0})
+    return tree
 
 
-def boruvka_parallel(graph):
-    components = [{node} for node in graph.keys()]
-    mst_edges = []
+def kruskal(g):
+    """The same forest by Kruskal's algorithm, to check boruvka() against."""
+    u, v, w = (a.tolist() for a in g.edge_list())
+    uf = UnionFind(g.n)
+    return array("q", sorted(e for e in sorted(range(len(u)), key=lambda e: (w[e], e))
+                             if uf.union(u[e], v[e])))
 
-    while len(components) > 1:
-        min_edges = []
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            min_edges = list(
-                executor.map(lambda c: find_min_edge(c, graph), components)
-            )
+def minimum_spanning_tree(graph):
+    """[(node, neighbor, weight), ...] of a dict-of-lists graph's MST."""
+    g, nodes = CSRGraph.from_adjacency(graph)
+    u, v, w = g.edge_list()
+    return [(nodes[u[e]], nodes[v[e]], w[e].item()) for e in boruvka(g)]
 
-        new_components = defaultdict(set)
 
-        for edge in min_edges:
-            if edge[0] is not None:
-                mst_edges.append(edge)
-                new_components[edge[0]].add(edge[1])
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add_graph_args(ap, n=0, density=4)
+    ap.add_argument("--check", action="store_true", help="compare with Kruskal's algorithm")
+    args = ap.parse_args(argv)
 
-        components = [
-            set.union(components[i], new_components[i]) for i in new_components
-        ]
+    if not args.graph and not args.n:
+        print("Minimum Spanning Tree Edges:", minimum_spanning_tree(graph))
+        return
 
-    return mst_edges
+    g = graph_from_args(args)
+    stats = []
+    t0 = time.perf_counter()
+    tree = boruvka(g, stats)
+    secs = time.perf_counter() - t0
+    for i, s in enumerate(stats, 1):
+        print(f"  round {i:2}: {s['edges']:>12,} edges scanned  "
+              f"{s['components']:>10,} components left  {s['seconds']:6.2f} s")
+    weight = g.edge_list()[2][tree].sum()
+    print(f"borůvka: {len(tree):,} tree edges, weight {weight:,}, {secs:.2f} s")
+    if args.check:
+        t0 = time.perf_counter()
+        same = kruskal(g) == array("q", sorted(tree))
+        print(f"kruskal: {'same tree' if same else 'DIFFERENT TREE'}, {time.perf_counter() - t0:.2f} s")
 
 
-mst_edges = boruvka_parallel(graph)
-print("Minimum Spanning Tree Edges:", mst_edges)
+if __name__ == "__main__":
+    main()
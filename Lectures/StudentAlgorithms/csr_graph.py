@@ -0,0 +1,328 @@
+"""
+csr_graph.py
+Compressed sparse row graphs: three flat typed arrays instead of dicts of lists.
+
+A dict of lists of (neighbor, weight) tuples, like burovka.py's sample,
+costs around 100 bytes per edge in Python objects and is slow to walk.
+Here vertex x's entries are offsets[x] .. offsets[x+1]-1 of
+
+    targets   int32 (int64 past 2^31 vertices)   the neighbor
+    weights   int64 or float64                   the edge weight
+    edges     int32 (int64 past 2^31 edges)      which input edge it is
+
+An undirected graph lists each edge under both of its ends (a self-loop
+once), so about 2 * (4 + 8 + 4) = 32 bytes an edge.  `edges` ties the two
+copies together and lets an algorithm answer with edge indices;
+edge_list() gives the (u, v, w) arrays those index.
+
+from_edges() builds the arrays in bulk by counting sort: offsets from a
+bincount of the sources, the entry order from a stable LSD radix sort of
+the sources, 16 bits per pass (each pass is NumPy's counting sort on
+uint16 keys).  No per-edge Python loop.
+
+File layout (little-endian, sections 8-byte aligned), mapped read-only
+like perfect_hash.py's, so loading is O(1) and the arrays are views of
+the page cache:
+
+    header   magic b"CSRG\\x00\\x02", n, m, entries, directed,
+             dtype.str of targets / weights / edges            (HEADER)
+    OFFSETS  (n + 1) × int64
+    TARGETS  entries × targets dtype
+    WEIGHTS  entries × weights dtype
+    EDGES    entries × edges dtype
+
+    g = CSRGraph.from_edges(n, u, v, w);  g.save("g.csr")
+    g = CSRGraph.load("g.csr");  g.neighbors(x);  u, v, w = g.edge_list()
+    g, nodes = CSRGraph.from_adjacency(burovka.graph)
+
+    python csr_graph.py edges.txt -o graph.csr     # "u v [w]" lines to a CSR file
+    python csr_graph.py --random 1000000 10000000 -o graph.csr
+    python csr_graph.py graph.csr                  # sizes and load time
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+MAGIC = b"CSRG\x00\x02\x00\x00"
+HEADER = struct.Struct("<8sQQQ?4s4s4s")   # magic, n, m, entries, directed, 3 dtype.str ("<i4")
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _index_dtype(limit):
+    """int32 if every index below limit fits, else int64."""
+    return np.dtype(np.int32 if limit < 2 ** 31 else np.int64)
+
+
+def counting_order(keys, n):
+    """
+    Stable order of int keys in [0, n): LSD radix sort, 16 bits a pass,
+    each pass a counting sort (NumPy's stable sort of uint16).
+    """
+    order = np.arange(len(keys))
+    shift = 0
+    while True:
+        digit = ((keys[order] >> shift) & 0xFFFF).astype(np.uint16)
+        order = order[np.argsort(digit, kind="stable")]
+        shift += 16
+        if (n - 1) >> shift <= 0:
+            return order
+
+
+class CSRGraph:
+    """
+    n vertices and m edges in CSR arrays (see the module docstring).
+    Built by from_edges / from_adjacency / from_text, or load()ed from a
+    file written by save().
+    """
+
+    def __init__(self, offsets, targets, weights, edges, m, directed=False, mm=None):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.edges = edges
+        self.n = len(offsets) - 1
+        self.m = m
+        self.directed = directed
+        self._mm = mm
+
+    # ── building ──
+
+    @classmethod
+    def from_edges(cls, n, u, v, w=None, directed=False):
+        """
+        Graph of edges (u[i], v[i], w[i]) over vertices 0 .. n-1; all
+        weights 1 when w is None.  Undirected unless directed=True.
+        """
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        w = np.ones(len(u), dtype=np.int64) if w is None else np.asarray(w)
+        if w.dtype.kind not in "iuf":
+            raise ValueError("weights must be numbers")
+        w = w.astype(np.float64 if w.dtype.kind == "f" else np.int64, copy=False)
+        if len(u) and (min(u.min(), v.min()) < 0 or max(u.max(), v.max()) >= n):
+            raise ValueError(f"vertex ids must be in 0 .. {n - 1}")
+        ids = np.arange(len(u))
+        if directed:
+            src, dst, eid, wt = u, v, ids, w
+        else:
+            back = u != v                   # a self-loop is listed once
+            src = np.concatenate([u, v[back]])
+            dst = np.concatenate([v, u[back]])
+            eid = np.concatenate([ids, ids[back]])
+            wt = np.concatenate([w, w[back]])
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        order = counting_order(src, n)
+        return cls(offsets, dst[order].astype(_index_dtype(n)), wt[order],
+                   eid[order].astype(_index_dtype(len(u))), len(u), directed)
+
+    @classmethod
+    def from_adjacency(cls, graph):
+        """
+        (CSRGraph, nodes) from a dict of {node: [(neighbor, weight), ...]}
+        listing every edge under both ends, as burovka.py's sample does.
+        Vertex i is nodes[i]; each edge is kept once, from its
+        lower-numbered end.
+        """
+        nodes = list(graph)
+        index = {x: i for i, x in enumerate(nodes)}
+        u, v, w = [], [], []
+        for x, adj in graph.items():
+            for y, weight in adj:
+                i, j = index[x], index[y]
+                if i < j:
+                    u.append(i)
+                    v.append(j)
+                    w.append(weight)
+        return cls.from_edges(len(nodes), u, v, w), nodes
+
+    @classmethod
+    def from_text(cls, path, n=None, directed=False):
+        """
+        Graph from a text edge list: one "u v [weight]" per line, "#"
+        comments, vertices 0-based.  n defaults to the largest id + 1.
+        """
+        data = np.loadtxt(path, comments="#", ndmin=2)
+        if data.shape[1] not in (2, 3):
+            raise ValueError(f"{path}: expected 'u v' or 'u v weight' lines")
+        u, v = data[:, 0].astype(np.int64), data[:, 1].astype(np.int64)
+        w = None
+        if data.shape[1] == 3:
+            w = data[:, 2]
+            if np.array_equal(w, np.round(w)):
+                w = w.astype(np.int64)
+        if n is None:
+            n = int(max(u.max(), v.max())) + 1 if len(u) else 0
+        return cls.from_edges(n, u, v, w, directed)
+
+    # ── file ──
+
+    def save(self, path):
+        """Write the graph to path (via a temporary file).  Returns path."""
+        arrays = [np.asarray(a, dtype=a.dtype.newbyteorder("<"))
+                  for a in (self.offsets, self.targets, self.weights, self.edges)]
+        header = HEADER.pack(MAGIC, self.n, self.m, len(self.targets), self.directed,
+                             *(a.dtype.str.encode() for a in arrays[1:]))
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(header + b"\0" * (_align(len(header)) - len(header)))
+            for a in arrays:
+                a.tofile(f)
+                f.write(b"\0" * (_align(a.nbytes) - a.nbytes))
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Map a file written by save() read-only; O(1) in the graph size."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n, m, entries, directed, *codes = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            mm.close()
+            raise ValueError(f"{path}: not a CSR graph file (bad magic)")
+        dtypes = [np.dtype("<i8")] + [np.dtype(c.rstrip(b"\0").decode()) for c in codes]
+        counts = [n + 1, entries, entries, entries]
+        off = _align(HEADER.size)
+        arrays = []
+        for dt, count in zip(dtypes, counts):
+            arrays.append(np.frombuffer(mm, dtype=dt, count=count, offset=off))
+            off += _align(dt.itemsize * count)
+        return cls(*arrays, m, directed, mm)
+
+    def close(self):
+        """Drop the arrays and unmap the file, if there is one."""
+        self.offsets = self.targets = self.weights = self.edges = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── queries ──
+
+    def degree(self, x):
+        return int(self.offsets[x + 1] - self.offsets[x])
+
+    def degrees(self):
+        return np.diff(self.offsets)
+
+    def neighbors(self, x):
+        """(targets, weights) of vertex x: array views, not copies."""
+        a, b = self.offsets[x], self.offsets[x + 1]
+        return self.targets[a:b], self.weights[a:b]
+
+    def sources(self):
+        """The vertex each entry belongs to (entries long)."""
+        return np.repeat(np.arange(self.n), self.degrees())
+
+    def edge_list(self):
+        """
+        (u, v, w) arrays indexed by edge.  An undirected edge comes back as
+        u <= v, whichever way round it went in.
+        """
+        src = self.sources()
+        first = np.ones(len(src), dtype=bool) if self.directed else src <= self.targets
+        e = self.edges[first]
+        u = np.empty(self.m, dtype=np.int64)
+        v = np.empty(self.m, dtype=np.int64)
+        w = np.empty(self.m, dtype=self.weights.dtype)
+        u[e], v[e], w[e] = src[first], self.targets[first], self.weights[first]
+        return u, v, w
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.offsets, self.targets, self.weights, self.edges))
+
+    def __repr__(self):
+        kind = "directed" if self.directed else "undirected"
+        return f"CSRGraph({kind}, n={self.n:,}, m={self.m:,}, {self.nbytes:,} bytes)"
+
+
+# ── graphs for the algorithms ─────────────────────────────────────────────────
+
+def random_graph(n, m, max_weight=1_000_000, seed=5243):
+    """
+    A connected undirected graph of n vertices and m >= n-1 edges: a random
+    tree plus random extra edges, integer weights in [1, max_weight).
+    """
+    rng = np.random.default_rng(seed)
+    tree_u = np.arange(1, n, dtype=np.int64)
+    tree_v = (rng.random(n - 1) * tree_u).astype(np.int64)
+    extra = m - (n - 1)
+    u = np.concatenate([tree_u, rng.integers(0, n, extra)])
+    v = np.concatenate([tree_v, rng.integers(0, n, extra)])
+    return CSRGraph.from_edges(n, u, v, rng.integers(1, max_weight, m))
+
+
+def open_graph(path, directed=False):
+    """A CSR file by its magic, anything else as a text edge list."""
+    with open(path, "rb") as f:
+        is_csr = f.read(len(MAGIC)) == MAGIC
+    return CSRGraph.load(path) if is_csr else CSRGraph.from_text(path, directed=directed)
+
+
+def add_graph_args(ap, n=1_000_000, density=10):
+    """The --graph / -n / -m / --seed options the graph scripts share."""
+    ap.add_argument("--graph", help="CSR file or text edge list (default: a random graph)")
+    ap.add_argument("-n", type=int, default=n, help="vertices of the random graph")
+    ap.add_argument("-m", type=int, default=0, help=f"edges of the random graph (default {density}n)")
+    ap.add_argument("--seed", type=int, default=5243)
+    ap.set_defaults(density=density)
+
+
+def graph_from_args(args):
+    """The graph add_graph_args()' options describe; prints what it is."""
+    t0 = time.perf_counter()
+    if args.graph:
+        g = open_graph(args.graph)
+        what = args.graph
+    else:
+        g = random_graph(args.n, max(args.m or args.density * args.n, args.n - 1), seed=args.seed)
+        what = "random graph"
+    print(f"{what}: {g.n:,} vertices, {g.m:,} edges ({time.perf_counter() - t0:.1f} s)")
+    return g
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("graph", nargs="?", help="CSR file or text edge list")
+    ap.add_argument("--random", type=int, nargs=2, metavar=("N", "M"),
+                    help="a random graph of N vertices and M edges instead")
+    ap.add_argument("--directed", action="store_true", help="read the edge list as directed")
+    ap.add_argument("-o", "--out", help="save the graph here")
+    args = ap.parse_args(argv)
+    if not args.graph and not args.random:
+        ap.error("give a graph file or --random N M")
+
+    t0 = time.perf_counter()
+    g = random_graph(*args.random) if args.random else open_graph(args.graph, args.directed)
+    print(f"{g!r}, {time.perf_counter() - t0:.2f} s to build or map")
+    if g.m:
+        deg = g.degrees()
+        print(f"  {g.nbytes / g.m:.1f} bytes per edge; degree mean {deg.mean():.2f}, max {deg.max():,}")
+    if args.out:
+        t0 = time.perf_counter()
+        g.save(args.out)
+        t1 = time.perf_counter()
+        with CSRGraph.load(args.out) as h:
+            same = all(np.array_equal(a, b) for a, b in zip(
+                (g.offsets, g.targets, g.weights, g.edges), (h.offsets, h.targets, h.weights, h.edges)))
+        print(f"  saved {args.out}: {os.path.getsize(args.out):,} bytes in {t1 - t0:.2f} s, "
+              f"reload {'matches' if same else 'DIFFERS'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+parallel_boruvka.py
+Borůvka's MST on a process pool, the graph held once in shared memory.
+
+burovka.py does a round in one Python loop.  Here a copy of the
+CSRGraph's offsets and targets (csr_graph.py; every edge listed under both
+of its ends) goes into multiprocessing.shared_memory blocks, next to an
+array of component labels.  One pool of worker processes lives for the whole run.  Each round:
+
+    workers   each takes a fixed slice of the CSR entries (a vertex range,
+              sized to hold about the same number of entries) and, with
+              NumPy over that slice, finds the cheapest edge leaving every
+              component it sees
+    parent    keeps the cheapest edge per component over all the slices,
+              hooks every component onto the one across that edge (as in
+              boruvka_numpy.py: of two components that picked the same
+              edge, the lower id is the root), and writes the new labels
+              back to shared memory by pointer jumping
+
+Nothing large crosses a process boundary: workers read the graph and the
+labels in place and send back one (component, edge) pair per component
+they touched.
+
+"Cheapest" is by (weight, edge index), as in burovka.py, so both give the
+same tree.  Edges are ranked by that order once up front; the shared
+copy stores each entry's rank instead of its weight, and a component's
+cheapest edge is a minimum of ranks: within a slice, np.minimum.reduceat
+over each vertex's entries, then a sort of the slice's vertices by
+component and a second reduceat, so a worker's arrays are the size of its
+slice, not of the graph.
+
+    python parallel_boruvka.py -n 1000000 -m 10000000 --workers 1 2 4
+    python parallel_boruvka.py -n 100000 --check
+    python parallel_boruvka.py --graph graph.csr
+"""
+
+import argparse
+import os
+import time
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from burovka import boruvka
+from csr_graph import add_graph_args, graph_from_args
+
+NONE = np.iinfo(np.int64).max
+
+
+class SharedArrays:
+    """
+    NumPy arrays in named shared-memory blocks.  The creating process owns
+    the blocks (close() and unlink() them); others attach(spec) by name.
+    """
+
+    def __init__(self, spec, blocks):
+        self.spec = spec                    # {name: (block name, dtype str, shape)}
+        self.blocks = blocks
+        self.arrays = {name: np.ndarray(shape, dtype=dtype, buffer=blocks[name].buf)
+                       for name, (_, dtype, shape) in spec.items()}
+
+    @classmethod
+    def create(cls, **arrays):
+        spec, blocks = {}, {}
+        for name, a in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(1, a.nbytes))
+            blocks[name] = shm
+            spec[name] = (shm.name, a.dtype.str, a.shape)
+        out = cls(spec, blocks)
+        for name, a in arrays.items():
+            out.arrays[name][...] = a
+        return out
+
+    @classmethod
+    def attach(cls, spec):
+        return cls(spec, {name: shared_memory.SharedMemory(name=block)
+                          for name, (block, _, _) in spec.items()})
+
+    def __getattr__(self, name):
+        try:
+            return self.arrays[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def close(self):
+        self.arrays = {}
+        for shm in self.blocks.values():
+            shm.close()
+
+    def unlink(self):
+        for shm in self.blocks.values():
+            shm.unlink()
+
+
+# ── graph ─────────────────────────────────────────────────────────────────────
+
+def edge_ranks(w):
+    """rank[e] = position of edge e in (weight, index) order."""
+    order = np.argsort(w, kind="stable")
+    rank = np.empty(len(w), dtype=np.int64)
+    rank[order] = np.arange(len(w))
+    return rank, order
+
+
+def partition(offsets, parts):
+    """parts vertex ranges [(lo, hi), ...] holding about equal numbers of entries."""
+    cuts = np.searchsorted(offsets, np.linspace(0, offsets[-1], parts + 1), side="left")
+    cuts[0], cuts[-1] = 0, len(offsets) - 1
+    cuts = np.unique(cuts)
+    return [(int(a), int(b)) for a, b in zip(cuts[:-1], cuts[1:])]
+
+
+# ── one round ─────────────────────────────────────────────────────────────────
+
+_shared = None          # the worker's attached SharedArrays
+
+
+def _attach(spec):
+    global _shared
+    _shared = SharedArrays.attach(spec)
+
+
+def component_minima(g, lo, hi):
+    """
+    (components, cheapest outgoing edge rank) over the entries of vertices
+    lo .. hi-1, for every component with an edge leaving it there.
+    """
+    offsets, comp = g.offsets, g.comp
+    a, b = offsets[lo], offsets[hi]
+    degree = np.diff(offsets[lo:hi + 1])
+    src = np.repeat(comp[lo:hi], degree)
+    ranks = np.where(src != comp[g.targets[a:b]], g.ranks[a:b], NONE)
+    # the entries are grouped by vertex already: cheapest per vertex, then
+    # per component over the slice's vertices, sorted by component
+    has = degree > 0
+    best = np.minimum.reduceat(ranks, offsets[lo:hi][has] - a) if a < b else ranks
+    comps = comp[lo:hi][has]
+    out = best != NONE
+    best, comps = best[out], comps[out]
+    if not len(comps):
+        return comps, best
+    by = np.argsort(comps, kind="stable")
+    comps = comps[by]
+    first = np.flatnonzero(np.diff(comps, prepend=-1))
+    return comps[first], np.minimum.reduceat(best[by], first)
+
+
+def _worker_minima(part):
+    return component_minima(_shared, *part)
+
+
+def parallel_boruvka(graph, workers=None, parts=None, stats=None):
+    """
+    Minimum spanning forest of an undirected CSRGraph: the indices of the
+    tree edges (into graph.edge_list()), sorted.  workers=1 runs the rounds
+    in this process.  parts (default 4 per worker) is how many slices the
+    entries are cut into.  stats, if a list, gets a {"components",
+    "seconds"} dict per round.
+    """
+    if graph.directed:
+        raise ValueError("Borůvka needs an undirected graph")
+    n = graph.n
+    u, v, w = graph.edge_list()
+    workers = workers or os.cpu_count()
+    rank, order = edge_ranks(w)
+    g = SharedArrays.create(offsets=graph.offsets, targets=graph.targets,
+                            ranks=rank[graph.edges], comp=np.arange(n, dtype=np.int64))
+    slices = partition(graph.offsets, parts or 4 * workers)
+    ids = np.arange(n)
+    components = n
+    tree = []
+    pool = Pool(workers, initializer=_attach, initargs=(g.spec,)) if workers > 1 else None
+    try:
+        while components > 1:
+            t0 = time.perf_counter()
+            if pool:
+                found = pool.map(_worker_minima, slices)
+            else:
+                found = [component_minima(g, lo, hi) for lo, hi in slices]
+            best = np.full(n, NONE, dtype=np.int64)
+            for comps, r in found:
+                np.minimum.at(best, comps, r)
+            comps = np.flatnonzero(best != NONE)
+            if not len(comps):
+                break                                       # the rest is disconnected
+            e = order[best[comps]]
+            cu, cv = g.comp[u[e]], g.comp[v[e]]
+            hook = g.comp.copy()                            # non-roots already point at their root
+            hook[comps] = np.where(cu == comps, cv, cu)
+            # both ends of an edge chose it: the lower-numbered one becomes the root
+            mutual = (hook[hook] == ids) & (ids < hook)
+            hook[mutual] = ids[mutual]
+            tree.append(np.unique(e))
+            # every vertex straight to its root, so comp is a lookup for the workers
+            while True:
+                jumped = hook[hook]
+                if np.array_equal(jumped, hook):
+                    break
+                hook = jumped
+            g.comp[:] = hook
+            components = int(np.count_nonzero(hook == ids))
+            if stats is not None:
+                stats.append({"components": components, "seconds": time.perf_counter() - t0})
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        g.close()
+        g.unlink()
+    return np.sort(np.concatenate(tree)) if tree else np.empty(0, dtype=np.int64)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add_graph_args(ap)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count()],
+                    help="pool sizes to time (1 = no pool)")
+    ap.add_argument("--check", action="store_true", help="compare with burovka.boruvka()")
+    args = ap.parse_args(argv)
+
+    g = graph_from_args(args)
+    print(f"{os.cpu_count()} cores")
+    w = g.edge_list()[2]
+    trees = []
+    for workers in dict.fromkeys(args.workers):
+        stats = []
+        t0 = time.perf_counter()
+        tree = parallel_boruvka(g, workers, stats=stats)
+        secs = time.perf_counter() - t0
+        rounds = "  ".join(f"{s['seconds']:.2f}" for s in stats)
+        print(f"  {workers:3} workers: {secs:7.2f} s  ({len(stats)} rounds: {rounds})")
+        trees.append(tree)
+    print(f"tree: {len(trees[0]):,} edges, weight {w[trees[0]].sum():,}")
+    if any(not np.array_equal(t, trees[0]) for t in trees):
+        print("DIFFERENT TREES for different pool sizes")
+    if args.check:
+        t0 = time.perf_counter()
+        same = np.array_equal(np.sort(np.asarray(boruvka(g))), trees[0])
+        print(f"burovka.boruvka: {'same tree' if same else 'DIFFERENT TREE'}, "
+              f"{time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+autocomplete.py
+---------------
+Top-k autocomplete over a weighted word list.
+
+Every trie node stores its answer ahead of time: the k best completions in
+its subtree.  A query is then just a walk down the prefix plus a slice —
+no subtree search at query time.
+
+    words are ranked once, best first: by weight (descending), then
+    alphabetically; a node's top-k is the k smallest ranks below it
+
+    ranks      tuple of ints per node; a node that is not a word and has
+               a single child shares its child's tuple, so long chains cost
+               nothing extra
+    cache      LRU (OrderedDict) of prefix → completions for hot prefixes
+    complete_many(prefixes)
+               walks the prefixes in sorted order and resumes from the
+               node of the longest prefix shared with the previous query
+
+Weights default to how often a word appears across
+Resources/04-Data/word_lists/*.txt — the lists come from WordNet, so a word
+with many senses ("cut", "break", "run") shows up many times.
+
+    ac = Autocomplete(load_weights(), k=10)
+    ac.complete("ca")            # ['carry', 'call', 'catch', 'case', ...]
+    ac.complete_many(["a", "ab", "abs"])
+
+Run this file for the latency benchmark:
+
+    python autocomplete.py
+"""
+
+import heapq
+import random
+import sys
+import time
+from collections import Counter, OrderedDict
+
+from trie_utils import CORPORA, SortedWords, iter_words
+
+
+WORD_LISTS = [CORPORA[name] for name in ("adjectives", "adverbs", "animals", "nouns", "verbs")]
+
+
+def load_weights(paths=WORD_LISTS):
+    """{word: number of times it appears across paths}."""
+    weights = Counter()
+    for path in paths:
+        weights.update(iter_words(path))
+    return weights
+
+
+class Autocomplete:
+    def __init__(self, weights, k=10, cache_size=4096):
+        """
+        weights    : {word: weight}; higher weights complete first
+        k          : completions precomputed per node (the most complete() returns)
+        cache_size : prefixes kept in the LRU cache (0 disables it)
+        """
+        self.k = k
+        self.cache_size = cache_size
+        self.cache  = OrderedDict()
+        self.hits   = 0
+        self.misses = 0
+
+        # rank 0 is the best word; ties broken alphabetically
+        self.words  = sorted(weights, key=lambda w: (-weights[w], w))
+        self.weight = [weights[w] for w in self.words]
+
+        # node 0 is the root; kids[n] maps a character to a child node
+        self.kids  = [{}]
+        self.rank  = [-1]            # rank of the word ending at node n, or -1
+        for r, w in enumerate(self.words):
+            node = 0
+            for ch in w:
+                nxt = self.kids[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.kids)
+                    self.kids[node][ch] = nxt
+                    self.kids.append({})
+                    self.rank.append(-1)
+                node = nxt
+            self.rank[node] = r
+        self.top = self._precompute()
+
+    def _precompute(self):
+        """top[n] = the k smallest ranks in n's subtree, ascending; children before parents."""
+        kids, rank, k = self.kids, self.rank, self.k
+        order = [0]
+        for n in order:                      # BFS: parents before children
+            order.extend(kids[n].values())
+        top = [()] * len(kids)
+        for n in reversed(order):
+            children = [top[c] for c in kids[n].values()]
+            if rank[n] == -1 and len(children) == 1:
+                top[n] = children[0]         # share the chain's tuple
+                continue
+            if rank[n] != -1:
+                children.append((rank[n],))
+            top[n] = tuple(heapq.nsmallest(k, heapq.merge(*children)))
+        return top
+
+    def __len__(self):
+        return len(self.words)
+
+    @property
+    def nodes(self):
+        return len(self.kids)
+
+    # ── queries ──────────────────────────────────────────────────────────────
+
+    def _node(self, prefix, node=0):
+        kids = self.kids
+        for ch in prefix:
+            node = kids[node].get(ch)
+            if node is None:
+                return -1
+        return node
+
+    def _answer(self, node, k):
+        if node == -1:
+            return []
+        words = self.words
+        return [words[r] for r in self.top[node][:k]]
+
+    def complete(self, prefix, k=None):
+        """The k (default self.k) highest-weighted words starting with prefix."""
+        k = self.k if k is None else min(k, self.k)
+        cache = self.cache
+        hit = cache.get(prefix)
+        if hit is not None:
+            self.hits += 1
+            cache.move_to_end(prefix)
+            return hit[:k]
+        self.misses += 1
+        result = self._answer(self._node(prefix), self.k)
+        if self.cache_size:
+            cache[prefix] = result
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return result[:k]
+
+    def complete_many(self, prefixes, k=None):
+        """
+        complete() for each prefix, in input order.  Sorting the distinct
+        prefixes lets each walk resume at the node for the characters it
+        shares with the previous one ("ca", "car", "cart" walk 4 edges, not 9).
+        The batch bypasses the LRU cache.
+        """
+        k = self.k if k is None else min(k, self.k)
+        kids = self.kids
+        answers = {}
+        path = [0]                           # path[i] = node for prev[:i]
+        prev = ""
+        for p in sorted(set(prefixes)):
+            common = 0
+            lim = min(len(p), len(prev), len(path) - 1)
+            while common < lim and p[common] == prev[common]:
+                common += 1
+            del path[common + 1:]
+            node = path[-1]
+            for ch in p[common:]:
+                node = kids[node].get(ch)
+                if node is None:
+                    node = -1
+                    break
+                path.append(node)
+            answers[p] = self._answer(node, k)
+            prev = p
+        return [answers[p] for p in prefixes]
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self.cache), "max": self.cache_size}
+
+
+# ── benchmark ─────────────────────────────────────────────────────────────────
+
+def naive_complete(sorted_words, weights, prefix, k):
+    """Baseline: bisect to the prefix range, then pick the top k by weight."""
+    lo, hi = sorted_words._range(prefix)
+    return heapq.nsmallest(k, sorted_words.words[lo:hi], key=lambda w: (-weights[w], w))
+
+
+def percentiles(samples_ns, ps=(50, 90, 99, 99.9)):
+    s = sorted(samples_ns)
+    return {p: s[min(len(s) - 1, int(len(s) * p / 100))] / 1e3 for p in ps}
+
+
+def benchmark(queries=100_000, k=10, seed=5243):
+    weights = load_weights()
+    t0 = time.perf_counter()
+    ac = Autocomplete(weights, k=k)
+    built = time.perf_counter() - t0
+    print(f"{len(ac):,} weighted words, {ac.nodes:,} nodes, built in {built:.2f} s\n")
+
+    # queries: prefixes of words drawn by weight, as a user would type them
+    rng = random.Random(seed)
+    picks = rng.choices(ac.words, weights=ac.weight, k=queries)
+    prefixes = [w[:rng.randint(1, min(6, len(w)))] for w in picks]
+
+    sw = SortedWords(weights)
+    for p in prefixes[:200]:
+        assert ac.complete(p) == naive_complete(sw, weights, p, k), p
+    ac.cache.clear()
+    ac.hits = ac.misses = 0
+
+    def timed(fn):
+        samples = []
+        clock = time.perf_counter_ns
+        for p in prefixes:
+            t = clock()
+            fn(p)
+            samples.append(clock() - t)
+        return percentiles(samples)
+
+    rows = [
+        ("naive range + nsmallest", lambda p: naive_complete(sw, weights, p, k)),
+        ("precomputed, no cache",   Autocomplete(weights, k=k, cache_size=0).complete),
+        ("precomputed + LRU",       ac.complete),
+    ]
+    print(f"{'single query (µs)':<26}{'p50':>8}{'p90':>8}{'p99':>8}{'p99.9':>8}")
+    for name, fn in rows:
+        q = timed(fn)
+        print(f"{name:<26}" + "".join(f"{q[p]:>8.1f}" for p in (50, 90, 99, 99.9)))
+    info = ac.cache_info()
+    print(f"{'':<26}LRU hit rate {info['hits'] / (info['hits'] + info['misses']):.1%}")
+
+    t0 = time.perf_counter()
+    for p in prefixes:
+        ac._answer(ac._node(p), k)
+    loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    batch = ac.complete_many(prefixes)
+    many = time.perf_counter() - t0
+    assert batch[:50] == [ac.complete(p) for p in prefixes[:50]]
+    print(f"\n{queries:,} prefixes: one-by-one {loop * 1e3:.0f} ms, "
+          f"complete_many {many * 1e3:.0f} ms ({loop / many:.1f}x)")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
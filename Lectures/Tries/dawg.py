@@ -0,0 +1,237 @@
+"""
+dawg.py
+-------
+Minimal DAWG (directed acyclic word graph) built incrementally from a
+sorted word stream — Daciuk, Mihov, Watson & Watson, "Incremental
+Construction of Minimal Acyclic Finite-State Automata" (2000).
+
+A trie shares prefixes; a DAWG also shares suffixes ("-ing", "-ness",
+"'s" ...), so the dictionary collapses to a fraction of the trie's nodes.
+No trie is ever built: words arrive in sorted order, and as soon as a word
+diverges from the previous one, the previous word's now-finished tail is
+minimized bottom-up against a register of already-unique states.  Each
+character is handled a constant number of times, so construction is linear
+in the total characters.
+
+    b = DawgBuilder()
+    for w in iter_words(path):       # must be sorted (byte/code-point order)
+        b.add(w)
+    d = b.finish()                   # compact, read-only Dawg
+    "aardvark" in d;  list(d.starts_with("aard"))
+
+Run this file to build the dictionary DAWG and compare it with the tries:
+
+    python dawg.py                                   # dictionary_clean.txt
+    python dawg.py ../../Resources/04-Data/dictionary_files/dict.json
+"""
+
+import os
+import sys
+from array import array
+
+from trie_utils import DICT_FILES, DictTrie, iter_words, measure
+
+
+class _State:
+    __slots__ = ("final", "edges", "id")
+
+    def __init__(self):
+        self.final = False
+        self.edges = {}          # ch → _State, in insertion (= sorted) order
+        self.id    = -1          # set when the state enters the register
+
+    def key(self):
+        return (self.final, tuple((ch, t.id) for ch, t in self.edges.items()))
+
+
+class DawgBuilder:
+    def __init__(self):
+        self.root      = _State()
+        self.register  = {}      # key() → unique registered state
+        self.unchecked = []      # (parent, ch, child) along the previous word
+        self.previous  = ""
+        self.words     = 0
+
+    def add(self, word):
+        """
+        Add the next word; words must arrive in strictly increasing order.
+        "" may only come first, and marks the root final.
+        """
+        if self.words and word <= self.previous:
+            if word == self.previous:
+                return           # tolerate duplicates in the stream
+            raise ValueError(f"words must be added in sorted order: "
+                             f"{word!r} after {self.previous!r}")
+        common = 0
+        for a, b in zip(word, self.previous):
+            if a != b:
+                break
+            common += 1
+        self._minimize(common)
+
+        node = self.unchecked[-1][2] if self.unchecked else self.root
+        for ch in word[common:]:
+            nxt = _State()
+            node.edges[ch] = nxt
+            self.unchecked.append((node, ch, nxt))
+            node = nxt
+        node.final = True
+        self.previous = word
+        self.words += 1
+
+    def _minimize(self, down_to):
+        """Replace or register the unchecked states below depth down_to."""
+        register, unchecked = self.register, self.unchecked
+        while len(unchecked) > down_to:
+            parent, ch, child = unchecked.pop()
+            key = child.key()
+            same = register.get(key)
+            if same is not None:
+                parent.edges[ch] = same
+            else:
+                child.id = len(register)
+                register[key] = child
+
+    def finish(self):
+        """Minimize the last word and freeze the graph into a Dawg."""
+        self._minimize(0)
+        dawg = Dawg._freeze(self.root, self.words)
+        self.register.clear()
+        return dawg
+
+
+class Dawg:
+    """
+    Read-only DAWG in flat arrays.  State s owns edges first[s]:first[s+1];
+    edge e is labeled chr(label[e]) and leads to target[e].  State 0 is the
+    root.
+    """
+
+    def __init__(self):
+        self.first  = array("I", [0])
+        self.label  = array("I")
+        self.target = array("I")
+        self.final  = bytearray()
+        self.words  = 0
+
+    @classmethod
+    def _freeze(cls, root, words):
+        d = cls()
+        d.words = words
+        index = {id(root): 0}
+        order = [root]
+        i = 0
+        while i < len(order):                       # BFS numbering
+            for t in order[i].edges.values():
+                if id(t) not in index:
+                    index[id(t)] = len(order)
+                    order.append(t)
+            i += 1
+        for st in order:
+            d.final.append(st.final)
+            for ch, t in st.edges.items():
+                d.label.append(ord(ch))
+                d.target.append(index[id(t)])
+            d.first.append(len(d.label))
+        return d
+
+    @classmethod
+    def from_words(cls, words):
+        b = DawgBuilder()
+        for w in words:
+            b.add(w)
+        return b.finish()
+
+    def __len__(self):
+        return self.words
+
+    @property
+    def states(self):
+        return len(self.final)
+
+    @property
+    def edges(self):
+        return len(self.label)
+
+    def nbytes(self):
+        arrays = (self.first, self.label, self.target)
+        return sum(a.itemsize * len(a) for a in arrays) + len(self.final)
+
+    def _step(self, s, ch):
+        label, c = self.label, ord(ch)
+        for e in range(self.first[s], self.first[s + 1]):
+            if label[e] == c:
+                return self.target[e]
+            if label[e] > c:
+                break
+        return -1
+
+    def _walk_to(self, prefix):
+        s = 0
+        for ch in prefix:
+            s = self._step(s, ch)
+            if s == -1:
+                break
+        return s
+
+    def __contains__(self, word):
+        s = self._walk_to(word)
+        return s != -1 and self.final[s] == 1
+
+    def starts_with(self, prefix):
+        """Yield every word starting with prefix, in sorted order."""
+        s = self._walk_to(prefix)
+        if s == -1:
+            return
+        first, label, target, final = self.first, self.label, self.target, self.final
+        stack = [(s, prefix)]
+        while stack:
+            s, word = stack.pop()
+            if final[s]:
+                yield word
+            for e in range(first[s + 1] - 1, first[s] - 1, -1):
+                stack.append((target[e], word + chr(label[e])))
+
+    def __iter__(self):
+        return self.starts_with("")
+
+
+# ── demo ──────────────────────────────────────────────────────────────────────
+
+def is_sorted(path):
+    """True if the file's words are in code-point order (what DawgBuilder needs)."""
+    prev = None
+    for w in iter_words(path):
+        if prev is not None and w < prev:
+            return False
+        prev = w
+    return True
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(DICT_FILES, "dictionary_clean.txt")
+    chars = sum(len(w) for w in iter_words(path))
+
+    stream = lambda: iter_words(path)
+    if not is_sorted(path):
+        print(f"note: {os.path.basename(path)} is not in code-point order; sorting it first")
+        stream = lambda: sorted(set(iter_words(path)))
+
+    dawg, secs, dawg_mem, _ = measure(lambda: Dawg.from_words(stream()))
+    trie, _, trie_mem, _ = measure(lambda: DictTrie(iter_words(path)))
+    trie_nodes = 1
+    stack = [trie.root]
+    while stack:
+        node = stack.pop()
+        kids = [v for k, v in node.items() if k != DictTrie.END]
+        trie_nodes += len(kids)
+        stack.extend(kids)
+    del trie
+
+    print(f"{path}: {len(dawg):,} words, {chars:,} characters")
+    print(f"  build        {secs:.2f} s  ({secs / chars * 1e9:.0f} ns/char)")
+    print(f"  DAWG         {dawg.states:,} states, {dawg.edges:,} edges, "
+          f"{dawg.nbytes() / 1e6:.2f} MB arrays, {dawg_mem / 1e6:.2f} MB traced")
+    print(f"  trie         {trie_nodes:,} nodes, {trie_mem / 1e6:.2f} MB traced (DictTrie)")
+    print(f"  DAWG / trie  {dawg.states / trie_nodes:.1%} of the nodes, "
+          f"{dawg_mem / trie_mem:.1%} of the memory")
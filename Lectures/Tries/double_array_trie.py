@@ -0,0 +1,438 @@
+"""
+double_array_trie.py
+--------------------
+Double-array (BASE/CHECK) trie, written to a flat binary file that loads
+with mmap instead of parsing — Aoe, "An Efficient Digital Search Algorithm
+by Using a Double-Array Structure" (1989).
+
+Every state is an index into three parallel arrays.  The child of state s
+on byte code c is t = BASE[s] + c, and it exists iff CHECK[t] == s:
+
+    BASE   int32    offset of s's children
+    CHECK  int32    parent of t (-1 = free slot)
+    FINAL  uint8    1 if the path to t spells a word
+
+Words are stored as UTF-8; each byte that occurs in the word list is mapped
+to a dense code 1..K (the char map), which keeps the arrays tight.  State 0
+is the root.
+
+File layout (little-endian, sections 8-byte aligned):
+
+    header   magic b"DATRIE\\x00\\x01", n_states, n_words, K   (struct HEADER)
+    charmap  256 × uint8     byte → code (0 = byte never occurs)
+    BASE     n_states × int32
+    CHECK    n_states × int32
+    FINAL    n_states × uint8
+
+DoubleArrayTrie.load() maps the file read-only and reads the sections
+through memoryviews (NumPy views on request) — nothing is copied or parsed,
+so load time is independent of the dictionary size, and every process that
+maps the same file shares one copy in the page cache.
+
+    build_file(load_words(DICTIONARY), "dictionary.dat")
+    t = DoubleArrayTrie.load("dictionary.dat")
+    "aardvark" in t;  t.count_prefix("aard");  list(t.starts_with("aard"))
+
+open_dictionary() does both, rebuilding the .dat file only when the word
+list is newer.  Run this file to compare cold starts:
+
+    python double_array_trie.py                      # Lectures/Tries/dictionary.txt
+    python double_array_trie.py path/to/words.txt
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+from trie_utils import DICTIONARY, load_words
+
+
+MAGIC  = b"DATRIE\x00\x01"
+HEADER = struct.Struct("<8sIII")        # magic, n_states, n_words, K
+
+
+MAX_TRIALS = 16
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+# ── construction ─────────────────────────────────────────────────────────────
+
+def build_arrays(words):
+    """
+    Build (base, check, final, charmap, n_words) from an iterable of words.
+
+    Works breadth-first over the sorted, de-duplicated UTF-8 words: a state
+    is the word range [lo, hi) sharing a prefix of length depth, its
+    children are the distinct bytes at that depth.  For each state the
+    smallest BASE whose child slots are all free is found by walking a
+    doubly linked list of the free slots (as in libdatrie), so the search
+    never steps over occupied ones.  A free slot rejected MAX_TRIALS times
+    leaves the list (as in cedar) — it can still receive a child, but the
+    search stops paying to revisit it.
+    """
+    import numpy as np
+
+    keys = sorted({w.encode("utf-8") for w in words})
+    used_bytes = sorted({b for k in keys for b in k})
+    charmap = bytearray(256)
+    for code, b in enumerate(used_bytes, 1):
+        charmap[b] = code
+
+    size  = max(1024, 4 * sum(len(k) for k in keys) // 3)
+    base  = array("i", [0]) * size
+    check = array("i", [-1]) * size
+    final = bytearray(size)
+    taken = bytearray(size)                 # BASE values already handed out
+    fails = bytearray(size)                 # times a free slot was rejected
+    listed = bytearray(b"\1") * size       # slot is on the free list
+    nxt   = array("i", range(1, size + 1))  # free list: next / previous free
+    prv   = array("i", range(-1, size - 1)) # slot (size = end, -1 = start)
+    nxt[-1] = -1
+    head  = 1                               # lowest free slot
+    top   = 1                               # one past the highest used slot
+    check[0] = 0                            # root is its own parent
+    listed[0], prv[1] = 0, -1
+
+    def grow(need):
+        nonlocal size, head
+        extra = max(need, 2 * size) - size
+        base.extend(array("i", [0]) * extra)
+        check.extend(array("i", [-1]) * extra)
+        final.extend(bytearray(extra))
+        taken.extend(bytearray(extra))
+        fails.extend(bytearray(extra))
+        listed.extend(bytearray(b"\1") * extra)
+        nxt.extend(array("i", range(size + 1, size + extra + 1)))
+        prv.extend(array("i", range(size - 1, size + extra - 1)))
+        nxt[-1] = -1
+        last = size - 1                     # relink the old tail
+        while last >= 0 and not (listed[last] and check[last] == -1):
+            last -= 1
+        if last >= 0:
+            nxt[last] = size
+            prv[size] = last
+        else:
+            prv[size] = -1
+            head = size
+        size += extra
+
+    def unlink(t):
+        nonlocal head
+        listed[t] = 0
+        n, p = nxt[t], prv[t]
+        if p == -1:
+            head = n
+        else:
+            nxt[p] = n
+        if n != -1:
+            prv[n] = p
+
+    queue = [(0, 0, len(keys), 0)] if keys else []      # (state, lo, hi, depth)
+    for state, lo, hi, depth in queue:
+        if len(keys[lo]) == depth:          # sorted: the shortest word comes first
+            final[state] = 1
+            lo += 1
+        if lo == hi:
+            continue
+        # children: (code, lo, hi) runs of equal bytes at this depth
+        runs = []
+        i = lo
+        while i < hi:
+            b = keys[i][depth]
+            j = i + 1
+            while j < hi and keys[j][depth] == b:
+                j += 1
+            runs.append((charmap[b], i, j))
+            i = j
+        codes = [c for c, _, _ in runs]
+        first, span = codes[0], codes[-1] - codes[0]
+
+        # walk the free slots for one that can hold the first child
+        pos = head
+        while True:
+            if pos == -1 or pos + span >= size:
+                grow(size + span + 1)
+                pos = head
+                continue
+            b0 = pos - first
+            if b0 > 0 and not taken[b0] and all(check[b0 + c] == -1 for c in codes):
+                break
+            fails[pos] += 1
+            rejected, pos = pos, nxt[pos]
+            if fails[rejected] >= MAX_TRIALS:
+                unlink(rejected)
+
+        taken[b0] = 1
+        base[state] = b0
+        for c, i, j in runs:
+            t = b0 + c
+            check[t] = state
+            if listed[t]:
+                unlink(t)
+            queue.append((t, i, j, depth + 1))
+        top = max(top, b0 + codes[-1] + 1)
+
+    n = top
+    return (np.frombuffer(base, dtype=np.int32)[:n].copy(),
+            np.frombuffer(check, dtype=np.int32)[:n].copy(),
+            np.frombuffer(final, dtype=np.uint8)[:n].copy(),
+            bytes(charmap), len(keys))
+
+
+def pack(words):
+    """The file image (bytes) of the double array for words."""
+    base, check, final, charmap, n_words = build_arrays(words)
+    blob = bytearray()
+    for chunk in (HEADER.pack(MAGIC, len(base), n_words, max(charmap)), charmap,
+                  base.astype("<i4").tobytes(), check.astype("<i4").tobytes(),
+                  final.tobytes()):
+        blob += chunk + b"\0" * (_align(len(chunk)) - len(chunk))
+    return bytes(blob)
+
+
+def build_file(words, path):
+    """Build the double array for words and write it to path.  Returns path."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(pack(words))
+    os.replace(tmp, path)                   # readers never see a half-written file
+    return path
+
+
+# ── mapped trie ──────────────────────────────────────────────────────────────
+
+class DoubleArrayTrie:
+    """
+    Read-only view of a file written by build_file().
+
+    Lookups walk memoryview casts of the mapped sections, so loading and
+    querying need nothing beyond the standard library.  .base / .check /
+    .final wrap the same bytes as NumPy arrays for vectorized work; NumPy is
+    imported on first use, since its import alone costs more than the load.
+    """
+
+    def __init__(self, buf, mm=None):
+        magic, n, n_words, k = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a double-array trie file (bad magic)")
+        self._mm   = mm
+        self.words = n_words
+        self.codes = k
+        off = _align(HEADER.size)
+        self.charmap = bytes(buf[off:off + 256])
+        off += 256
+        view = memoryview(buf)
+        sections = []
+        for width in (4, 4, 1):
+            sections.append(view[off:off + n * width])
+            off += _align(n * width)
+        self._np = None
+        self._base, self._check = sections[0].cast("i"), sections[1].cast("i")
+        self._final = sections[2]
+        self._raw   = view
+        self._views = [self._base, self._check] + sections + [view]   # release order
+        self._bytes = bytes(b for b in range(256) if self.charmap[b])
+
+    def _arrays(self):
+        if self._np is None:
+            import numpy as np
+            self._np = (np.frombuffer(self._base, dtype=np.int32),
+                        np.frombuffer(self._check, dtype=np.int32),
+                        np.frombuffer(self._final, dtype=np.uint8))
+        return self._np
+
+    @property
+    def base(self):
+        return self._arrays()[0]
+
+    @property
+    def check(self):
+        return self._arrays()[1]
+
+    @property
+    def final(self):
+        return self._arrays()[2]
+
+    @classmethod
+    def load(cls, path):
+        """Map path read-only; O(1) in the size of the dictionary."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm, mm)
+
+    @classmethod
+    def from_words(cls, words):
+        """In-memory trie (no file), mainly for tests and small lists."""
+        return cls(pack(words))
+
+    def to_bytes(self):
+        """The file image, as build_file() would write it."""
+        return bytes(self._raw)
+
+    def close(self):
+        """Release the views and unmap the file."""
+        self._np = None
+        for v in self._views:
+            v.release()
+        self._views = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.words
+
+    @property
+    def states(self):
+        return len(self._base)
+
+    def nbytes(self):
+        return 9 * len(self._base) + 256
+
+    # ── queries ──────────────────────────────────────────────────────────────
+
+    def _walk(self, w):
+        """State reached by the UTF-8 bytes w, or -1."""
+        base, check, charmap = self._base, self._check, self.charmap
+        s = 0
+        for b in w:
+            c = charmap[b]
+            t = base[s] + c
+            if c == 0 or t >= len(check) or check[t] != s:
+                return -1
+            s = t
+        return s
+
+    def __contains__(self, word):
+        s = self._walk(word.encode("utf-8"))
+        return s != -1 and self._final[s] == 1
+
+    def _children(self, s):
+        """[(byte, child)] of state s, in byte order."""
+        b0, check = self._base[s], self._check
+        n = len(check)
+        return [(b, b0 + c) for b, c in ((b, self.charmap[b]) for b in self._bytes)
+                if b0 + c < n and check[b0 + c] == s]
+
+    def starts_with(self, prefix):
+        """Yield every stored word starting with prefix, in byte order."""
+        head = prefix.encode("utf-8")
+        s = self._walk(head)
+        if s == -1:
+            return
+        final = self._final
+        stack = [(s, head)]
+        while stack:
+            s, head = stack.pop()
+            if final[s]:
+                yield head.decode("utf-8")
+            for b, t in reversed(self._children(s)):
+                stack.append((t, head + bytes((b,))))
+
+    def count_prefix(self, prefix):
+        """
+        Number of stored words starting with prefix.  The subtree is
+        gathered one level at a time with NumPy: for every frontier state p
+        and code c, slot BASE[p] + c is a child iff CHECK there equals p.
+        """
+        s = self._walk(prefix.encode("utf-8"))
+        if s == -1:
+            return 0
+        import numpy as np
+        base, check, final = self._arrays()
+        n = len(check)
+        offsets = np.array([c for c in self.charmap if c], dtype=np.int64)
+        frontier = np.array([s], dtype=np.int64)
+        total = 0
+        while frontier.size:
+            total += int(final[frontier].sum())
+            slots = base[frontier].astype(np.int64)[:, None] + offsets
+            parents = np.broadcast_to(frontier[:, None], slots.shape)
+            ok = slots < n
+            slots, parents = slots[ok], parents[ok]
+            frontier = slots[check[slots] == parents]
+        return total
+
+    def __iter__(self):
+        return self.starts_with("")
+
+
+# ── cached dictionary ────────────────────────────────────────────────────────
+
+def open_dictionary(words_path=DICTIONARY, dat_path=None):
+    """
+    Map the double-array file for a word list, (re)building it first if it
+    is missing or older than the word list.  dat_path defaults to the word
+    file with a .dat extension.
+    """
+    dat_path = dat_path or os.path.splitext(words_path)[0] + ".dat"
+    if (not os.path.exists(dat_path)
+            or os.path.getmtime(dat_path) < os.path.getmtime(words_path)):
+        build_file(load_words(words_path), dat_path)
+    return DoubleArrayTrie.load(dat_path)
+
+
+# ── demo ──────────────────────────────────────────────────────────────────────
+
+_COLD = """
+import sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {here!r})
+{body}
+assert "{probe}" in d
+print(time.perf_counter() - t0)
+"""
+
+
+def cold_start(body, probe):
+    """Seconds a fresh interpreter spends running body (after imports)."""
+    import subprocess       # demo only; keeps the module import itself light
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = _COLD.format(here=here, body=body, probe=probe)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.split()[-1])
+
+
+if __name__ == "__main__":
+    words_path = sys.argv[1] if len(sys.argv) > 1 else DICTIONARY
+    dat_path = os.path.splitext(words_path)[0] + ".dat"
+    words = load_words(words_path)
+
+    t0 = time.perf_counter()
+    build_file(words, dat_path)
+    built = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with DoubleArrayTrie.load(dat_path) as t:
+        loaded = time.perf_counter() - t0
+        assert all(w in t for w in words[::97])
+        print(f"{words_path}: {len(t):,} words → {dat_path}")
+        print(f"  build        {built:.2f} s, {t.states:,} slots "
+              f"({t.states and 1 - float((t.check == -1).mean()):.1%} used), "
+              f"{os.path.getsize(dat_path) / 1e6:.2f} MB")
+        print(f"  load         {loaded * 1e6:.0f} µs (mmap, no parse)")
+
+    probe = words[len(words) // 2]
+    runs = {
+        "text → set":        f"d = set(w.strip() for w in open({words_path!r}) if w.strip())",
+        "text → RadixTrie":  f"from trie_utils import load_words; from radix_trie import RadixTrie\n"
+                             f"d = RadixTrie(load_words({words_path!r}))",
+        "mmap double array": f"from double_array_trie import DoubleArrayTrie\n"
+                             f"d = DoubleArrayTrie.load({dat_path!r})",
+    }
+    print("  cold start (fresh interpreter, best of 3):")
+    for name, body in runs.items():
+        secs = min(cold_start(body, probe) for _ in range(3))
+        print(f"    {name:<18}{secs * 1e3:>9.1f} ms")
@@ -0,0 +1,110 @@
+"""
+fuzzy_search.py
+---------------
+Spelling suggestions: every dictionary word within edit distance k of a
+(possibly misspelled) query, using Trie.fuzzy() from trie.py, benchmarked
+against brute-force Levenshtein over the whole word list.
+
+    t = build_trie(load_words(DICTIONARY))
+    t.fuzzy("TRIEE", 1)      # ([('TREE', 1), ('TRIBE', 1), ('TRICE', 1), ...], 1588)
+
+Queries are dictionary words with one random typo (insert, delete,
+substitute or transpose), so most have a true answer at k=1.  The speedup
+column is against the length-filtered brute force, the stronger baseline.
+
+    python fuzzy_search.py                    # Lectures/Tries/dictionary.txt
+    python fuzzy_search.py path/to/words.txt 20
+"""
+
+import random
+import sys
+import time
+
+from trie import Trie
+from trie_utils import DICTIONARY, load_words
+
+
+def build_trie(words):
+    """Fixed-slot Trie over exactly the characters that occur in words."""
+    t = Trie(sorted({ch for w in words for ch in w}))
+    for w in words:
+        t.insert(w)
+    return t
+
+
+def levenshtein(a, b):
+    """Classic two-row DP edit distance."""
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        row = [i]
+        for j, cb in enumerate(b, 1):
+            row.append(min(row[j - 1] + 1, prev[j] + 1, prev[j - 1] + (ca != cb)))
+        prev = row
+    return prev[-1]
+
+
+def brute_force(words, query, k, length_filter=False):
+    """
+    Every word within distance k, by scoring each one.  length_filter skips
+    words whose length alone puts them out of reach — the usual cheap win.
+    """
+    n = len(query)
+    out = []
+    for w in words:
+        if length_filter and abs(len(w) - n) > k:
+            continue
+        d = levenshtein(query, w)
+        if d <= k:
+            out.append((w, d))
+    return out
+
+
+def typo(word, rng, alphabet):
+    i = rng.randrange(len(word))
+    op = rng.choice("idst" if len(word) > 1 else "is")
+    if op == "i":
+        return word[:i] + rng.choice(alphabet) + word[i:]
+    if op == "d":
+        return word[:i] + word[i + 1:]
+    if op == "s":
+        return word[:i] + rng.choice(alphabet) + word[i + 1:]
+    i = min(i, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def benchmark(path=DICTIONARY, queries=10, seed=5243):
+    words = sorted(set(load_words(path)))
+    t0 = time.perf_counter()
+    trie = build_trie(words)
+    print(f"{path}: {len(words):,} words, {trie.nodes:,} trie nodes "
+          f"(built in {time.perf_counter() - t0:.1f} s)\n")
+
+    rng = random.Random(seed)
+    sample = [typo(w, rng, trie.alphabet) for w in rng.sample(words, queries)]
+
+    print(f"{'k':>2}{'matches':>9}{'nodes visited':>15}{'% of trie':>11}"
+          f"{'trie ms':>10}{'brute ms':>10}{'+len ms':>9}{'speedup':>9}")
+    for k in (1, 2, 3):
+        found = visited = 0
+        t_trie = t_brute = t_len = 0.0
+        for q in sample:
+            t0 = time.perf_counter()
+            matches, seen = trie.fuzzy(q, k)
+            t1 = time.perf_counter()
+            brute = brute_force(words, q, k)
+            t2 = time.perf_counter()
+            brute_len = brute_force(words, q, k, length_filter=True)
+            t3 = time.perf_counter()
+            assert matches == brute == brute_len, q
+            found += len(matches)
+            visited += seen
+            t_trie, t_brute, t_len = t_trie + t1 - t0, t_brute + t2 - t1, t_len + t3 - t2
+        m = len(sample)
+        print(f"{k:>2}{found / m:>9.1f}{visited / m:>15,.0f}{visited / m / trie.nodes:>11.1%}"
+              f"{t_trie / m * 1e3:>10.1f}{t_brute / m * 1e3:>10.1f}{t_len / m * 1e3:>9.1f}"
+              f"{t_len / t_trie:>8.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else DICTIONARY,
+              int(sys.argv[2]) if len(sys.argv) > 2 else 10)
@@ -1,126 +1,103 @@
+"""
+make_trie_build.py
+Step-by-step "build a trie" deck.
+
+The steps come from a real Trie (trie.py): each insert() reports the nodes
+it created and the word it marked, a layout pass places the final trie, and
+the slides replay the events one word at a time.
+
+    python make_trie_build.py                      # pet pets peter peck pecked pecks
+    python make_trie_build.py tea ten to inn       # any word list
+    python make_trie_build.py --alphabet=ABCDEFGHIJKLMNOPQRSTUVWXYZ tea ten to inn
+
+Nodes are drawn dense (one box per alphabet letter) for small alphabets and
+sparse for large ones (more than DENSE_MAX letters): only the letters that
+ever get a child, with a narrow "…" box wherever letters are skipped.
+--sparse / --dense force either mode.
+"""
+
+import os
+import sys
+from copy import deepcopy
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN
 from pptx.enum.shapes import MSO_CONNECTOR
+from pptx.oxml.ns import qn
 
-prs = Presentation()
-prs.slide_width  = Inches(13.33)
-prs.slide_height = Inches(7.5)
-blank = prs.slide_layouts[6]
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import trie
+from trie import (BH, BW, CKW, DENSE_MAX, GAP, GAPW, H, W, Trie, alpha_key, children_index,
+                  deck_steps, layout, node_cells, step_states, trie_cells)
+
+# ── Words ────────────────────────────────────────────────────────────────────
+WORDS = ['pet', 'pets', 'peter', 'peck', 'pecked', 'pecks']
+OPTS  = {}
+if __name__ == '__main__' and len(sys.argv) > 1:
+    args  = sys.argv[1:]
+    OPTS  = dict(a[2:].partition('=')[::2] for a in args if a.startswith('--'))
+    WORDS = [w.lower() for w in args if not w.startswith('--')] or WORDS
 
 # ── Alphabet ─────────────────────────────────────────────────────────────────
-ALPHA    = ['C','D','E','K','P','R','S','T']
+# By default only the letters the words use (the default words give
+# C D E K P R S T); --alphabet= gives the full slot set instead.
+ALPHA    = sorted({ch.upper() for w in WORDS for ch in w} | set(OPTS.get('alphabet', '').upper()))
 ALPHA_IDX = {c: i for i, c in enumerate(ALPHA)}
 
-# ── Box geometry ─────────────────────────────────────────────────────────────
-BW   = 0.230   # letter-box width (inches)
-BH   = 0.310   # letter-box height
-CKW  = 0.310   # checkmark box width
-NW   = len(ALPHA)*BW + CKW   # total node width ≈ 2.15
-
-# ── Colors ───────────────────────────────────────────────────────────────────
-NAVY      = RGBColor(0x0D,0x1B,0x2A)
-CYAN      = RGBColor(0x00,0xD4,0xFF)
-WHITE     = RGBColor(0xE8,0xE8,0xE8)
-DIM       = RGBColor(0x66,0x77,0x88)
-EMPTY_F   = RGBColor(0x12,0x22,0x32)   # inactive slot
-ACTIVE_F  = RGBColor(0x40,0x58,0x72)   # existing active slot
-NEW_F     = RGBColor(0xFF,0x99,0x00)   # newly added slot
-BORDER    = RGBColor(0x33,0x55,0x77)
-WORD_F    = RGBColor(0x00,0xAA,0x55)   # existing end-of-word
-NEWWORD_F = RGBColor(0xFF,0xDD,0x00)   # new end-of-word
-ARROW_OLD = RGBColor(0x55,0x77,0x99)
-ARROW_NEW = RGBColor(0xFF,0x99,0x00)
-
-W, H = 13.33, 7.5
+SPARSE    = 'sparse' in OPTS or (len(ALPHA) > DENSE_MAX and 'dense' not in OPTS)
 
-# ── Node top-left positions (x, y) in inches ─────────────────────────────────
-# Layout mirrors the image: root/p/pe centered, then branch left (pec*) / right (pet*)
-POS = {
-    '':       (5.59, 0.28),
-    'p':      (5.59, 0.98),
-    'pe':     (5.59, 1.68),
-    'pec':    (0.70, 2.38),
-    'pet':    (8.70, 2.38),
-    'peck':   (0.70, 3.08),
-    'pete':   (8.00, 3.08),
-    'pets':   (10.50, 3.08),
-    'pecke':  (0.05, 3.78),
-    'pecks':  (2.10, 3.78),
-    'peter':  (8.00, 3.78),
-    'pecked': (0.05, 4.48),
-}
+# ── Box geometry (trie.py: BW, BH, CKW, GAPW, GAP; W, H) ─────────────────────
+NW   = len(ALPHA)*BW + CKW   # total node width ≈ 2.15 (dense)
+
+# ── Colors (trie.py's palette) ───────────────────────────────────────────────
+def rgb(color):
+    return RGBColor.from_string(color.lstrip('#'))
+
+NAVY      = rgb(trie.NAVY)
+TITLE_BAR = rgb(trie.TITLE_BAR)
+CYAN      = rgb(trie.CYAN)
+WHITE     = rgb(trie.WHITE)
+DIM       = rgb(trie.DIM)
+EMPTY_F   = rgb(trie.EMPTY_F)
+ACTIVE_F  = rgb(trie.ACTIVE_F)
+NEW_F     = rgb(trie.NEW_F)
+BORDER    = rgb(trie.BORDER)
+WORD_F    = rgb(trie.WORD_F)
+NEWWORD_F = rgb(trie.NEWWORD_F)
+ARROW_OLD = rgb(trie.ARROW_OLD)
+ARROW_NEW = rgb(trie.ARROW_NEW)
+
+# ── Build the trie, one event list per inserted word ─────────────────────────
+
+TRIE   = Trie(ALPHA, fold=str.upper)
+EVENTS = [TRIE.insert(w) for w in WORDS]
 
 # Parent edge: child_path -> (parent_path, edge_char)
-EDGE = {
-    'p':      ('',      'P'),
-    'pe':     ('p',     'E'),
-    'pec':    ('pe',    'C'),
-    'pet':    ('pe',    'T'),
-    'peck':   ('pec',   'K'),
-    'pete':   ('pet',   'E'),
-    'pets':   ('pet',   'S'),
-    'pecke':  ('peck',  'E'),
-    'pecks':  ('peck',  'S'),
-    'peter':  ('pete',  'R'),
-    'pecked': ('pecke', 'D'),
-}
-
-# ── Trie state at each step ───────────────────────────────────────────────────
-# State format: path -> {'active': set of chars with children, 'word': bool}
-# We track cumulative state + what's new each step.
-
-STEPS = [
-    {
-        'title':     'Before any insertions — empty root',
-        'sub':       'Alphabet: C D E K P R S T',
-        'new_nodes': [],
-        'new_words': [],
-    },
-    {
-        'title':     'Step 1 — Insert  "pet"',
-        'sub':       'Walk P → E → T, creating nodes as needed. Mark T node as end-of-word.',
-        'new_nodes': ['p', 'pe', 'pet'],
-        'new_words': ['pet'],
-    },
-    {
-        'title':     'Step 2 — Insert  "pets"',
-        'sub':       'P → E → T already exist. Add S child to the "pet" node.',
-        'new_nodes': ['pets'],
-        'new_words': ['pets'],
-    },
-    {
-        'title':     'Step 3 — Insert  "peter"',
-        'sub':       'P → E → T already exist. Add E child to "pet", then R child. Mark R node.',
-        'new_nodes': ['pete', 'peter'],
-        'new_words': ['peter'],
-    },
-    {
-        'title':     'Step 4 — Insert  "peck"',
-        'sub':       'P → E already exist. Add C child to "pe" node, then K. Mark K node.',
-        'new_nodes': ['pec', 'peck'],
-        'new_words': ['peck'],
-    },
-    {
-        'title':     'Step 5 — Insert  "pecked"',
-        'sub':       'P → E → C → K already exist. Add E child to "peck", then D. Mark D node.',
-        'new_nodes': ['pecke', 'pecked'],
-        'new_words': ['pecked'],
-    },
-    {
-        'title':     'Step 6 — Insert  "pecks"',
-        'sub':       'P → E → C → K already exist. Add S child to "peck". Mark S node.',
-        'new_nodes': ['pecks'],
-        'new_words': ['pecks'],
-    },
-    {
-        'title':     'Final Trie',
-        'sub':       'pet · pets · peter · peck · pecked · pecks',
-        'new_nodes': [],
-        'new_words': [],
-    },
-]
+EDGE = {ev[1]: (ev[2], ev[3])
+        for evs in EVENTS for ev in evs if ev[0] == 'node'}
+
+KIDS = children_index(ev for evs in EVENTS for ev in evs)
+
+# ── Node cells ────────────────────────────────────────────────────────────────
+# CELLS[path] = ([(letter or GAP, x offset, width), ...], checkmark x offset),
+# from trie.trie_cells().
+
+CELLS  = trie_cells(KIDS, ALPHA_IDX, SPARSE)
+NODE_W = {path: ck + CKW for path, (_, ck) in CELLS.items()}
+CELL_X = {path: {ch: x for ch, x, _ in c if ch != GAP} for path, (c, _) in CELLS.items()}
+
+# ── Node top-left positions (x, y) in inches ─────────────────────────────────
+# Laid out once from the final trie so nodes never move between slides.
+# The area left of the word list / legend column is available.
+POS = layout(KIDS, ALPHA_IDX, node_w=NODE_W if SPARSE else NW, gap=0.95, level_h=0.70,
+             x0=0.05, y0=0.28, max_w=10.0, max_h=H - 0.50 - 0.28)
+
+# ── Steps ─────────────────────────────────────────────────────────────────────
+# Each step lists only what it adds; step_states() carries the cumulative
+# state (nodes, words, parent→children index) forward one step at a time.
+
+STEPS = deck_steps(WORDS, EVENTS, ALPHA)
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
@@ -136,46 +113,54 @@ def add_text(slide, text, x, y, w, h, size=14, bold=False,
     r.text = text; r.font.size = Pt(size); r.font.bold = bold
     r.font.italic = italic; r.font.color.rgb = color; r.font.name = "Calibri"
 
+def add_swatch(slide, fill, x, y):
+    """Legend color sample."""
+    rect = slide.shapes.add_shape(1, Inches(x), Inches(y), Inches(0.30), Inches(0.26))
+    rect.fill.solid(); rect.fill.fore_color.rgb = fill
+    rect.line.color.rgb = BORDER; rect.line.width = Pt(0.5)
+
+def slot_style(ch, active, new_active):
+    """(fill, text color, bold) for the letter box of ch."""
+    if ch in new_active:
+        return NEW_F, NAVY, True
+    if ch in active:
+        return ACTIVE_F, WHITE, True
+    return EMPTY_F, DIM, False
+
+def check_style(is_word, new_word):
+    """(fill, symbol, text color) for the end-of-word box."""
+    if new_word:
+        return NEWWORD_F, "✓", NAVY
+    if is_word:
+        return WORD_F, "✓", WHITE
+    return EMPTY_F, " ", DIM
+
 def draw_node(slide, path, active, is_word, new_active=set(), new_word=False):
     x, y = POS[path]
-    for i, ch in enumerate(ALPHA):
-        bx = x + i * BW
+    draw_node_at(slide, x, y, active, is_word, new_active, new_word, CELLS[path])
+
+def draw_node_at(slide, x, y, active, is_word, new_active=set(), new_word=False,
+                 cells=None):
+    cells, ck = node_cells(ALPHA, ALPHA_IDX, SPARSE) if cells is None else cells
+    for ch, dx, cw in cells:
         rect = slide.shapes.add_shape(
-            1, Inches(bx), Inches(y), Inches(BW), Inches(BH))
+            1, Inches(x + dx), Inches(y), Inches(cw), Inches(BH))
         rect.line.color.rgb = BORDER
         rect.line.width = Pt(0.75)
-        if ch in new_active:
-            rect.fill.solid(); rect.fill.fore_color.rgb = NEW_F
-            tcol = NAVY
-        elif ch in active:
-            rect.fill.solid(); rect.fill.fore_color.rgb = ACTIVE_F
-            tcol = WHITE
-        else:
-            rect.fill.solid(); rect.fill.fore_color.rgb = EMPTY_F
-            tcol = DIM
-        tf = rect.text_frame
-        for m in (tf.margin_left, tf.margin_right,
-                  tf.margin_top, tf.margin_bottom):
-            pass  # can't zero margins via property easily; keep defaults
-        p = tf.paragraphs[0]; p.alignment = PP_ALIGN.CENTER
+        fill, tcol, bold = slot_style(ch, active, new_active)
+        rect.fill.solid(); rect.fill.fore_color.rgb = fill
+        p = rect.text_frame.paragraphs[0]; p.alignment = PP_ALIGN.CENTER
         r = p.add_run(); r.text = ch
-        r.font.size = Pt(8); r.font.bold = (ch in active or ch in new_active)
+        r.font.size = Pt(8); r.font.bold = bold
         r.font.color.rgb = tcol; r.font.name = "Courier New"
 
     # Checkmark box
-    bx = x + 8 * BW
+    bx = x + ck
     rect = slide.shapes.add_shape(
         1, Inches(bx), Inches(y), Inches(CKW), Inches(BH))
     rect.line.color.rgb = BORDER; rect.line.width = Pt(0.75)
-    if new_word:
-        rect.fill.solid(); rect.fill.fore_color.rgb = NEWWORD_F
-        sym, tcol = "✓", NAVY
-    elif is_word:
-        rect.fill.solid(); rect.fill.fore_color.rgb = WORD_F
-        sym, tcol = "✓", WHITE
-    else:
-        rect.fill.solid(); rect.fill.fore_color.rgb = EMPTY_F
-        sym, tcol = " ", DIM
+    fill, sym, tcol = check_style(is_word, new_word)
+    rect.fill.solid(); rect.fill.fore_color.rgb = fill
     tf = rect.text_frame
     p  = tf.paragraphs[0]; p.alignment = PP_ALIGN.CENTER
     r  = p.add_run(); r.text = sym
@@ -184,18 +169,22 @@ def draw_node(slide, path, active, is_word, new_active=set(), new_word=False):
 def char_cx(path, ch):
     """X center of the character box for ch in node at path."""
     x, _ = POS[path]
-    return x + ALPHA_IDX[ch] * BW + BW / 2
+    return x + CELL_X[path][ch] + BW / 2
 
-def draw_arrow(slide, parent_path, child_path, is_new):
+def arrow_ends(parent_path, child_path):
+    """(x1, y1, x2, y2): parent's letter box bottom → child's top center."""
     par_ch = EDGE[child_path][1]
     x1 = char_cx(parent_path, par_ch)
     px, py = POS[parent_path]
     y1 = py + BH
 
     cx, cy = POS[child_path]
-    x2 = cx + NW / 2
+    x2 = cx + NODE_W[child_path] / 2
     y2 = cy
+    return x1, y1, x2, y2
 
+def draw_arrow(slide, parent_path, child_path, is_new):
+    x1, y1, x2, y2 = arrow_ends(parent_path, child_path)
     color = ARROW_NEW if is_new else ARROW_OLD
     conn = slide.shapes.add_connector(
         MSO_CONNECTOR.STRAIGHT,
@@ -203,126 +192,286 @@ def draw_arrow(slide, parent_path, child_path, is_new):
     conn.line.color.rgb = color
     conn.line.width = Pt(1.8 if is_new else 1.2)
 
+# ── Fast XML emission ─────────────────────────────────────────────────────────
+# add_shape()/add_connector()/add_textbox() rescan every shape id on the slide
+# and then set fill, line and run properties one proxy call at a time, so big
+# tries spend almost all their time in the python-pptx object model.  The fast
+# path lets python-pptx draw one node, arrow, text box and legend swatch on a
+# scratch slide, keeps that XML as templates, and stamps deep copies straight
+# into the slide's spTree with ids, offsets, colors and text patched in.  Each
+# draw_*() returns the next free shape id so the following call on the same
+# slide can count on from it; looking the id up scans the whole slide.  The
+# slide XML is identical to the slow path (set FAST_XML = False to compare).
+
+FAST_XML = True
+
+def _index_path(root, el):
+    path = []
+    while el is not root:
+        parent = el.getparent()
+        path.append(parent.index(el))
+        el = parent
+    return path[::-1]
+
+def _follow(root, path):
+    for i in path:
+        root = root[i]
+    return root
+
+class Stamp:
+    """An XML template plus the locations of the elements to patch."""
+
+    def __init__(self, el, **points):
+        self.el    = el
+        self.paths = {k: _index_path(el, el.xpath(xp)[0]) for k, xp in points.items()}
+
+    def __call__(self):
+        el = deepcopy(self.el)
+        return el, {k: _follow(el, p) for k, p in self.paths.items()}
+
+_STAMPS = {}
+
+def stamps():
+    """Build (once) the letter-box, checkmark-box, arrow, text and swatch templates."""
+    if not _STAMPS:
+        scratch = Presentation()
+        sl = scratch.slides.add_slide(scratch.slide_layouts[6])
+        draw_node_at(sl, 0.0, 0.0, set(), False, cells=([(ALPHA[0], 0.0, BW)], BW))
+        conn = sl.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, 0, 0, 1, 1)
+        conn.line.color.rgb = ARROW_OLD; conn.line.width = Pt(1.2)
+        add_text(sl, " ", 0.0, 0.0, 1.0, 1.0)
+        add_swatch(sl, EMPTY_F, 0.0, 0.0)
+        shapes = [sh._element for sh in sl.shapes]
+        box = dict(id='.//p:cNvPr', off='.//a:off', ext='.//a:ext',
+                   fill='./p:spPr/a:solidFill/a:srgbClr',
+                   rpr='.//a:rPr', tcol='.//a:rPr/a:solidFill/a:srgbClr', t='.//a:t')
+        _STAMPS['box']   = Stamp(shapes[0], **box)
+        _STAMPS['check'] = Stamp(shapes[1], **box)
+        _STAMPS['arrow'] = Stamp(shapes[2], id='.//p:cNvPr', xfrm='.//a:xfrm',
+                                 off='.//a:off', ext='.//a:ext', ln='.//a:ln',
+                                 col='.//a:ln/a:solidFill/a:srgbClr')
+        _STAMPS['text']  = Stamp(shapes[3], id='.//p:cNvPr', off='.//a:off', ext='.//a:ext',
+                                 ppr='.//a:pPr', rpr='.//a:rPr',
+                                 col='.//a:rPr/a:solidFill/a:srgbClr', t='.//a:t')
+        _STAMPS['swatch'] = Stamp(shapes[4], id='.//p:cNvPr', off='.//a:off',
+                                  fill='./p:spPr/a:solidFill/a:srgbClr')
+    return _STAMPS
+
+def _canvas(slide, id_):
+    """
+    (emit, first id) for stamping into slide.  emit(el) adds a shape where
+    python-pptx would, before any p:extLst, without searching the slide for
+    it every time; id_ None means look up the next free id.
+    """
+    tree = slide.shapes._spTree
+    ext  = tree.find(qn('p:extLst'))
+    return (tree.append if ext is None else ext.addprevious,
+            slide.shapes._next_shape_id if id_ is None else id_)
+
+def _stamp_box(stamp, id_, x, y, fill, tcol, text):
+    el, at = stamp()
+    at['id'].set('id', str(id_)); at['id'].set('name', 'Rectangle %d' % (id_ - 1))
+    at['off'].set('x', str(Inches(x))); at['off'].set('y', str(Inches(y)))
+    at['fill'].set('val', str(fill))
+    at['tcol'].set('val', str(tcol))
+    at['t'].text = text
+    return el, at
+
+def draw_nodes(slide, nodes, id_=None):
+    """
+    Draw many nodes at once; returns the next free shape id (None when
+    FAST_XML is off), to pass as id_ to the next draw_*() on the slide.
+    nodes : iterable of (path, active, is_word, new_active, new_word)
+    """
+    if not FAST_XML:
+        for args in nodes:
+            draw_node(slide, *args)
+        return
+    st        = stamps()
+    emit, id_ = _canvas(slide, id_)
+    gap_cx = str(Inches(GAPW))
+    for path, active, is_word, new_active, new_word in nodes:
+        x, y = POS[path]
+        cells, ck = CELLS[path]
+        for ch, dx, cw in cells:
+            fill, tcol, bold = slot_style(ch, active, new_active)
+            el, at = _stamp_box(st['box'], id_, x + dx, y, fill, tcol, ch)
+            at['rpr'].set('b', '1' if bold else '0')
+            if ch == GAP:
+                at['ext'].set('cx', gap_cx)
+            emit(el); id_ += 1
+        fill, sym, tcol = check_style(is_word, new_word)
+        el, _ = _stamp_box(st['check'], id_, x + ck, y, fill, tcol, sym)
+        emit(el); id_ += 1
+    return id_
+
+def draw_arrows(slide, arrows, id_=None):
+    """
+    Draw many parent→child arrows at once; returns the next free shape id
+    like draw_nodes().
+    arrows : iterable of (parent_path, child_path, is_new)
+    """
+    if not FAST_XML:
+        for args in arrows:
+            draw_arrow(slide, *args)
+        return
+    st        = stamps()
+    emit, id_ = _canvas(slide, id_)
+    for par, child, is_new in arrows:
+        bx, by, ex, ey = (Inches(v) for v in arrow_ends(par, child))
+        el, at = st['arrow']()
+        at['id'].set('id', str(id_)); at['id'].set('name', 'Connector %d' % (id_ - 1))
+        if bx > ex: at['xfrm'].set('flipH', '1')
+        if by > ey: at['xfrm'].set('flipV', '1')
+        at['off'].set('x', str(min(bx, ex))); at['off'].set('y', str(min(by, ey)))
+        at['ext'].set('cx', str(abs(ex - bx))); at['ext'].set('cy', str(abs(ey - by)))
+        at['ln'].set('w', str(Pt(1.8 if is_new else 1.2)))
+        at['col'].set('val', str(ARROW_NEW if is_new else ARROW_OLD))
+        emit(el); id_ += 1
+    return id_
+
+def _stamp_text(stamp, id_, text, x, y, w, h, size=14, bold=False,
+                color=WHITE, align=PP_ALIGN.LEFT, italic=False):
+    """add_text()'s text box as XML."""
+    el, at = stamp()
+    at['id'].set('id', str(id_)); at['id'].set('name', 'TextBox %d' % (id_ - 1))
+    at['off'].set('x', str(Inches(x))); at['off'].set('y', str(Inches(y)))
+    at['ext'].set('cx', str(Inches(w))); at['ext'].set('cy', str(Inches(h)))
+    at['ppr'].set('algn', PP_ALIGN.to_xml(align))
+    at['rpr'].set('sz', str(Pt(size).centipoints))
+    at['rpr'].set('b', '1' if bold else '0'); at['rpr'].set('i', '1' if italic else '0')
+    at['col'].set('val', str(color))
+    at['t'].text = text
+    return el
+
+def draw_texts(slide, texts, id_=None):
+    """
+    Add many text boxes at once; returns the next free shape id like
+    draw_nodes().
+    texts : iterable of (text, x, y, w, h, style), style a dict of add_text()'s
+            keyword arguments
+    """
+    if not FAST_XML:
+        for text, x, y, w, h, style in texts:
+            add_text(slide, text, x, y, w, h, **style)
+        return
+    st        = stamps()
+    emit, id_ = _canvas(slide, id_)
+    for text, x, y, w, h, style in texts:
+        emit(_stamp_text(st['text'], id_, text, x, y, w, h, **style)); id_ += 1
+    return id_
+
+def draw_swatches(slide, swatches, id_=None):
+    """
+    Add many legend swatches at once; returns the next free shape id like
+    draw_nodes().
+    swatches : iterable of (fill, x, y)
+    """
+    if not FAST_XML:
+        for args in swatches:
+            add_swatch(slide, *args)
+        return
+    st        = stamps()
+    emit, id_ = _canvas(slide, id_)
+    for fill, x, y in swatches:
+        el, at = st['swatch']()
+        at['id'].set('id', str(id_)); at['id'].set('name', 'Rectangle %d' % (id_ - 1))
+        at['off'].set('x', str(Inches(x))); at['off'].set('y', str(Inches(y)))
+        at['fill'].set('val', str(fill))
+        emit(el); id_ += 1
+    return id_
+
 def draw_label(slide, path, label_text, is_new):
     x, y = POS[path]
     col = NEW_F if is_new else DIM
     add_text(slide, '"' + label_text + '"',
-             x + NW + 0.05, y, 0.9, BH+0.02,
+             x + NODE_W[path] + 0.05, y, 0.9, BH+0.02,
              size=9, color=col, italic=True)
 
 # ── Legend helper ─────────────────────────────────────────────────────────────
 
-def draw_legend(slide):
+def draw_legend(slide, id_=None):
     lx, ly = 10.9, 5.45
-    add_text(slide, "Legend", lx, ly, 2.1, 0.35, size=13, bold=True, color=CYAN)
     items = [
         (ACTIVE_F, WHITE, "existing child"),
         (NEW_F,    NAVY,  "new this step"),
         (WORD_F,   WHITE, "word ✓ (existing)"),
         (NEWWORD_F,NAVY,  "word ✓ (new)"),
     ]
+    texts    = [("Legend", lx, ly, 2.1, 0.35, dict(size=13, bold=True, color=CYAN))]
+    swatches = []
     for i, (fill, tc, label) in enumerate(items):
         bx, by = lx, ly + 0.40 + i * 0.38
-        rect = slide.shapes.add_shape(1, Inches(bx), Inches(by),
-                                      Inches(0.30), Inches(0.26))
-        rect.fill.solid(); rect.fill.fore_color.rgb = fill
-        rect.line.color.rgb = BORDER; rect.line.width = Pt(0.5)
-        add_text(slide, label, bx + 0.36, by - 0.02, 1.75, 0.30,
-                 size=11, color=WHITE)
-
-# ── Build cumulative state ────────────────────────────────────────────────────
-
-def build_state(up_to_step):
-    """
-    Returns (all_nodes, word_nodes, new_nodes_this_step, new_words_this_step).
-    all_nodes: set of paths that exist
-    word_nodes: set of paths marked as words
-    """
-    all_nodes  = {''}
-    word_nodes = set()
-    new_nodes  = set()
-    new_words  = set()
-    for i, step in enumerate(STEPS):
-        if i == 0:
-            continue  # step 0 = empty root
-        all_nodes.update(step['new_nodes'])
-        word_nodes.update(step['new_words'])
-        if i == up_to_step:
-            new_nodes = set(step['new_nodes'])
-            new_words = set(step['new_words'])
-        if i >= up_to_step:
-            break
-    return all_nodes, word_nodes, new_nodes, new_words
-
-def active_chars(path, all_nodes):
-    """Return set of chars for which a child of path exists in all_nodes."""
-    result = set()
-    for child, (par, ch) in EDGE.items():
-        if par == path and child in all_nodes:
-            result.add(ch)
-    return result
+        swatches.append((fill, bx, by))
+        texts.append((label, bx + 0.36, by - 0.02, 1.75, 0.30, dict(size=11, color=WHITE)))
+    return draw_texts(slide, texts, draw_swatches(slide, swatches, id_))
 
 # ── Build slides ──────────────────────────────────────────────────────────────
 
-for step_idx, step in enumerate(STEPS):
-    s = prs.slides.add_slide(blank)
-    set_bg(s)
-
-    # Title bar
-    rect = s.shapes.add_shape(1, Inches(0), Inches(0), Inches(W), Inches(0.60))
-    rect.fill.solid(); rect.fill.fore_color.rgb = RGBColor(0x07,0x14,0x22)
-    rect.line.fill.background()
-    add_text(s, step['title'], 0.25, 0.04, 9.0, 0.52,
-             size=24, bold=True, color=CYAN)
-    add_text(s, step['sub'],   0.25, 0.04, 12.8, 0.52,
-             size=13, color=DIM, align=PP_ALIGN.RIGHT, italic=True)
-
-    all_nodes, word_nodes, new_nodes, new_words = build_state(step_idx)
-
-    # Draw all edges first (under nodes)
-    for child in all_nodes:
-        if child == '':
-            continue
-        par = EDGE[child][0]
-        is_new = child in new_nodes
-        draw_arrow(s, par, child, is_new)
-
-    # Draw all nodes
-    for path in all_nodes:
-        ac  = active_chars(path, all_nodes)
-        nac = {ch for child, (par, ch) in EDGE.items()
-               if par == path and child in new_nodes}
-        iw  = path in word_nodes
-        nw  = path in new_words
-        draw_node(s, path, ac, iw, new_active=nac, new_word=nw)
-
-    # Path label above root
-    add_text(s, 'root', POS[''][0] - 0.55, POS[''][1] - 0.01,
-             0.52, BH, size=10, color=DIM, align=PP_ALIGN.RIGHT)
-
-    # Word list on the right
-    add_text(s, "Words", 11.25, 0.70, 1.85, 0.38, size=14, bold=True, color=CYAN)
-    word_list = ['pet','pets','peter','peck','pecked','pecks']
-    inserted  = set()
-    for i2 in range(1, step_idx + 1):
-        inserted.update(STEPS[i2]['new_words'])
-    for wi, w in enumerate(word_list):
-        col  = (NEW_F if w in new_words else
-                WHITE if w in inserted else DIM)
-        bold = w in inserted
-        add_text(s, ("✓ " if w in inserted else "  ") + w,
-                 11.20, 1.08 + wi * 0.50, 1.95, 0.46,
-                 size=15, bold=bold, color=col,
-                 align=PP_ALIGN.LEFT)
-
-    # Alphabet key
-    add_text(s, "Alphabet:", 11.20, 4.25, 1.95, 0.36, size=11, color=DIM)
-    add_text(s, " · ".join(ALPHA), 11.20, 4.55, 1.95, 0.36,
-             size=11, color=DIM, align=PP_ALIGN.LEFT)
-
-    draw_legend(s)
+def build_deck():
+    prs = Presentation()
+    prs.slide_width  = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+    blank = prs.slide_layouts[6]
+
+    # Word list column: shrink the row pitch when there are many words
+    wdy = min(0.50, 3.10 / max(len(WORDS), 1))
+
+    states = step_states(STEPS, EDGE)
+    for step_idx, step in enumerate(STEPS):
+        all_nodes, word_nodes, new_nodes, new_words, active, new_active = next(states)
+        s = prs.slides.add_slide(blank)
+        set_bg(s)
+
+        # Title bar
+        rect = s.shapes.add_shape(1, Inches(0), Inches(0), Inches(W), Inches(0.60))
+        rect.fill.solid(); rect.fill.fore_color.rgb = TITLE_BAR
+        rect.line.fill.background()
+        # one shape id counter per slide, handed from draw_*() to draw_*()
+        ids = draw_texts(s, [
+            (step['title'], 0.25, 0.04, 9.0, 0.52, dict(size=24, bold=True, color=CYAN)),
+            (step['sub'],   0.25, 0.04, 12.8, 0.52,
+             dict(size=13, color=DIM, align=PP_ALIGN.RIGHT, italic=True)),
+        ])
+
+        # Draw all edges first (under nodes)
+        ids = draw_arrows(s, [(EDGE[child][0], child, child in new_nodes)
+                              for child in all_nodes if child != ''], ids)
+
+        # Draw all nodes
+        ids = draw_nodes(s, [(path, active[path], path in word_nodes,
+                              new_active.get(path, set()), path in new_words)
+                             for path in all_nodes], ids)
+
+        # Path label above root
+        texts = [('root', POS[''][0] - 0.55, POS[''][1] - 0.01, 0.52, BH,
+                  dict(size=10, color=DIM, align=PP_ALIGN.RIGHT))]
+
+        # Word list on the right
+        texts.append(("Words", 11.25, 0.70, 1.85, 0.38, dict(size=14, bold=True, color=CYAN)))
+        inserted  = word_nodes
+        for wi, w in enumerate(WORDS):
+            col  = (NEW_F if w in new_words else
+                    WHITE if w in inserted else DIM)
+            bold = w in inserted
+            texts.append((("✓ " if w in inserted else "  ") + w,
+                          11.20, 1.08 + wi * wdy, 1.95, wdy - 0.04,
+                          dict(size=15 if wdy >= 0.50 else 11, bold=bold, color=col,
+                               align=PP_ALIGN.LEFT)))
+
+        # Alphabet key
+        texts.append(("Alphabet:", 11.20, 4.25, 1.95, 0.36, dict(size=11, color=DIM)))
+        texts.append((alpha_key(ALPHA, SPARSE), 11.20, 4.55, 1.95, 0.36,
+                      dict(size=11, color=DIM, align=PP_ALIGN.LEFT)))
+        ids = draw_texts(s, texts, ids)
+
+        draw_legend(s, ids)
+
+    return prs
 
 # ── Save ─────────────────────────────────────────────────────────────────────
-out = '/Users/griffin/__currentCourses/5243-Algorithms/Lectures/Tries/trie_build_steps.pptx'
-prs.save(out)
-print("Saved:", out)
+
+if __name__ == '__main__':
+    out = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trie_build_steps.pptx')
+    build_deck().save(out)
+    print("Saved:", out)
@@ -0,0 +1,271 @@
+"""
+parallel_trie.py
+----------------
+Build one trie.Trie over many word files with a process pool.
+
+    1. scan the files in parallel: the alphabet, and each file's distinct
+       words bucketed by first letter
+    2. cut the letters into contiguous ranges ("A-C", "D-F", ...) of about
+       equal weight — one shard per range
+    3. each worker gets its letters' buckets, builds a Trie and returns it
+       serialized (below); the parent splices every shard's top-level
+       subtrees into the root slots they came from
+
+Sub-tries under different first characters never touch, so the splice is
+just pointer assignment and the result is identical to a serial build —
+serialize() of both roots compares equal.
+
+Serialized form: one array('B') (array('H') for alphabets over 255
+letters), preorder, per node
+
+    word_flag, n_children, slot_1 ... slot_n
+
+about 2–3 bytes per node.
+
+    trie = build_parallel(word_files(), shards=8, fold=str.upper)
+
+Run this file to compare against a serial build:
+
+    python parallel_trie.py                  # every word file in the repo
+    python parallel_trie.py 1 2 4 8          # shard (= worker) counts to try
+
+On a machine with fewer cores than shards the demo also projects the
+wall time from per-task timings.
+"""
+
+import gc
+import os
+import sys
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+
+from trie import Trie, TrieNode
+from trie_utils import iter_words, word_files
+
+
+# ── serialization ─────────────────────────────────────────────────────────────
+
+def _typecode(width):
+    return "B" if width <= 256 else "H"
+
+
+def serialize(node, width):
+    """Preorder bytes of node's subtree (see module docstring)."""
+    out = array(_typecode(width))
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        kids = [s for s, c in enumerate(node.slots) if c is not None]
+        out.append(node.word)
+        out.append(len(kids))
+        out.extend(kids)
+        stack.extend(node.slots[s] for s in reversed(kids))
+    return out.tobytes()
+
+
+def deserialize(data, width):
+    """Inverse of serialize().  Returns (root, nodes, words)."""
+    a = array(_typecode(width))
+    a.frombytes(data)
+    root = None
+    nodes = words = 0
+    i = 0
+    targets = [None]                  # (parent, slot) the next node hangs from
+    pop, push = targets.pop, targets.append
+    while targets:
+        t = pop()
+        node = TrieNode(width)
+        if a[i]:
+            node.word = True
+            words += 1
+        k = a[i + 1]
+        if t is None:
+            root = node
+        else:
+            t[0].slots[t[1]] = node
+        for j in range(i + 1 + k, i + 1, -1):
+            push((node, a[j]))
+        i += 2 + k
+        nodes += 1
+    return root, nodes, words
+
+
+@contextmanager
+def _no_gc():
+    """
+    Pause the cyclic GC while allocating hundreds of thousands of nodes.
+    Tries hold no cycles, so every collection it would run here is wasted
+    work (it costs a serial build about a fifth of its time).
+    """
+    was = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was:
+            gc.enable()
+
+
+# ── sharded build ─────────────────────────────────────────────────────────────
+
+def _new_trie(words, fold):
+    """Empty Trie whose alphabet is every (folded) character in words."""
+    chars = set().union(*words)
+    return Trie(sorted({fold(c) for c in chars} if fold else chars), fold=fold)
+
+
+def _scan(path, fold):
+    """
+    Characters used in path, and its distinct words bucketed by (folded)
+    first letter: {letter: "\\n"-joined words}, one string per bucket so it
+    pickles in one piece.
+    """
+    chars, buckets = set(), {}
+    for w in set(iter_words(path)):
+        chars.update(w)
+        buckets.setdefault(fold(w[0]) if fold else w[0], []).append(w)
+    return chars, {ch: "\n".join(ws) for ch, ws in buckets.items()}
+
+
+def _gather(scans):
+    """Merge _scan results: (chars, {letter: [bucket, ...]}, weight per letter)."""
+    chars, buckets, weight = set(), {}, Counter()
+    for c, b in scans:
+        chars |= c
+        for ch, block in b.items():
+            buckets.setdefault(ch, []).append(block)
+            weight[ch] += len(block)
+    return chars, buckets, weight
+
+
+def _build_shard(blocks, alphabet, fold):
+    """Insert the words of one shard's buckets (from _scan), serialize."""
+    t = Trie(alphabet, fold=fold)
+    words = set()
+    for block in blocks:
+        words.update(block.split("\n"))
+    with _no_gc():
+        for w in words:
+            t.insert(w)
+    return serialize(t.root, len(alphabet))
+
+
+def plan_shards(alphabet, weight, shards):
+    """
+    Cut the alphabet into at most `shards` contiguous first-letter ranges
+    of roughly equal weight (characters to insert).  Returns [set, ...].
+    """
+    target = sum(weight.values()) / max(1, shards)
+    groups, cur, acc = [], set(), 0
+    for ch in alphabet:
+        wt = weight.get(ch, 0)
+        if not wt:
+            continue
+        if cur and acc + wt / 2 > target * (len(groups) + 1):
+            groups.append(cur)
+            cur = set()
+        cur.add(ch)
+        acc += wt
+    if cur:
+        groups.append(cur)
+    return groups
+
+
+def build_parallel(paths, shards=8, workers=None, fold=None):
+    """
+    Trie over every word in paths, built shard-by-shard in a process pool.
+
+    Each file is read and parsed once: a first pass (one task per file)
+    collects the alphabet and buckets the file's words by first letter, and
+    each shard task gets only the buckets of its letters, so the workers
+    just insert.  The parent routes the buckets without splitting them.
+    Shards are deserialized as they finish, overlapping with the ones still
+    building.
+    """
+    paths = list(paths)
+    with ProcessPoolExecutor(max_workers=workers or shards) as pool, _no_gc():
+        chars, buckets, weight = _gather(pool.map(_scan, paths, [fold] * len(paths)))
+        trie = Trie(sorted({fold(c) for c in chars} if fold else chars), fold=fold)
+        width = len(trie.alphabet)
+        futures = [pool.submit(_build_shard, [b for ch in sorted(letters) for b in buckets[ch]],
+                               trie.alphabet, fold)
+                   for letters in plan_shards(trie.alphabet, weight, shards)]
+        for fut in as_completed(futures):
+            sub, nodes, n_words = deserialize(fut.result(), width)
+            for s, child in enumerate(sub.slots):
+                if child is not None:
+                    trie.root.slots[s] = child
+            trie.nodes += nodes - 1
+            trie.size  += n_words
+    return trie
+
+
+def build_serial(paths, fold=None):
+    """The same trie in one process (same de-duplication and GC pause)."""
+    words = list({w for p in paths for w in iter_words(p)})
+    trie = _new_trie(words, fold)
+    with _no_gc():
+        for w in words:
+            trie.insert(w)
+    return trie
+
+
+def projected(paths, shards, fold=None):
+    """
+    Wall time build_parallel() would take with one core per shard, from
+    timing each task in this process: the slowest scan, the slowest shard,
+    and the parent's deserialize/splice of every shard (the serial part).
+    """
+    clock = time.perf_counter
+    scans, results = [], []
+    for p in paths:
+        t0 = clock()
+        results.append(_scan(p, fold))
+        scans.append(clock() - t0)
+    chars, buckets, weight = _gather(results)
+    alphabet = sorted({fold(c) for c in chars} if fold else chars)
+    builds, splice = [], 0.0
+    for letters in plan_shards(alphabet, weight, shards):
+        blocks = [b for ch in sorted(letters) for b in buckets[ch]]
+        t0 = clock()
+        data = _build_shard(blocks, alphabet, fold)
+        builds.append(clock() - t0)
+        t0 = clock()
+        with _no_gc():
+            deserialize(data, len(alphabet))
+        splice += clock() - t0
+    scan_wall = max(scans) if shards >= len(paths) else sum(scans) / shards
+    return scan_wall + max(builds) + splice, splice
+
+
+if __name__ == "__main__":
+    counts = [int(a) for a in sys.argv[1:]] or [1, 2, 4, 8]
+    paths = word_files()
+    total = sum(1 for p in paths for _ in iter_words(p))
+    print(f"{len(paths)} files, {total:,} words, {os.cpu_count()} CPU(s)\n")
+
+    t0 = time.perf_counter()
+    serial = build_serial(paths, fold=str.upper)
+    base = time.perf_counter() - t0
+    ref = serialize(serial.root, len(serial.alphabet))
+    print(f"serial       {base:6.2f} s   {serial.size:,} words, {serial.nodes:,} nodes, "
+          f"{len(ref) / 1e6:.2f} MB serialized")
+    del serial
+
+    cpus = os.cpu_count() or 1
+    for n in counts:
+        t0 = time.perf_counter()
+        t = build_parallel(paths, shards=n, workers=n, fold=str.upper)
+        secs = time.perf_counter() - t0
+        same = serialize(t.root, len(t.alphabet)) == ref
+        del t
+        line = f"{n:>2} shards    {secs:6.2f} s   {base / secs:4.2f}x   identical: {same}"
+        if n > cpus:
+            # not enough cores to see the speedup; project it from task times
+            est, splice = projected(paths, n, fold=str.upper)
+            line += (f"   (with {n} cores: ~{est:.2f} s, {base / est:.2f}x; "
+                     f"serial splice {splice:.2f} s)")
+        print(line)
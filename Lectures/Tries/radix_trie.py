@@ -0,0 +1,247 @@
+"""
+radix_trie.py
+-------------
+Compressed (radix / PATRICIA-style) trie for large word lists such as
+dictionary.txt (134,688 words).
+
+A dict-of-dicts trie spends a dict per character; here every chain of
+single-child nodes collapses into one edge, and nothing is a Python object
+per node:
+
+    buf          one shared bytearray; each edge label is buf[start:end]
+    start, end   array('I')   label slice of the edge entering the node
+    child, sib   array('i')   first child / next sibling (-1 = none), siblings
+                              kept sorted by the label's first byte
+    count        array('I')   number of words in the node's subtree
+    word         bytearray    1 if the path to the node spells a word
+
+Node 0 is the root (empty label).  Words are stored as UTF-8, so enumeration
+order is byte order (the same as str order for ASCII).
+
+Run this file to benchmark it against DictTrie, set and a bisect-searched
+sorted list:
+
+    python radix_trie.py                     # Lectures/Tries/dictionary.txt
+    python radix_trie.py path/to/words.txt
+"""
+
+import random
+import sys
+from array import array
+
+from trie_utils import DICTIONARY, DictTrie, SortedWords, load_words, measure, throughput
+
+
+class RadixTrie:
+    def __init__(self, words=()):
+        self.buf   = bytearray()
+        self.start = array("I", [0])
+        self.end   = array("I", [0])
+        self.child = array("i", [-1])
+        self.sib   = array("i", [-1])
+        self.count = array("I", [0])
+        self.word  = bytearray(1)
+        for w in words:
+            self.insert(w)
+
+    def __len__(self):
+        return self.count[0]
+
+    @property
+    def nodes(self):
+        return len(self.start)
+
+    def nbytes(self):
+        """Bytes held by the node arrays and the label buffer."""
+        arrays = (self.start, self.end, self.child, self.sib, self.count)
+        return sum(a.itemsize * len(a) for a in arrays) + len(self.word) + len(self.buf)
+
+    # ── construction ─────────────────────────────────────────────────────────
+
+    def _new_node(self, start, end):
+        self.start.append(start)
+        self.end.append(end)
+        self.child.append(-1)
+        self.sib.append(-1)
+        self.count.append(0)
+        self.word.append(0)
+        return len(self.start) - 1
+
+    def _link(self, parent, node):
+        """Insert node into parent's child list, keeping first bytes sorted."""
+        buf, start, sib = self.buf, self.start, self.sib
+        key = buf[start[node]]
+        prev, cur = -1, self.child[parent]
+        while cur != -1 and buf[start[cur]] < key:
+            prev, cur = cur, sib[cur]
+        sib[node] = cur
+        if prev == -1:
+            self.child[parent] = node
+        else:
+            sib[prev] = node
+
+    def _find_child(self, node, b):
+        buf, start, sib = self.buf, self.start, self.sib
+        cur = self.child[node]
+        while cur != -1:
+            first = buf[start[cur]]
+            if first == b:
+                return cur
+            if first > b:
+                return -1
+            cur = sib[cur]
+        return -1
+
+    def insert(self, word):
+        """Insert word; returns True if it was not already present."""
+        w = word.encode("utf-8")
+        buf, start, end = self.buf, self.start, self.end
+        node, i, n = 0, 0, len(w)
+        path = [0]
+        while i < n:
+            c = self._find_child(node, w[i])
+            if c == -1:
+                # new leaf: its label is the rest of the word, appended to buf
+                leaf = self._new_node(len(buf), len(buf) + n - i)
+                buf += w[i:]
+                self._link(node, leaf)
+                node = leaf
+                path.append(leaf)
+                break
+            s, e = start[c], end[c]
+            k = 1
+            lim = min(e - s, n - i)
+            while k < lim and buf[s + k] == w[i + k]:
+                k += 1
+            if k < e - s:
+                # split the edge: mid takes the shared part, c keeps the rest
+                mid = self._new_node(s, s + k)
+                self.count[mid] = self.count[c]
+                self._replace_child(node, c, mid)
+                start[c] = s + k
+                self.sib[c] = -1
+                self.child[mid] = c
+                c = mid
+            node = c
+            i += k
+            path.append(node)
+        if self.word[node]:
+            return False
+        self.word[node] = 1
+        count = self.count
+        for p in path:
+            count[p] += 1
+        return True
+
+    def _replace_child(self, parent, old, new):
+        sib = self.sib
+        sib[new] = sib[old]
+        if self.child[parent] == old:
+            self.child[parent] = new
+            return
+        cur = self.child[parent]
+        while sib[cur] != old:
+            cur = sib[cur]
+        sib[cur] = new
+
+    # ── queries ──────────────────────────────────────────────────────────────
+
+    def _locate(self, w):
+        """
+        Walk the bytes w.  Returns (node, consumed) where consumed is the
+        number of bytes of node's path (≥ len(w) if w ends inside node's
+        edge), or (-1, 0) if no stored word starts with w.
+        """
+        buf, start, end, child, sib = self.buf, self.start, self.end, self.child, self.sib
+        node, i, n = 0, 0, len(w)
+        while i < n:
+            b = w[i]
+            c = child[node]
+            while c != -1 and buf[start[c]] < b:      # siblings sorted by first byte
+                c = sib[c]
+            if c == -1 or buf[start[c]] != b:
+                return -1, 0
+            s, e = start[c], end[c]
+            if e - s > 1 and not w.startswith(buf[s:min(e, s + n - i)], i):
+                return -1, 0
+            node = c
+            i += e - s
+        return node, i
+
+    def __contains__(self, word):
+        w = word.encode("utf-8")
+        node, consumed = self._locate(w)
+        return node != -1 and consumed == len(w) and self.word[node] == 1
+
+    def count_prefix(self, prefix):
+        """Number of stored words starting with prefix — O(len(prefix))."""
+        node, _ = self._locate(prefix.encode("utf-8"))
+        return 0 if node == -1 else self.count[node]
+
+    def starts_with(self, prefix):
+        """Yield every stored word starting with prefix, in byte order."""
+        w = prefix.encode("utf-8")
+        node, consumed = self._locate(w)
+        if node == -1:
+            return
+        # the path spelled to `node` may run past the end of the prefix
+        head = w + self.buf[self.end[node] - (consumed - len(w)):self.end[node]]
+        yield from self._walk(node, bytes(head))
+
+    def __iter__(self):
+        return self._walk(0, b"")
+
+    def _walk(self, node, head):
+        buf, start, end, child, sib, word = (
+            self.buf, self.start, self.end, self.child, self.sib, self.word)
+        stack = [(node, head)]
+        while stack:
+            node, head = stack.pop()
+            if word[node]:
+                yield head.decode("utf-8")
+            kids = []
+            c = child[node]
+            while c != -1:
+                kids.append(c)
+                c = sib[c]
+            for c in reversed(kids):
+                stack.append((c, head + buf[start[c]:end[c]]))
+
+
+# ── benchmark ─────────────────────────────────────────────────────────────────
+
+def benchmark(path=DICTIONARY, probes=50_000, seed=5243):
+    """Print bytes/word, build time and query throughput for each structure."""
+    words = load_words(path)
+    n = len(set(words))
+    rng = random.Random(seed)
+    hits   = rng.sample(words, min(probes, len(words)))
+    misses = [w[:-1] + "#" for w in hits]
+    prefixes = [w[:3] for w in hits[:5_000]]
+
+    builders = [
+        ("RadixTrie",    lambda: RadixTrie(load_words(path))),
+        ("DictTrie",     lambda: DictTrie(load_words(path))),
+        ("set",          lambda: set(load_words(path))),
+        ("sorted+bisect", lambda: SortedWords(load_words(path))),
+    ]
+    print(f"{path}: {len(words):,} lines, {n:,} distinct words\n")
+    print(f"{'structure':<14}{'build s':>9}{'bytes/word':>12}{'hit/s':>12}"
+          f"{'miss/s':>12}{'prefix cnt/s':>14}")
+    for name, build in builders:
+        s, secs, retained, _ = measure(build)
+        hit  = throughput(s.__contains__, hits)
+        miss = throughput(s.__contains__, misses)
+        if isinstance(s, set):
+            pcount = throughput(lambda p: sum(1 for w in s if w.startswith(p)), prefixes[:20])
+        else:
+            pcount = throughput(s.count_prefix, prefixes)
+        print(f"{name:<14}{secs:>9.2f}{retained / n:>12.1f}{hit:>12,.0f}"
+              f"{miss:>12,.0f}{pcount:>14,.0f}")
+        if isinstance(s, RadixTrie):
+            print(f"{'':<14}{s.nodes:,} nodes, {s.nbytes() / n:.1f} bytes/word in arrays")
+        del s
+
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else DICTIONARY)
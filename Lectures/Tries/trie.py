@@ -0,0 +1,405 @@
+"""
+trie.py
+-------
+Fixed-slot Trie used by the lecture deck generators.
+
+Every node owns one child slot per alphabet letter (the same layout the
+slides draw: one box per letter plus an end-of-word box) and a word flag.
+insert() reports exactly what it changed as a list of events, so a deck
+generator can animate any word list instead of hard-coding the steps:
+
+    ("node", path, parent_path, ch)   a new child was created under parent
+    ("word", path)                    path was marked as end-of-word
+
+`path` is the prefix spelled from the root (root = ""), `ch` the alphabet
+letter of the slot the child hangs from.
+
+Example
+-------
+    t = Trie("CDEKPRST", fold=str.upper)
+    t.insert("pet")
+    # [("node", "p", "", "P"), ("node", "pe", "p", "E"),
+    #  ("node", "pet", "pe", "T"), ("word", "pet")]
+"""
+
+
+class TrieNode:
+    __slots__ = ("slots", "word")
+
+    def __init__(self, width):
+        self.slots = [None] * width     # one child per alphabet letter
+        self.word  = False
+
+
+class Trie:
+    def __init__(self, alphabet, fold=None):
+        """
+        alphabet : sequence of single-character letters; slot i holds alphabet[i]
+        fold     : optional per-character normalizer applied before the slot
+                   lookup (e.g. str.upper for a case-insensitive trie)
+        """
+        self.alphabet = list(alphabet)
+        self.index    = {c: i for i, c in enumerate(self.alphabet)}
+        self.fold     = fold
+        self.root     = TrieNode(len(self.alphabet))
+        self.size     = 0               # number of stored words
+        self.nodes    = 1               # number of nodes, root included
+
+    def slot(self, ch):
+        """Slot index of ch; ValueError if ch is not in the alphabet."""
+        key = self.fold(ch) if self.fold else ch
+        try:
+            return self.index[key]
+        except KeyError:
+            raise ValueError(f"{ch!r} is not in the trie alphabet") from None
+
+    def insert(self, word):
+        """Insert word and return the list of events it produced."""
+        events = []
+        node   = self.root
+        for i, ch in enumerate(word):
+            s = self.slot(ch)
+            child = node.slots[s]
+            if child is None:
+                child = node.slots[s] = TrieNode(len(self.alphabet))
+                self.nodes += 1
+                events.append(("node", word[:i+1], word[:i], self.alphabet[s]))
+            node = child
+        if not node.word:
+            node.word = True
+            self.size += 1
+            events.append(("word", word))
+        return events
+
+    def find(self, prefix):
+        """Node reached by walking prefix, or None if the path falls off."""
+        node = self.root
+        for ch in prefix:
+            key = self.fold(ch) if self.fold else ch
+            s = self.index.get(key)
+            if s is None:
+                return None
+            node = node.slots[s]
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, word):
+        node = self.find(word)
+        return node is not None and node.word
+
+    def __len__(self):
+        return self.size
+
+    def starts_with(self, prefix):
+        """All stored words beginning with prefix, in alphabet order."""
+        node = self.find(prefix)
+        return [] if node is None else list(self._walk(node, prefix))
+
+    def __iter__(self):
+        return self._walk(self.root, "")
+
+    def _walk(self, node, prefix):
+        stack = [(node, prefix)]
+        while stack:
+            node, prefix = stack.pop()
+            if node.word:
+                yield prefix
+            for s in range(len(node.slots) - 1, -1, -1):
+                child = node.slots[s]
+                if child is not None:
+                    stack.append((child, prefix + self.alphabet[s]))
+
+    def fuzzy(self, word, k):
+        """
+        Stored words within Levenshtein distance k of word.
+
+        Returns ([(match, distance), ...] in alphabet order, nodes_visited).
+
+        Walks the trie keeping one DP row per depth: row[j] is the edit
+        distance between the node's prefix and word[:j], computed from the
+        parent's row in O(len(word)).  Prefixes are shared, so each row is
+        computed once for all words below it, and a branch is cut as soon
+        as min(row) > k — no extension of that prefix can get back under k.
+        """
+        key = [self.fold(ch) if self.fold else ch for ch in word]
+        n = len(key)
+        alphabet = self.alphabet
+        matches = []
+        visited = 1
+        stack = [(self.root, "", list(range(n + 1)))]
+        while stack:
+            node, prefix, prev = stack.pop()
+            if node.word and prev[n] <= k:
+                matches.append((prefix, prev[n]))
+            for s in range(len(node.slots) - 1, -1, -1):
+                child = node.slots[s]
+                if child is None:
+                    continue
+                ch = alphabet[s]
+                row = [prev[0] + 1]
+                for j in range(1, n + 1):
+                    row.append(min(row[j - 1] + 1,                      # insert
+                                   prev[j] + 1,                         # delete
+                                   prev[j - 1] + (key[j - 1] != ch)))   # substitute
+                visited += 1
+                if min(row) <= k:
+                    stack.append((child, prefix + ch, row))
+        return matches, visited
+
+
+# ── layout ────────────────────────────────────────────────────────────────────
+
+def children_index(events):
+    """
+    Build {parent_path: [(ch, child_path), ...]} from a stream of "node"
+    events.  Children come out in the order they were created; sort them by
+    slot before laying out.
+    """
+    kids = {"": []}
+    for ev in events:
+        if ev[0] == "node":
+            _, path, parent, ch = ev
+            kids.setdefault(parent, []).append((ch, path))
+            kids.setdefault(path, [])
+    return kids
+
+
+def layout(kids, order, node_w, gap, level_h, x0=0.0, y0=0.0, max_w=None, max_h=None):
+    """
+    Tidy top-down layout.  Returns {path: (x, y)} top-left corners.
+
+    kids    : {path: [(ch, child_path), ...]} as from children_index()
+    order   : {ch: slot} used to sort siblings left-to-right
+    node_w  : node width, or {path: width} when nodes differ in width;
+              neighbouring leaves are spaced gap apart
+    level_h : vertical distance between depths
+    max_w / max_h : optional bounding box; spacing is squeezed to fit
+
+    Every leaf gets its own column, a parent sits centered over its first
+    and last child, so single-child chains stack straight down.
+    """
+    leaves = []
+    depth  = 0
+    stack  = [("", 0)]
+    while stack:
+        path, d = stack.pop()
+        depth = max(depth, d)
+        ch_list = sorted(kids.get(path, []), key=lambda e: order[e[0]])
+        if not ch_list:
+            leaves.append(path)
+        for _, child in reversed(ch_list):
+            stack.append((child, d + 1))
+
+    if max_h is not None and depth > 0:
+        level_h = min(level_h, max_h / depth)
+
+    if isinstance(node_w, dict):
+        return _layout_varied(kids, order, node_w, gap, level_h, x0, y0, max_w, leaves)
+
+    col    = len(leaves)
+    leaf_x = {path: i for i, path in enumerate(leaves)}
+    step = node_w + gap
+    if max_w is not None and col > 1:
+        step = min(step, (max_w - node_w) / (col - 1))
+
+    pos = {}
+
+    def place(path, d):
+        ch_list = sorted(kids.get(path, []), key=lambda e: order[e[0]])
+        if ch_list:
+            xs = [place(child, d + 1) for _, child in ch_list]
+            x  = (xs[0] + xs[-1]) / 2
+        else:
+            x = x0 + leaf_x[path] * step
+        pos[path] = (x, y0 + d * level_h)
+        return x
+
+    place("", 0)
+    return pos
+
+
+def _layout_varied(kids, order, widths, gap, level_h, x0, y0, max_w, leaves):
+    """layout() for per-node widths: lay out by centers, reserving room for
+    a parent that is wider than the span of its children."""
+
+    def run(gap):
+        pos = {}
+
+        def place(path, d, left):
+            w = widths[path]
+            ch_list = sorted(kids.get(path, []), key=lambda e: order[e[0]])
+            if not ch_list:
+                center, right = left + w / 2, left + w
+            else:
+                cur, centers = left, []
+                for _, child in ch_list:
+                    c, r = place(child, d + 1, cur)
+                    centers.append(c)
+                    cur = r + gap
+                right  = cur - gap
+                center = max((centers[0] + centers[-1]) / 2, left + w / 2)
+                right  = max(right, center + w / 2)
+            pos[path] = (center - w / 2, y0 + d * level_h)
+            return center, right
+
+        _, right = place("", 0, x0)
+        return pos, right - x0
+
+    pos, extent = run(gap)
+    if max_w is not None and extent > max_w and len(leaves) > 1:
+        pos, _ = run(gap - (extent - max_w) / (len(leaves) - 1))
+    return pos
+
+
+# ── deck geometry and palette ─────────────────────────────────────────────────
+# Shared by make_trie_build.py (slides) and trie_frames.py (PNG frames).
+# Inches and hex colors.
+
+BW, BH, CKW = 0.230, 0.310, 0.310      # letter box, box height, checkmark box
+GAPW, GAP   = 0.160, "…"               # sparse gap marker
+DENSE_MAX   = 10                       # larger alphabets draw sparse nodes
+W, H        = 13.33, 7.5               # slide size
+
+NAVY      = "#0D1B2A"
+TITLE_BAR = "#071422"
+CYAN      = "#00D4FF"
+WHITE     = "#E8E8E8"
+DIM       = "#667788"
+EMPTY_F   = "#122232"   # inactive slot
+ACTIVE_F  = "#405872"   # existing active slot
+NEW_F     = "#FF9900"   # newly added slot
+BORDER    = "#335577"
+WORD_F    = "#00AA55"   # existing end-of-word
+NEWWORD_F = "#FFDD00"   # new end-of-word
+ARROW_OLD = "#557799"
+ARROW_NEW = "#FF9900"
+
+
+def node_cells(letters, order, sparse):
+    """
+    Cells and checkmark offset of a node showing letters (alphabet order):
+    ([(letter or GAP, x offset, width), ...], checkmark x offset).
+    order is {letter: index} over the whole alphabet; sparse nodes put a
+    GAP box wherever letters are skipped.
+    """
+    if not sparse:
+        return [(ch, i * BW, BW) for i, ch in enumerate(letters)], len(letters) * BW
+    cells, x, prev = [], 0.0, -1
+    for ch in letters:
+        i = order[ch]
+        if i > prev + 1:
+            cells.append((GAP, x, GAPW)); x += GAPW
+        cells.append((ch, x, BW)); x += BW
+        prev = i
+    if prev < len(order) - 1:
+        cells.append((GAP, x, GAPW)); x += GAPW
+    return cells, x
+
+
+def trie_cells(kids, order, sparse):
+    """
+    node_cells() of every node in kids (see children_index).  Sparse nodes
+    show the letters they hold in the final trie, so a node keeps its shape
+    from step to step; dense nodes all show the whole alphabet.
+    """
+    if sparse:
+        return {path: node_cells(sorted((ch for ch, _ in k), key=order.get), order, True)
+                for path, k in kids.items()}
+    return dict.fromkeys(kids, node_cells(sorted(order, key=order.get), order, False))
+
+
+def alpha_key(alphabet, sparse):
+    """The alphabet for the key; large alphabets collapse runs to A–F."""
+    if not sparse:
+        return " · ".join(alphabet)
+    runs, start = [], 0
+    for i in range(1, len(alphabet) + 1):
+        if i == len(alphabet) or ord(alphabet[i]) != ord(alphabet[i - 1]) + 1:
+            a, b = alphabet[start], alphabet[i - 1]
+            runs.append(a if a == b else f"{a}–{b}")
+            start = i
+    return " · ".join(runs)
+
+
+# ── deck steps ────────────────────────────────────────────────────────────────
+
+def describe(word, events):
+    """Subtitle for the step that inserts word."""
+    new = [ev for ev in events if ev[0] == "node"]
+    walk = " → ".join(ch.upper() for ch in word[:len(word) - len(new)])
+    if not events:
+        return f'"{word}" is already in the trie — nothing changes.'
+    if not word:
+        return "Mark the root as end-of-word."
+    if not new:
+        return f"{walk} already exist. Just mark the {word[-1].upper()} node as end-of-word."
+    added = " → ".join(ev[3] for ev in new)
+    lead  = f"{walk} already exist. " if walk else ""
+    return (f'{lead}Add {added} below "{new[0][2] or "root"}". '
+            f"Mark the {new[-1][3]} node as end-of-word.")
+
+
+def deck_steps(words, events, alphabet):
+    """
+    The steps of a "build a trie" deck: the empty root, one step per
+    inserted word (events[i] is what inserting words[i] reported), and the
+    final trie.  Each step is {"title", "sub", "new_nodes", "new_words"}.
+    """
+    steps = [{
+        "title":     "Before any insertions — empty root",
+        "sub":       "Alphabet: " + " ".join(alphabet),
+        "new_nodes": [],
+        "new_words": [],
+    }]
+    for i, (w, evs) in enumerate(zip(words, events), 1):
+        steps.append({
+            "title":     f'Step {i} — Insert  "{w}"',
+            "sub":       describe(w, evs),
+            "new_nodes": [ev[1] for ev in evs if ev[0] == "node"],
+            "new_words": [ev[1] for ev in evs if ev[0] == "word"],
+        })
+    steps.append({
+        "title":     "Final Trie",
+        "sub":       " · ".join(words),
+        "new_nodes": [],
+        "new_words": [],
+    })
+    return steps
+
+
+# ── incremental step state ────────────────────────────────────────────────────
+
+def step_states(steps, edge):
+    """
+    Replay a deck's steps once, carrying the cumulative trie forward.
+
+    steps : [{"new_nodes": [...], "new_words": [...]}, ...]; step 0 is the
+            empty root and contributes nothing
+    edge  : {child_path: (parent_path, ch)}
+
+    Yields one tuple per step:
+        (nodes, words, new_nodes, new_words, active, new_active)
+    nodes / words  paths that exist / are marked end-of-word so far
+    active         {path: set of chars that have a child}  (parent→children index)
+    new_active     {path: set of chars whose child appeared this step}
+
+    The cumulative containers are updated in place and shared between
+    yields, so a step costs O(nodes it adds), not O(trie).  Use them before
+    advancing the generator.
+    """
+    nodes  = {""}
+    words  = set()
+    active = {"": set()}
+    for i, step in enumerate(steps):
+        new_nodes  = set(step["new_nodes"]) if i else set()
+        new_words  = set(step["new_words"]) if i else set()
+        new_active = {}
+        for path in new_nodes:
+            par, ch = edge[path]
+            active.setdefault(par, set()).add(ch)
+            active.setdefault(path, set())
+            new_active.setdefault(par, set()).add(ch)
+        nodes |= new_nodes
+        words |= new_words
+        yield nodes, words, new_nodes, new_words, active, new_active
@@ -0,0 +1,218 @@
+"""
+trie_bench.py
+-------------
+Repeatable benchmark of every trie variant in this folder against set and
+a bisect-searched sorted list, on the repo's own corpora.
+
+    structure         module
+    dict-of-dicts     trie_utils.DictTrie
+    fixed-slot        trie.Trie              (the lecture's array-of-slots node)
+    radix             radix_trie.RadixTrie
+    double-array      double_array_trie.DoubleArrayTrie
+    DAWG              dawg.Dawg
+    set               built-in set
+    sorted+bisect     trie_utils.SortedWords
+
+Per structure and corpus it records
+
+    build_s        wall time to build from the word list
+    peak_mb        tracemalloc peak during the build
+    retained_mb    memory still held by the finished structure
+    lookup_per_s   exact-membership queries (half hits, half misses)
+    prefix_per_s   "how many words start with p" queries
+    serialized_mb  size of the structure's natural on-disk form
+                   (double-array file, array bytes, preorder bytes, pickle,
+                   or newline-joined text for set / sorted list)
+
+and writes bench_results/trie_bench.json plus one comparison plot per
+metric.  Queries use a time budget, so slow combinations (a set has to
+scan for prefixes) are sampled instead of stalling the run.
+
+    python trie_bench.py                          # every corpus
+    python trie_bench.py animals verbs            # named corpora only
+    python trie_bench.py --out results/ --seed 7
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import random
+import sys
+import time
+
+from dawg import Dawg
+from double_array_trie import DoubleArrayTrie
+from parallel_trie import serialize
+from radix_trie import RadixTrie
+from trie import Trie
+from trie_utils import CORPORA, HERE, DictTrie, SortedWords, load_words, measure
+
+SUITE = ["dictionary", "dictionary_balanced", "animal_names",
+         "adjectives", "adverbs", "animals", "nouns", "verbs"]
+
+METRICS = [("build_s", "build time (s)"),
+           ("peak_mb", "peak memory during build (MB)"),
+           ("retained_mb", "retained memory (MB)"),
+           ("lookup_per_s", "exact lookups / s"),
+           ("prefix_per_s", "prefix counts / s"),
+           ("serialized_mb", "serialized size (MB)")]
+
+
+# ── structures ────────────────────────────────────────────────────────────────
+# name → (build(words), prefix_count(structure, p), serialize(structure))
+
+def _fixed_slot(words):
+    t = Trie(sorted({ch for w in words for ch in w}))
+    for w in words:
+        t.insert(w)
+    return t
+
+
+def _array_bytes(*arrays):
+    return sum(len(a.tobytes() if hasattr(a, "tobytes") else bytes(a)) for a in arrays)
+
+
+STRUCTURES = {
+    "dict-of-dicts": (DictTrie,
+                      lambda s, p: s.count_prefix(p),
+                      lambda s: len(pickle.dumps(s.root, protocol=pickle.HIGHEST_PROTOCOL))),
+    "fixed-slot":    (_fixed_slot,
+                      lambda s, p: len(s.starts_with(p)),
+                      lambda s: len(serialize(s.root, len(s.alphabet)))),
+    "radix":         (RadixTrie,
+                      lambda s, p: s.count_prefix(p),
+                      lambda s: _array_bytes(s.buf, s.start, s.end, s.child, s.sib,
+                                             s.count, s.word)),
+    "double-array":  (DoubleArrayTrie.from_words,
+                      lambda s, p: s.count_prefix(p),
+                      lambda s: len(s.to_bytes())),
+    "DAWG":          (lambda words: Dawg.from_words(sorted(set(words))),
+                      lambda s, p: sum(1 for _ in s.starts_with(p)),
+                      lambda s: _array_bytes(s.first, s.label, s.target, s.final)),
+    "set":           (set,
+                      lambda s, p: sum(1 for w in s if w.startswith(p)),
+                      lambda s: len("\n".join(s).encode("utf-8"))),
+    "sorted+bisect": (SortedWords,
+                      lambda s, p: s.count_prefix(p),
+                      lambda s: len("\n".join(s.words).encode("utf-8"))),
+}
+
+
+# ── measuring ─────────────────────────────────────────────────────────────────
+
+def rate(fn, items, budget):
+    """Calls per second of fn over items, stopping once budget seconds pass."""
+    clock = time.perf_counter
+    t0 = clock()
+    done = 0
+    for x in items:
+        fn(x)
+        done += 1
+        if not done % 64 and clock() - t0 > budget:
+            break
+    secs = clock() - t0
+    return done / secs if secs else float("inf")
+
+
+def probes(words, n, seed):
+    rng = random.Random(seed)
+    hits = rng.sample(words, min(n, len(words)))
+    lookups = [w if i % 2 else w + "\x01" for i, w in enumerate(hits)]
+    prefixes = [w[:min(3, len(w))] for w in hits]
+    return lookups, prefixes
+
+
+def bench_corpus(name, path, structures, n_probes, budget, seed):
+    words = load_words(path)
+    distinct = len(set(words))
+    lookups, prefixes = probes(words, n_probes, seed)
+    rows = {}
+    for sname in structures:
+        build, prefix_count, size = STRUCTURES[sname]
+        s, secs, retained, peak = measure(lambda: build(load_words(path)))
+        assert all((w in s) == (i % 2 == 1) for i, w in enumerate(lookups[:200])), sname
+        rows[sname] = {
+            "build_s":       secs,
+            "peak_mb":       peak / 1e6,
+            "retained_mb":   retained / 1e6,
+            "bytes_per_word": retained / distinct,
+            "lookup_per_s":  rate(s.__contains__, lookups, budget),
+            "prefix_per_s":  rate(lambda p: prefix_count(s, p), prefixes, budget),
+            "serialized_mb": size(s) / 1e6,
+        }
+        del s
+        r = rows[sname]
+        print(f"  {sname:<14}{r['build_s']:>8.2f}{r['peak_mb']:>9.1f}{r['retained_mb']:>9.1f}"
+              f"{r['lookup_per_s']:>12,.0f}{r['prefix_per_s']:>12,.0f}{r['serialized_mb']:>9.2f}",
+              flush=True)
+    return {"path": os.path.relpath(path, HERE), "lines": len(words),
+            "words": distinct, "results": rows}
+
+
+def plot(results, out_dir):
+    """
+    One grouped bar chart per metric: corpora on x, one bar per structure,
+    log-scaled since the structures differ by orders of magnitude.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    corpora = list(results["corpora"])
+    names = list(STRUCTURES)
+    paths = []
+    for key, label in METRICS:
+        fig, ax = plt.subplots(figsize=(12, 4.8))
+        width = 0.8 / len(names)
+        for i, sname in enumerate(names):
+            vals = [results["corpora"][c]["results"].get(sname, {}).get(key, 0) for c in corpora]
+            ax.bar([j + i * width for j in range(len(corpora))], vals, width, label=sname)
+        ax.set_xticks([j + 0.4 - width / 2 for j in range(len(corpora))])
+        ax.set_xticklabels(corpora, rotation=20)
+        ax.set_ylabel(label)
+        ax.set_yscale("log")
+        ax.set_title(label)
+        ax.legend(fontsize=8, ncol=4)
+        fig.tight_layout()
+        path = os.path.join(out_dir, f"{key}.png")
+        fig.savefig(path, dpi=110)
+        plt.close(fig)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("corpora", nargs="*", default=SUITE, help=f"subset of {SUITE}")
+    ap.add_argument("--structures", nargs="*", default=list(STRUCTURES), choices=list(STRUCTURES))
+    ap.add_argument("--probes", type=int, default=20_000)
+    ap.add_argument("--budget", type=float, default=1.0, help="seconds per query test")
+    ap.add_argument("--seed", type=int, default=5243)
+    ap.add_argument("--out", default=os.path.join(HERE, "bench_results"))
+    ap.add_argument("--no-plots", action="store_true")
+    args = ap.parse_args(argv)
+
+    results = {"python": sys.version.split()[0], "platform": platform.platform(),
+               "seed": args.seed, "probes": args.probes, "corpora": {}}
+    for name in args.corpora:
+        path = CORPORA[name]
+        print(f"{name}: {path}")
+        print(f"  {'structure':<14}{'build s':>8}{'peak MB':>9}{'kept MB':>9}"
+              f"{'lookup/s':>12}{'prefix/s':>12}{'ser MB':>9}")
+        results["corpora"][name] = bench_corpus(name, path, args.structures,
+                                                args.probes, args.budget, args.seed)
+
+    os.makedirs(args.out, exist_ok=True)
+    out = os.path.join(args.out, "trie_bench.json")
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print("\nSaved:", out)
+    if not args.no_plots:
+        for p in plot(results, args.out):
+            print("Saved:", p)
+
+
+if __name__ == "__main__":
+    main()
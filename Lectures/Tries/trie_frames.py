@@ -0,0 +1,307 @@
+"""
+trie_frames.py
+Render the "build a trie" steps straight to PNG frames, no deck involved.
+
+The frames come from the same Trie events, layout and step state as
+make_trie_build.py, with the geometry, palette and node cells both take
+from trie.py, but each step is drawn with matplotlib's Agg backend instead
+of being exported from the .pptx one slide at a time.  Steps are
+independent once their state is known, so the parent replays step_states()
+once and a process pool draws the frames.  The output folder (build_frames/
+by default) gets frame_XX.png plus the index.html viewer the Red-Black tree
+walkthroughs use (anim_utils.generate_viewer).
+
+    python trie_frames.py                          # pet pets peter peck pecked pecks
+    python trie_frames.py tea ten to inn           # any word list
+    python trie_frames.py --alphabet=ABCDEFGHIJKLMNOPQRSTUVWXYZ tea ten to inn
+    python trie_frames.py --out=/tmp/frames --workers=4 --dpi=130 $(cat words.txt)
+
+--sparse / --dense behave as in make_trie_build.py; --delta stores delta
+frames (anim_utils' delta mode; RB_DELTA_FRAMES=1 also turns it on).
+Needs matplotlib only, not python-pptx.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "Red_Black_Trees", "animations"))
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+from matplotlib.patches import PathPatch, Rectangle
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath
+
+import anim_utils
+from trie import (ACTIVE_F, ARROW_NEW, ARROW_OLD, BH, BORDER, BW, CKW, CYAN, DENSE_MAX, DIM,
+                  EMPTY_F, GAP, H, NAVY, NEW_F, NEWWORD_F, TITLE_BAR, W, WHITE, WORD_F, Trie,
+                  alpha_key, children_index, deck_steps, layout, step_states, trie_cells)
+
+# text boxes on the slides are inset 0.1" left and 0.05" top
+INSET_X, INSET_Y = 0.10, 0.05
+
+
+# ── Model ─────────────────────────────────────────────────────────────────────
+
+def build_model(words, alphabet="", sparse=None):
+    """
+    Everything a frame needs that does not change from step to step:
+    words, alphabet, node cells, positions, parent edges and the steps.
+    sparse=None picks the mode the deck would (sparse above DENSE_MAX letters).
+    """
+    alpha = sorted({ch.upper() for w in words for ch in w} | set(alphabet.upper()))
+    idx   = {c: i for i, c in enumerate(alpha)}
+    if sparse is None:
+        sparse = len(alpha) > DENSE_MAX
+
+    trie   = Trie(alpha, fold=str.upper)
+    events = [trie.insert(w) for w in words]
+    edge   = {ev[1]: (ev[2], ev[3]) for evs in events for ev in evs if ev[0] == "node"}
+    kids   = children_index(ev for evs in events for ev in evs)
+    cells  = trie_cells(kids, idx, sparse)
+    node_w = {p: ck + CKW for p, (_, ck) in cells.items()}
+    pos = layout(kids, idx, node_w=node_w if sparse else len(alpha) * BW + CKW,
+                 gap=0.95, level_h=0.70, x0=0.05, y0=0.28, max_w=10.0,
+                 max_h=H - 0.50 - 0.28)
+    return {
+        "words":  list(words),
+        "alpha":  alpha,
+        "sparse": sparse,
+        "cells":  cells,
+        "node_w": node_w,
+        "cell_x": {p: {ch: x for ch, x, _ in c if ch != GAP} for p, (c, _) in cells.items()},
+        "pos":    pos,
+        "edge":   edge,
+        "steps":  deck_steps(words, events, alpha),
+    }
+
+
+def frame_states(model):
+    """
+    One self-contained state per step, for shipping to a worker:
+    (nodes, words, new_nodes, new_words, active, new_active), copied out of
+    step_states() since it updates its containers in place.
+    """
+    for nodes, words, new_nodes, new_words, active, new_active in \
+            step_states(model["steps"], model["edge"]):
+        yield (frozenset(nodes), frozenset(words), frozenset(new_nodes),
+               frozenset(new_words), {p: frozenset(s) for p, s in active.items() if s},
+               {p: frozenset(s) for p, s in new_active.items()})
+
+
+# ── Drawing ───────────────────────────────────────────────────────────────────
+
+def _text(ax, text, x, y, size, color, bold=False, italic=False, ha="left", **kw):
+    """A slide text box's first line, with the box's top-left at (x, y)."""
+    ax.text(x + INSET_X if ha == "left" else x, y + INSET_Y, text, ha=ha, va="top",
+            fontsize=size, color=color, fontweight="bold" if bold else "normal",
+            fontstyle="italic" if italic else "normal", **kw)
+
+
+_GLYPHS = {}
+
+def _glyph(text, size, bold, mono):
+    """
+    Outline of text at size pt as (vertices in inches, y down, centered on
+    the ink, codes), cached: a frame has hundreds of box letters but only a
+    few distinct ones.
+    """
+    key = (text, size, bold, mono)
+    if key not in _GLYPHS:
+        prop = FontProperties(family="monospace" if mono else None,
+                              weight="bold" if bold else "normal")
+        tp = TextPath((0, 0), text, size=size, prop=prop)
+        v = tp.vertices / 72.0
+        lo, hi = v.min(axis=0), v.max(axis=0)
+        v = (v - (lo + hi) / 2) * (1, -1)
+        _GLYPHS[key] = (v, tp.codes)
+    return _GLYPHS[key]
+
+
+def _draw_glyphs(ax, glyphs):
+    """
+    Box letters as filled outlines, one compound path per color, instead of
+    one Text artist each (text layout dominated the frame time).
+    glyphs : [(text, center_x, center_y, size, color, bold, mono), ...]
+    """
+    by_color = {}
+    for text, cx, cy, size, color, bold, mono in glyphs:
+        v, codes = _glyph(text, size, bold, mono)
+        verts, kinds = by_color.setdefault(color, ([], []))
+        verts.append(v + (cx, cy))
+        kinds.append(codes)
+    for color, (verts, kinds) in by_color.items():
+        # add_artist, not add_patch: the limits are fixed, and updating them
+        # walks every Bezier segment of every letter
+        ax.add_artist(PathPatch(Path(np.concatenate(verts), np.concatenate(kinds)),
+                                facecolor=color, edgecolor="none", zorder=3))
+
+
+def draw_step(model, i, state):
+    """Return a Figure showing step i of model in the given frame state."""
+    nodes, words, new_nodes, new_words, active, new_active = state
+    pos, cells, edge = model["pos"], model["cells"], model["edge"]
+    step = model["steps"][i]
+
+    fig = Figure(figsize=(W, H), facecolor=NAVY)
+    ax  = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(0, W); ax.set_ylim(H, 0)
+    ax.axis("off")
+
+    # Title bar
+    ax.add_patch(Rectangle((0, 0), W, 0.60, facecolor=TITLE_BAR, edgecolor="none"))
+    _text(ax, step["title"], 0.25, 0.04, 24, CYAN, bold=True)
+    _text(ax, step["sub"], 0.25 + 12.8 - INSET_X, 0.04, 13, DIM, italic=True, ha="right")
+
+    # Arrows: parent's letter box bottom → child's top center
+    segs, colors, widths = [], [], []
+    for child in nodes:
+        if child == "":
+            continue
+        par, ch = edge[child]
+        px, py = pos[par]
+        cx, cy = pos[child]
+        segs.append([(px + model["cell_x"][par][ch] + BW / 2, py + BH),
+                     (cx + model["node_w"][child] / 2, cy)])
+        new = child in new_nodes
+        colors.append(ARROW_NEW if new else ARROW_OLD)
+        widths.append(1.8 if new else 1.2)
+    ax.add_collection(LineCollection(segs, colors=colors, linewidths=widths), autolim=False)
+
+    # Nodes: every box in one collection, then the letters on top
+    boxes, fills, glyphs = [], [], []
+    empty = frozenset()
+    for path in nodes:
+        x, y = pos[path]
+        act, new_act = active.get(path, empty), new_active.get(path, empty)
+        node_cells, ck = cells[path]
+        for ch, dx, cw in node_cells:
+            if ch in new_act:
+                fill, tcol, bold = NEW_F, NAVY, True
+            elif ch in act:
+                fill, tcol, bold = ACTIVE_F, WHITE, True
+            else:
+                fill, tcol, bold = EMPTY_F, DIM, False
+            boxes.append((x + dx, y, cw)); fills.append(fill)
+            glyphs.append((ch, x + dx + cw / 2, y + BH / 2, 8, tcol, bold, True))
+        if path in new_words:
+            fill, sym, tcol = NEWWORD_F, "✓", NAVY
+        elif path in words:
+            fill, sym, tcol = WORD_F, "✓", WHITE
+        else:
+            fill, sym, tcol = EMPTY_F, "", DIM
+        boxes.append((x + ck, y, CKW)); fills.append(fill)
+        if sym:
+            glyphs.append((sym, x + ck + CKW / 2, y + BH / 2, 10, tcol, True, False))
+    b = np.array(boxes).reshape(-1, 3)
+    x0, y0, x1, y1 = b[:, 0], b[:, 1], b[:, 0] + b[:, 2], b[:, 1] + BH
+    quads = np.stack([np.stack(c, axis=1) for c in ((x0, y0), (x1, y0), (x1, y1), (x0, y1))], axis=1)
+    ax.add_collection(PolyCollection(quads, facecolors=fills, edgecolors=BORDER,
+                                     linewidths=0.75), autolim=False)
+    _draw_glyphs(ax, glyphs)
+
+    rx, ry = pos[""]
+    _text(ax, "root", rx - 0.03 - INSET_X, ry - 0.01, 10, DIM, ha="right")
+
+    # Word list on the right
+    all_words = model["words"]
+    wdy = min(0.50, 3.10 / max(len(all_words), 1))
+    _text(ax, "Words", 11.25, 0.70, 14, CYAN, bold=True)
+    for wi, w in enumerate(all_words):
+        done = w in words
+        col  = NEW_F if w in new_words else WHITE if done else DIM
+        _text(ax, ("✓ " if done else "  ") + w, 11.20, 1.08 + wi * wdy,
+              15 if wdy >= 0.50 else 11, col, bold=done)
+
+    # Alphabet key
+    _text(ax, "Alphabet:", 11.20, 4.25, 11, DIM)
+    _text(ax, alpha_key(model["alpha"], model["sparse"]), 11.20, 4.55, 11, DIM, wrap=True)
+
+    # Legend
+    lx, ly = 10.9, 5.45
+    _text(ax, "Legend", lx, ly, 13, CYAN, bold=True)
+    for k, (fill, label) in enumerate([(ACTIVE_F, "existing child"), (NEW_F, "new this step"),
+                                        (WORD_F, "word ✓ (existing)"),
+                                        (NEWWORD_F, "word ✓ (new)")]):
+        by = ly + 0.40 + k * 0.38
+        ax.add_patch(Rectangle((lx, by), 0.30, 0.26, facecolor=fill,
+                               edgecolor=BORDER, linewidth=0.5))
+        _text(ax, label, lx + 0.36, by - 0.02, 11, WHITE)
+    return fig
+
+
+# ── Rendering ─────────────────────────────────────────────────────────────────
+
+_MODEL = None      # set once per worker by _init_worker
+
+
+def _init_worker(model):
+    global _MODEL
+    _MODEL = model
+
+
+def _render(job):
+    """
+    Worker task: draw one step.  Writes frame_XX.png and returns its path,
+    or in delta mode returns the RGBA buffer for the parent to diff.
+    """
+    i, state, folder, dpi, delta = job
+    fig = draw_step(_MODEL, i, state)
+    if delta:
+        return anim_utils.render_rgba(fig, dpi, facecolor=NAVY)
+    path = os.path.join(folder, f"frame_{i:02d}.png")
+    FigureCanvasAgg(fig)
+    fig.savefig(path, dpi=dpi, facecolor=NAVY)
+    return path
+
+
+def render_frames(model, folder, workers=None, dpi=100, delta=None):
+    """
+    Draw every step of model into folder as frame_XX.png and write the
+    viewer.  Returns the number of frames.
+
+    Delta frames depend on the frame before them, so in delta mode the
+    workers only rasterize and the parent diffs the buffers in step order
+    (anim_utils' delta manifest, composited by the viewer).
+    """
+    if delta is None:
+        delta = anim_utils.DELTA_FRAMES
+    os.makedirs(folder, exist_ok=True)
+    jobs = [(i, state, folder, dpi, delta) for i, state in enumerate(frame_states(model))]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model,)) as pool:
+        chunk = max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))
+        for i, out in enumerate(pool.map(_render, jobs, chunksize=chunk)):
+            if delta:
+                anim_utils.save_delta(out, folder, i)
+
+    bg = os.path.relpath(os.path.join(HERE, "trie_example.png"), folder)
+    anim_utils.generate_viewer(folder, len(jobs), "Building a Trie",
+                               step_labels=[s["title"] for s in model["steps"]],
+                               bg_image=bg, delta=delta)
+    return len(jobs)
+
+
+if __name__ == "__main__":
+    args  = sys.argv[1:]
+    opts  = dict(a[2:].partition("=")[::2] for a in args if a.startswith("--"))
+    words = ([w.lower() for w in args if not w.startswith("--")]
+             or ["pet", "pets", "peter", "peck", "pecked", "pecks"])
+    sparse = True if "sparse" in opts else False if "dense" in opts else None
+
+    t0 = time.perf_counter()
+    model = build_model(words, opts.get("alphabet", ""), sparse)
+    n = render_frames(model, opts.get("out") or os.path.join(HERE, "build_frames"),
+                      workers=int(opts["workers"]) if opts.get("workers") else None,
+                      dpi=int(opts.get("dpi") or 100),
+                      delta=True if "delta" in opts else None)
+    print(f"{n} frames in {time.perf_counter() - t0:.2f} s")
@@ -0,0 +1,170 @@
+"""
+trie_utils.py
+Shared corpus loading, baseline structures and measuring helpers for the
+trie implementations and their benchmarks.
+"""
+
+import bisect
+import gc
+import glob
+import json
+import os
+import time
+import tracemalloc
+
+
+# ── corpora ───────────────────────────────────────────────────────────────────
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.abspath(os.path.join(HERE, "..", ".."))
+DATA = os.path.join(REPO, "Resources", "04-Data")
+
+DICTIONARY = os.path.join(HERE, "dictionary.txt")          # 134,688 words
+DICT_FILES = os.path.join(DATA, "dictionary_files")       # dict.txt, dict.json, ...
+AVL_WORDS  = os.path.join(REPO, "Lectures", "AvlTrees", "stringAvl-Bstree", "word_files")
+
+CORPORA = {
+    "dictionary":          DICTIONARY,
+    "dictionary_clean":    os.path.join(DICT_FILES, "dictionary_clean.txt"),
+    "dictionary_balanced": os.path.join(DICT_FILES, "dictionary_balanced.txt"),
+    "animal_names":        os.path.join(DATA, "animal_names.txt"),
+    "adjectives":          os.path.join(DATA, "word_lists", "adjectives.txt"),
+    "adverbs":             os.path.join(DATA, "word_lists", "adverbs.txt"),
+    "animals":             os.path.join(DATA, "word_lists", "animals.txt"),
+    "nouns":               os.path.join(DATA, "word_lists", "nouns.txt"),
+    "verbs":               os.path.join(DATA, "word_lists", "verbs.txt"),
+}
+
+
+def word_files():
+    """Every word list and dictionary file in the repo, .txt and dict.json."""
+    paths = [DICTIONARY, os.path.join(DATA, "animal_names.txt"),
+             os.path.join(DICT_FILES, "dict.json")]
+    for folder in (os.path.join(DATA, "word_lists"), DICT_FILES, AVL_WORDS):
+        paths += sorted(glob.glob(os.path.join(folder, "*.txt")))
+    return paths
+
+
+def load_words(path):
+    """Words of a one-word-per-line file, in file order (CRLF and blanks dropped)."""
+    with open(path, encoding="utf-8") as f:
+        return [w for w in (line.strip() for line in f) if w]
+
+
+def iter_words(path):
+    """
+    Stream the words of a one-word-per-line .txt file, or of a .json file
+    holding one array of strings (e.g. dictionary_files/dict.json).
+    """
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            yield from json.load(f)
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            w = line.strip()
+            if w:
+                yield w
+
+
+# ── baselines ─────────────────────────────────────────────────────────────────
+
+class DictTrie:
+    """The textbook dict-of-dicts trie: one dict per node, END marks a word."""
+
+    END = ""
+
+    def __init__(self, words=()):
+        self.root = {}
+        for w in words:
+            self.insert(w)
+
+    def insert(self, word):
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[self.END] = True
+
+    def __contains__(self, word):
+        node = self.root
+        for ch in word:
+            node = node.get(ch)
+            if node is None:
+                return False
+        return self.END in node
+
+    def starts_with(self, prefix):
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            if self.END in node:
+                yield word
+            for ch in sorted((c for c in node if c != self.END), reverse=True):
+                stack.append((node[ch], word + ch))
+
+    def count_prefix(self, prefix):
+        return sum(1 for _ in self.starts_with(prefix))
+
+
+class SortedWords:
+    """A sorted list searched with bisect; prefix queries are a range scan."""
+
+    def __init__(self, words=()):
+        self.words = sorted(set(words))
+
+    def __contains__(self, word):
+        i = bisect.bisect_left(self.words, word)
+        return i < len(self.words) and self.words[i] == word
+
+    def _range(self, prefix):
+        lo = bisect.bisect_left(self.words, prefix)
+        hi = bisect.bisect_left(self.words, prefix + "\U0010ffff", lo)
+        return lo, hi
+
+    def starts_with(self, prefix):
+        lo, hi = self._range(prefix)
+        return iter(self.words[lo:hi])
+
+    def count_prefix(self, prefix):
+        lo, hi = self._range(prefix)
+        return hi - lo
+
+
+# ── measuring ─────────────────────────────────────────────────────────────────
+
+def measure(build):
+    """
+    Returns (result, seconds, retained_bytes, peak_bytes) for build().
+
+    build() runs twice: once untraced for the wall-clock time, once under
+    tracemalloc for memory.  Let build() load its own input so temporary
+    lists are freed and only what the structure keeps alive is counted.
+    """
+    gc.collect()
+    t0 = time.perf_counter()
+    result = build()
+    secs = time.perf_counter() - t0
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, secs, retained, peak
+
+
+def throughput(fn, items, repeat=1):
+    """Calls per second of fn over items (best of `repeat` passes)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for x in items:
+            fn(x)
+        best = min(best, time.perf_counter() - t0)
+    return len(items) / best if best else float("inf")